@@ -6,7 +6,6 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
 from PyQt5.QtCore import Qt, QPoint, QRect, QSize
 from PyQt5.QtGui import QFont, QIcon, QMouseEvent, QPixmap
 from edit_view.edit_view import EditView
-from script_view import ScriptView
 from menu import MenuBar
 from tip_bar import TipBar
 from side_bar import SideBar
@@ -113,6 +112,9 @@ class MainWindow(QMainWindow):
 
     def _on_summon_script_view(self, edit_view, container):
         """處理腳本編輯器請求"""
+        # 腳本編輯器 (QScintilla) 只在第一次開啟時載入，縮短啟動時間
+        from script_view import ScriptView
+
         # 建立簡化版 ScriptView
         script_view = ScriptView(mode="simple")
         script_view.set_property(container.name, container.input.text())
@@ -120,17 +122,21 @@ class MainWindow(QMainWindow):
         # 產生唯一 ID
         script_view_id = f"script_{id(container)}"
 
+        def close_script_view():
+            # 移除 script_view 並切回 edit_view，停止語法檢查後釋放
+            self.main_content_area.removeWidget(script_view)
+            self.main_content_area.setCurrentWidget(edit_view)
+            script_view.shutdown()
+            script_view.deleteLater()
+
         def on_apply(text):
             # 寫入容器
             container.input.setText(text)
-            # 移除 script_view 並切回 edit_view
-            self.main_content_area.removeWidget(script_view)
-            self.main_content_area.setCurrentWidget(edit_view)
+            close_script_view()
 
         def on_back():
-            # 移除 script_view 並切回 edit_view（不寫入）
-            self.main_content_area.removeWidget(script_view)
-            self.main_content_area.setCurrentWidget(edit_view)
+            # 不寫入
+            close_script_view()
 
         script_view.set_callbacks(on_apply=on_apply, on_back=on_back)
         self.main_content_area.addWidget(script_view, obj=script_view_id, switch=True)
@@ -0,0 +1,92 @@
+"""Benchmark: vectorised BMFont colorization vs. the old per-pixel loop
+
+Run from the repository root:
+    python benchmarks/bench_bmfont_colorize.py [width] [height]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter, QPixmap
+from PyQt5.QtWidgets import QApplication
+
+from bench_common import best_of
+from label import BMFont
+
+
+def make_pixmap(width: int, height: int) -> QPixmap:
+    """Anti-aliased white text on transparent, like a rendered BMFont string"""
+    pixmap = QPixmap(width, height)
+    pixmap.fill(Qt.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    font = QFont()
+    font.setPixelSize(height * 3 // 4)
+    painter.setFont(font)
+    painter.setPen(QColor(230, 230, 230, 200))
+    painter.drawText(pixmap.rect(), Qt.AlignCenter, "12:34:56")
+    painter.end()
+    return pixmap
+
+
+def legacy_colorize(pixmap: QPixmap, color: QColor) -> QPixmap:
+    """The old BMFont._colorize_pixmap, copied verbatim"""
+    image = pixmap.toImage()
+    image = image.convertToFormat(QImage.Format_ARGB32)
+
+    for y in range(image.height()):
+        for x in range(image.width()):
+            pixel = image.pixelColor(x, y)
+            if pixel.alpha() > 0:
+                gray = (pixel.red() + pixel.green() + pixel.blue()) // 3
+                intensity = gray / 255.0
+
+                new_color = QColor(
+                    int(color.red() * intensity),
+                    int(color.green() * intensity),
+                    int(color.blue() * intensity),
+                    pixel.alpha()
+                )
+                image.setPixelColor(x, y, new_color)
+
+    return QPixmap.fromImage(image)
+
+
+def max_channel_difference(a: QPixmap, b: QPixmap) -> int:
+    image_a = a.toImage().convertToFormat(QImage.Format_ARGB32)
+    image_b = b.toImage().convertToFormat(QImage.Format_ARGB32)
+    worst = 0
+    for y in range(image_a.height()):
+        for x in range(image_a.width()):
+            pa, pb = image_a.pixelColor(x, y), image_b.pixelColor(x, y)
+            worst = max(worst, abs(pa.red() - pb.red()), abs(pa.green() - pb.green()),
+                        abs(pa.blue() - pb.blue()), abs(pa.alpha() - pb.alpha()))
+    return worst
+
+
+def main():
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else 80
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    pixmap = make_pixmap(width, height)
+    color = QColor("#FF8800")
+    font = BMFont.__new__(BMFont)  # the colorizer needs no .fnt data
+
+    legacy = best_of(legacy_colorize, pixmap, color)
+    vectorised = best_of(font._colorize_pixmap, pixmap, color, repeat=50)
+    difference = max_channel_difference(legacy_colorize(pixmap, color),
+                                        font._colorize_pixmap(pixmap, color))
+
+    print(f"pixmap: {width}x{height}")
+    print(f"legacy per-pixel loop: {legacy * 1000:8.3f} ms")
+    print(f"numpy single pass    : {vectorised * 1000:8.3f} ms")
+    print(f"speedup              : {legacy / vectorised:8.1f}x")
+    print(f"max channel diff     : {difference}")
+
+
+if __name__ == "__main__":
+    main()
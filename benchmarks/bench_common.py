@@ -0,0 +1,13 @@
+"""Helpers shared by the benchmark scripts"""
+
+import time
+
+
+def best_of(func, *args, repeat: int = 5) -> float:
+    """Fastest of repeat calls of func(*args), in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
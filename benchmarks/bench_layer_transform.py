@@ -0,0 +1,189 @@
+"""Benchmark: cached closed-form layer transforms vs. the old OrderlyTransform pipeline
+
+Run from the repository root:
+    python benchmarks/bench_layer_transform.py [layers]
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt5.QtGui import QTransform
+from PyQt5.QtWidgets import QApplication, QGraphicsView
+
+from bench_common import best_of
+
+
+class OrderlyTransform(QTransform):
+    """The old step-by-step transform, copied verbatim (only the methods used)"""
+
+    def __init__(self, inherit=None):
+        super().__init__()
+        self.new = inherit
+        try:
+            self.push()
+        except TypeError:
+            pass
+
+    def next_step(self, matrix=None):
+        if self.new is not None:
+            self.push()
+        if matrix is None:
+            self.new = QTransform()
+            return
+        self.new = matrix
+
+    def push(self):
+        self *= self.new
+        self.new = None
+
+    def rotate(self, angle, *args):
+        if self.new is None:
+            return super().rotate(angle, *args)
+        self.new.rotate(angle, *args)
+
+    def shear(self, sh, sv):
+        if self.new is None:
+            return super().shear(sh, sv)
+        self.new.shear(sh, sv)
+
+    def translate(self, dx, dy):
+        if self.new is None:
+            return super().translate(dx, dy)
+        self.new.translate(dx, dy)
+
+
+def legacy_text_transform(width, height, skew_x, skew_y, rotation, x_offset, y_offset):
+    """The old textLayer.setLayerTransform, without the item update"""
+    matrix = OrderlyTransform()
+    matrix.next_step()
+    matrix.translate(-width / 2, -height / 2)
+    matrix.next_step()
+    matrix.shear(np.tan(np.deg2rad(skew_x)), np.tan(np.deg2rad(skew_y)))
+    align = QTransform()
+    align.translate(-width * x_offset, -height * y_offset)
+    matrix.next_step(align)
+    matrix.next_step()
+    matrix.rotate(rotation)
+    matrix.push()
+    return matrix
+
+
+def cached_text_transform(transform, width, height, skew_x, skew_y, rotation, x_offset, y_offset):
+    """The same text layer transform through LayerTransform"""
+    transform.set_offset(-width / 2, -height / 2)
+    transform.set_skew(skew_x, skew_y)
+    transform.set_alignment(-width * x_offset, -height * y_offset)
+    transform.set_rotation(rotation)
+    return transform.matrix()
+
+
+def make_states(count, seed=1):
+    rng = random.Random(seed)
+    return [
+        (rng.uniform(20, 300), rng.uniform(10, 80), float(rng.randint(0, 60)),
+         float(rng.randint(0, 60)), float(rng.randint(-720, 720)),
+         rng.choice((-0.5, 0, 0.5)), rng.choice((-0.5, 0, 0.5)))
+        for _ in range(count)
+    ]
+
+
+def max_difference(a, b):
+    return max(abs(x - y) for x, y in zip(
+        (a.m11(), a.m12(), a.m21(), a.m22(), a.dx(), a.dy()),
+        (b.m11(), b.m12(), b.m21(), b.m22(), b.dx(), b.dy()),
+    ))
+
+
+def make_scene(count):
+    """count text layers in a GraphicsScene, as the edit view creates them"""
+    import edit_view.preview_obj as preview_obj
+
+    keys = ("Layer", "Text", "X", "Y", "Font", "Text size", "Color", "Rotation",
+            "Skew X", "Skew Y", "Opacity", "Alignment", "Display")
+    view = QGraphicsView()
+    scene = preview_obj.GraphicsScene(view)
+    view.setScene(scene)
+    layers = []
+    for index in range(count):
+        attribute = {key: preview_obj.Signal() for key in keys}
+        layer = preview_obj.create_layer("textLayer", attribute, index + 2, scene)
+        scene.addItem(layer)
+        attribute["Text"].emit(f"Layer {index}")
+        attribute["Text size"].emit(24)
+        layers.append((layer, attribute))
+    scene.update_scheduler.flush()
+    return view, scene, layers
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    from edit_view.preview_obj import LayerTransform
+
+    states = make_states(count)
+    transforms = [LayerTransform() for _ in range(count)]
+    rotated = [state[:4] + (state[4] + 15.0,) + state[5:] for state in states]
+
+    def legacy_update():
+        for state in rotated:
+            legacy_text_transform(*state)
+
+    def cached_update():
+        # Only the rotation changes; the other components stay cached.
+        # Repeats reuse the same angles, so force the recompose.
+        for transform, state in zip(transforms, rotated):
+            transform.set_rotation(state[4])
+            transform.dirty = True
+            transform.matrix()
+
+    def cached_unchanged():
+        for transform, state in zip(transforms, rotated):
+            cached_text_transform(transform, *state)
+
+    for transform, state in zip(transforms, rotated):
+        cached_text_transform(transform, *state)
+    worst = max(
+        max_difference(legacy_text_transform(*state), cached_text_transform(LayerTransform(), *state))
+        for state in states
+    )
+
+    legacy = best_of(legacy_update, repeat=20)
+    cached = best_of(cached_update, repeat=20)
+    unchanged = best_of(cached_unchanged, repeat=20)
+
+    print(f"layers: {count}")
+    print(f"OrderlyTransform rebuild   : {legacy * 1e6 / count:8.2f} us/layer "
+          f"({legacy * 1000:.2f} ms per update of all layers)")
+    print(f"closed-form recompose      : {cached * 1e6 / count:8.2f} us/layer "
+          f"({cached * 1000:.2f} ms)")
+    print(f"unchanged components       : {unchanged * 1e6 / count:8.2f} us/layer "
+          f"({unchanged * 1000:.2f} ms)")
+    print(f"speedup                    : {legacy / cached:8.1f}x")
+    print(f"max matrix difference      : {worst:.2e}")
+
+    # Whole scene: rotate every layer, then one scheduler flush
+    view, scene, layers = make_scene(count)
+    scheduler = scene.update_scheduler
+    angle = [0.0]
+
+    def rotate_all():
+        angle[0] += 1.0
+        for _, attribute in layers:
+            attribute["Rotation"].emit(angle[0])
+        scheduler.flush()
+
+    scheduler.reset_stats()
+    elapsed = best_of(rotate_all, repeat=10)
+    stats = scheduler.stats()
+    print(f"scene rotate + flush       : {elapsed * 1e6 / count:8.2f} us/layer "
+          f"({elapsed * 1000:.2f} ms, {stats['transforms'] // 10} transform builds per flush)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark: completion lookup cost as the word catalogue grows
+
+Compares CompletionEngine.scores with the previous fuzzy pass, which
+tested every word having a segment that starts with the query's first
+letter.
+
+Run from the repository root:
+    python benchmarks/bench_lua_completion.py
+"""
+
+import os
+import random
+import string
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_common import best_of
+from lua_completion import CompletionEngine
+
+QUERIES = ("wsch", "var_c", "sched", "dr_up", "ts")
+
+
+class BucketEngine(CompletionEngine):
+    """The previous engine: fuzzy candidates are the whole initial bucket"""
+
+    def _fuzzy_candidates(self, folded: str):
+        return self._by_start.get(folded[0], ())
+
+
+def make_words(count: int, seed: int = 1) -> list:
+    """Identifiers shaped like script symbols: two or three segments"""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add('_'.join(
+            ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 6)))
+            for _ in range(rng.randint(2, 3))
+        ))
+    return sorted(words)
+
+
+def per_query(engine: CompletionEngine) -> float:
+    """Best time of one pass over QUERIES, per query"""
+    return best_of(lambda: [engine.scores(query) for query in QUERIES]) / len(QUERIES)
+
+
+def main():
+    print(f"{'words':>8} {'bucket scan':>13} {'bounded':>11}   fuzzy tests per query")
+    for count in (1000, 10000, 100000):
+        words = make_words(count)
+        bucket = BucketEngine(words)
+        bounded = CompletionEngine(words)
+        tested = [sum(len(list(engine._fuzzy_candidates(query))) for query in QUERIES) // len(QUERIES)
+                  for engine in (bucket, bounded)]
+        print(f"{count:>8} {per_query(bucket) * 1000:10.2f} ms {per_query(bounded) * 1000:8.2f} ms "
+              f"{tested[0]:>7} / {tested[1]:<5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Benchmark: token-based fallback checker vs. the old per-line regex scan
+
+Run from the repository root:
+    python benchmarks/bench_lua_fallback.py [size_kb]
+"""
+
+import os
+import sys
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_common import best_of
+from lua_lexer import tokenize, tokenize_blocks
+from lua_syntax_checker import ERROR_MESSAGES, ErrorSeverity, LuaSyntaxChecker, LuaSyntaxError
+
+
+SNIPPET = '''-- layer {index}
+var_{index} = 0
+local names_{index} = {{ "a", "b", [[long ( string
+with ] brackets]] }}
+--[[ block comment
+ if ( not closed here ]]
+function on_second_{index}(h, m, s)
+    if s % 2 == 0 then
+        var_{index} = var_{index} + 1
+    elseif s > 30 then
+        wm_action("m_task:goto(1)")
+    end
+    for i = 1, #names_{index} do
+        print(names_{index}[i] .. "end")
+    end
+    while var_{index} > 10 do var_{index} = var_{index} - 1 end
+    repeat var_{index} = var_{index} + 1 until var_{index} > 3
+end
+'''
+
+
+def make_script(size_kb: int) -> str:
+    parts = []
+    size = 0
+    index = 0
+    while size < size_kb * 1024:
+        part = SNIPPET.format(index=index)
+        parts.append(part)
+        size += len(part)
+        index += 1
+    return ''.join(parts)
+
+
+def legacy_remove_strings(line: str) -> str:
+    """The old char-by-char string stripper"""
+    result = []
+    in_string = False
+    string_char = None
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if not in_string:
+            if char in '"\'':
+                in_string = True
+                string_char = char
+            else:
+                result.append(char)
+        else:
+            if char == string_char and (i == 0 or line[i-1] != '\\'):
+                in_string = False
+        i += 1
+    return ''.join(result)
+
+
+def legacy_fallback_check(code: str) -> List[LuaSyntaxError]:
+    """The old per-line scan, copied verbatim from the previous checker"""
+    errors = []
+    lines = code.split('\n')
+
+    # Track block pairing
+    block_stack = []
+    block_keywords = {
+        'function': 'end', 'if': 'end', 'for': 'end',
+        'while': 'end', 'do': 'end', 'repeat': 'until',
+    }
+
+    # Track brackets across all lines
+    paren_balance = 0
+    bracket_balance = 0
+    brace_balance = 0
+    paren_open_line = -1
+    bracket_open_line = -1
+    brace_open_line = -1
+
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+
+        if stripped.startswith('--') or not stripped:
+            continue
+
+        clean_line = legacy_remove_strings(stripped)
+
+        # Check block start
+        for keyword in block_keywords:
+            if (clean_line.startswith(keyword + ' ') or
+                clean_line.startswith(keyword + '(') or
+                clean_line == keyword):
+                block_stack.append((keyword, i))
+                break
+
+        # Check block end
+        if (clean_line == 'end' or clean_line.startswith('end ') or
+            clean_line.startswith('end)') or clean_line.startswith('end,')):
+            if block_stack:
+                block_stack.pop()
+            else:
+                errors.append(LuaSyntaxError(
+                    line=i, column=0,
+                    message="Unexpected 'end'",
+                    severity=ErrorSeverity.ERROR,
+                    error_code="E003"
+                ))
+
+        # Check until
+        if clean_line.startswith('until ') or clean_line == 'until':
+            if block_stack and block_stack[-1][0] == 'repeat':
+                block_stack.pop()
+
+        # Track brackets
+        for char in clean_line:
+            if char == '(':
+                if paren_balance == 0:
+                    paren_open_line = i
+                paren_balance += 1
+            elif char == ')':
+                paren_balance -= 1
+                if paren_balance < 0:
+                    errors.append(LuaSyntaxError(
+                        line=i, column=0,
+                        message="Unmatched ')'",
+                        severity=ErrorSeverity.ERROR,
+                        error_code="E004"
+                    ))
+                    paren_balance = 0
+            elif char == '[':
+                if bracket_balance == 0:
+                    bracket_open_line = i
+                bracket_balance += 1
+            elif char == ']':
+                bracket_balance -= 1
+                if bracket_balance < 0:
+                    errors.append(LuaSyntaxError(
+                        line=i, column=0,
+                        message="Unmatched ']'",
+                        severity=ErrorSeverity.ERROR,
+                        error_code="E004"
+                    ))
+                    bracket_balance = 0
+            elif char == '{':
+                if brace_balance == 0:
+                    brace_open_line = i
+                brace_balance += 1
+            elif char == '}':
+                brace_balance -= 1
+                if brace_balance < 0:
+                    errors.append(LuaSyntaxError(
+                        line=i, column=0,
+                        message="Unmatched '}'",
+                        severity=ErrorSeverity.ERROR,
+                        error_code="E004"
+                    ))
+                    brace_balance = 0
+
+    # Report unclosed blocks
+    for keyword, line_num in block_stack:
+        errors.append(LuaSyntaxError(
+            line=line_num, column=0,
+            message=ERROR_MESSAGES["E003"].format(keyword=keyword, start_line=line_num + 1),
+            severity=ErrorSeverity.ERROR,
+            error_code="E003"
+        ))
+
+    # Report unclosed brackets
+    if paren_balance > 0:
+        errors.append(LuaSyntaxError(
+            line=paren_open_line, column=0,
+            message="Unclosed '('",
+            severity=ErrorSeverity.ERROR,
+            error_code="E004"
+        ))
+    if bracket_balance > 0:
+        errors.append(LuaSyntaxError(
+            line=bracket_open_line, column=0,
+            message="Unclosed '['",
+            severity=ErrorSeverity.ERROR,
+            error_code="E004"
+        ))
+    if brace_balance > 0:
+        errors.append(LuaSyntaxError(
+            line=brace_open_line, column=0,
+            message="Unclosed '{'",
+            severity=ErrorSeverity.ERROR,
+            error_code="E004"
+        ))
+
+    return errors
+
+
+def main():
+    size_kb = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    code = make_script(size_kb)
+    checker = LuaSyntaxChecker()
+
+    print(f"script: {len(code) / 1024:.0f} KB, {code.count(chr(10))} lines")
+
+    legacy = best_of(legacy_fallback_check, code, repeat=10)
+    lexer = best_of(tokenize, code, repeat=10)
+    blocks = best_of(tokenize_blocks, code, repeat=10)
+    fallback = best_of(checker._basic_fallback_check, code, repeat=10)
+
+    print(f"legacy per-line scan : {legacy * 1000:8.2f} ms "
+          f"({len(legacy_fallback_check(code))} false errors)")
+    print(f"tokenize only        : {lexer * 1000:8.2f} ms ({len(tokenize(code))} tokens)")
+    print(f"tokenize_blocks only : {blocks * 1000:8.2f} ms ({len(tokenize_blocks(code))} tokens)")
+    print(f"token fallback check : {fallback * 1000:8.2f} ms "
+          f"({len(checker._basic_fallback_check(code))} errors)")
+    print(f"speedup              : {legacy / fallback:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark: token-aware formatter vs. the old first-word formatter
+
+Run from the repository root:
+    python benchmarks/bench_lua_format.py [lines]
+"""
+
+import os
+import sys
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_common import best_of
+from bench_lua_fallback import SNIPPET
+from lua_formatter import format_lines
+from lua_lexer import tokenize_structure
+
+
+def make_script(line_count: int) -> str:
+    """Unindented copies of SNIPPET, about line_count lines long"""
+    lines = []
+    index = 0
+    while len(lines) < line_count:
+        lines.extend(line.lstrip() for line in SNIPPET.format(index=index).split('\n')[:-1])
+        index += 1
+    return '\n'.join(lines[:line_count])
+
+
+def legacy_format(code: str) -> List[str]:
+    """The old ScriptView.format_code loop, without the editor update"""
+    formatted_lines = []
+    indent_level = 0
+    indent_str = "  "
+
+    increase_indent = {'function', 'if', 'for', 'while', 'do', 'repeat', 'else', 'elseif'}
+    decrease_indent = {'end', 'until', 'else', 'elseif'}
+
+    for line in code.split('\n'):
+        stripped = line.strip()
+
+        first_word = stripped.split()[0] if stripped.split() else ''
+        if first_word in decrease_indent:
+            indent_level = max(0, indent_level - 1)
+
+        if stripped:
+            formatted_lines.append(indent_str * indent_level + stripped)
+        else:
+            formatted_lines.append('')
+
+        if first_word in increase_indent and first_word not in {'else', 'elseif'}:
+            indent_level += 1
+        elif first_word in {'else', 'elseif'}:
+            indent_level += 1
+
+    return formatted_lines
+
+
+def changed_lines(code: str, lines: List[str]) -> int:
+    return sum(old != new for old, new in zip(code.split('\n'), lines))
+
+
+def main():
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    code = make_script(line_count)
+
+    print(f"script: {len(code) / 1024:.0f} KB, {code.count(chr(10)) + 1} lines")
+
+    legacy = best_of(legacy_format, code, repeat=3)
+    scan = best_of(tokenize_structure, code, repeat=3)
+    formatter = best_of(format_lines, code, repeat=3)
+
+    # One-liners such as "while c do x end" make the old formatter drift
+    tail = legacy_format(code + '\nx')[-1]
+    formatted = '\n'.join(format_lines(code))
+    print(f"legacy first-word    : {legacy * 1000:8.2f} ms "
+          f"(drifted {(len(tail) - len(tail.lstrip())) // 2} levels by the end)")
+    print(f"structure scan only  : {scan * 1000:8.2f} ms ({len(tokenize_structure(code))} tokens)")
+    print(f"token formatter      : {formatter * 1000:8.2f} ms "
+          f"({changed_lines(code, format_lines(code))} lines to edit)")
+    print(f"idempotent           : {format_lines(formatted) == formatted.split(chr(10))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,38 @@
 from PyQt5.QtWidgets import QApplication, QWidget, QPushButton, QLayout, QLabel, QStackedWidget, QUndoCommand, QUndoStack, QUndoGroup
-from PyQt5.QtCore import QPoint, QRect, QSize, Qt, pyqtSignal, QMimeData
+from PyQt5.QtCore import QEvent, QPoint, QRect, QSize, Qt, pyqtSignal, QMimeData
 from PyQt5.QtGui import QFont, QFontDatabase, QColor, QPainter, QPainterPath, QRegion, QDrag
 import os
 
+# 預覽與屬性面板共用 label 的字型管理器
+from label import FontManager
+
 def get_data(obj):
     return ""
 
 class FlowLayout(QLayout):
+    """由左至右、自動換行的排版
+
+    item 的 sizeHint 與每個寬度的排版結果都會快取，只有 item 增減或
+    invalidate() 時才重新計算；套用幾何時略過沒有變動的 item，以及新舊位置
+    都在可視範圍外的 item（捲動進入可視範圍時才套用）。
+    """
+
+    # 記住的寬度數量上限（拖曳調整大小時寬度會連續變化）
+    MAX_CACHED_WIDTHS = 32
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.itemList = []
         self._cached_height = 0
+        self._hints = None          # 快取的 item sizeHint
+        self._layouts = {}          # 寬度 -> (各 item 相對位置, 總高度)
+        self._last_rect = None      # 上次套用的 rect
+        self._pending = {}          # item -> 尚未套用的 QRect（在可視範圍外）
+        self._watching = None       # 已安裝 event filter 的父元件
 
     def addItem(self, item):
         self.itemList.append(item)
+        self._clear_cache()
 
     def sizeHint(self):
         return self.minimumSize()
@@ -23,7 +42,7 @@ class FlowLayout(QLayout):
         size = QSize(0, 0)
         if self.itemList:
             # 計算最小寬度（至少容納一個 item）
-            first_hint = self.itemList[0].sizeHint()
+            first_hint = self._item_hints()[0]
             size.setWidth(first_hint.width() + margin.left() + margin.right())
             # 高度使用緩存的計算高度
             size.setHeight(self._cached_height + margin.top() + margin.bottom())
@@ -33,8 +52,7 @@ class FlowLayout(QLayout):
         return True
 
     def heightForWidth(self, width):
-        height = self.doLayout(QRect(0, 0, width, 0), True)
-        return height
+        return self._layout_for_width(width)[1]
 
     def count(self):
         return len(self.itemList)
@@ -46,140 +64,115 @@ class FlowLayout(QLayout):
 
     def takeAt(self, index):
         if 0 <= index < len(self.itemList):
-            return self.itemList.pop(index)
+            item = self.itemList.pop(index)
+            # 之後的 item 位置都會改變，安排重新排版
+            self.invalidate()
+            return item
         return None
 
+    def invalidate(self):
+        # item 的 sizeHint 改變（或顯示 / 隱藏）時 Qt 會呼叫
+        self._clear_cache()
+        super().invalidate()
+
     def setGeometry(self, rect):
         super().setGeometry(rect)
+        if rect == self._last_rect:
+            return  # 同一次調整中 Qt 會以相同的 rect 重複呼叫
+        self._last_rect = QRect(rect)
         self.doLayout(rect)
 
     def doLayout(self, rect, testOnly=False):
+        positions, total_height = self._layout_for_width(rect.width())
+        self._cached_height = total_height
+        if not testOnly:
+            self._apply(rect, positions)
+        return total_height
+
+    def eventFilter(self, obj, event):
+        # 父元件在捲動區域中移動 / 顯示時，套用進入可視範圍的 item
+        if obj is self._watching and self._pending and event.type() in (QEvent.Move, QEvent.Show):
+            self._apply_pending()
+        return False
+
+    def _clear_cache(self):
+        self._hints = None
+        self._layouts.clear()
+        self._last_rect = None
+        # item 增減後舊的目標位置已失效，下次排版會重新計算
+        self._pending.clear()
+
+    def _item_hints(self):
+        if self._hints is None:
+            self._hints = [item.sizeHint() for item in self.itemList]
+        return self._hints
+
+    def _layout_for_width(self, width):
+        """各 item 相對於 rect 左上角的位置與總高度（依寬度記憶）"""
+        cached = self._layouts.get(width)
+        if cached is not None:
+            return cached
+
         margin = self.contentsMargins()
-        x = rect.x() + margin.left()
-        y = rect.y() + margin.top()
+        spacing = self.spacing()
+        right = width - 1 - margin.right()
+        x = margin.left()
+        y = margin.top()
         lineHeight = 0
+        positions = []
 
-        for item in self.itemList:
-            hint = item.sizeHint()
-            spaceX = self.spacing()
-            spaceY = self.spacing()
-
-            nextX = x + hint.width() + spaceX
+        for hint in self._item_hints():
+            nextX = x + hint.width() + spacing
 
             # 換行
-            if nextX > rect.right() - margin.right() and lineHeight > 0:
-                x = rect.x() + margin.left()
-                y += lineHeight + spaceY
-                nextX = x + hint.width() + spaceX
+            if nextX > right and lineHeight > 0:
+                x = margin.left()
+                y += lineHeight + spacing
+                nextX = x + hint.width() + spacing
                 lineHeight = 0
 
-            if not testOnly:
-                item.setGeometry(QRect(QPoint(x, y), hint))
-
+            positions.append((x, y))
             x = nextX
             lineHeight = max(lineHeight, hint.height())
 
-        total_height = y + lineHeight - rect.y() + margin.bottom()
-        self._cached_height = total_height
-        return total_height
-
-class FontManager:
-    """字型管理器，負責載入和管理自訂字型"""
-
-    _instance = None
-    _fonts_loaded = False
-    _font_families = {}  # 字型檔名 -> 字型家族名稱 的映射
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-
-    def __init__(self):
-        if not FontManager._fonts_loaded:
-            self._load_fonts()
-            FontManager._fonts_loaded = True
-
-    def _load_fonts(self):
-        """載入 font 目錄中的所有 TTF 字型"""
-        # 取得 font 目錄路徑
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        font_dir = os.path.join(base_dir, "font")
-
-        if not os.path.exists(font_dir):
-            print(f"Warning: Font directory not found: {font_dir}")
-            return
-
-        # 遍歷 font 目錄中的所有 TTF 檔案
-        for filename in os.listdir(font_dir):
-            if filename.lower().endswith(('.ttf', '.otf')):
-                font_path = os.path.join(font_dir, filename)
-                self._load_font_file(font_path, filename)
-
-    def _load_font_file(self, font_path, filename):
-        """載入單個字型檔案"""
-        font_id = QFontDatabase.addApplicationFont(font_path)
-
-        if font_id == -1:
-            print(f"Warning: Failed to load font: {font_path}")
-            return
-
-        # 取得字型家族名稱
-        families = QFontDatabase.applicationFontFamilies(font_id)
-        if families:
-            family_name = families[0]
-            # 使用不含副檔名的檔名作為 key
-            font_key = os.path.splitext(filename)[0]
-            FontManager._font_families[font_key] = family_name
-            FontManager._font_families[filename] = family_name  # 也支援完整檔名
-
-    def get_font_family(self, font_name):
-        """根據字型名稱取得字型家族名稱
-
-        Args:
-            font_name: 字型檔名（可含或不含副檔名）
-
-        Returns:
-            字型家族名稱，若找不到則回傳 None
-        """
-        # 先嘗試直接匹配
-        if font_name in FontManager._font_families:
-            return FontManager._font_families[font_name]
-
-        # 嘗試不區分大小寫的匹配
-        font_name_lower = font_name.lower()
-        for key, family in FontManager._font_families.items():
-            if key.lower() == font_name_lower:
-                return family
-
-        return None
-
-    def get_available_fonts(self):
-        """取得所有可用字型的列表
-
-        Returns:
-            list: 字型名稱列表（不含副檔名）
-        """
-        # 只回傳不含副檔名的 key
-        return [k for k in FontManager._font_families.keys()
-                if not k.lower().endswith(('.ttf', '.otf'))]
-
-    def get_font(self, font_name, size=12):
-        """取得 QFont 物件
-
-        Args:
-            font_name: 字型檔名
-            size: 字型大小
-
-        Returns:
-            QFont 物件
-        """
-        family = self.get_font_family(font_name)
-        if family:
-            return QFont(family, size)
-        else:
-            # 回傳預設字型
-            return QFont("Arial", size)
+        total_height = y + lineHeight + margin.bottom()
+        if len(self._layouts) >= self.MAX_CACHED_WIDTHS:
+            self._layouts.clear()
+        self._layouts[width] = (positions, total_height)
+        return positions, total_height
+
+    def _visible_rect(self):
+        """父元件目前可見的範圍（上下各多留半個畫面），None 表示全部套用"""
+        parent = self.parentWidget()
+        if parent is None or not parent.isVisible():
+            return None
+        if self._watching is not parent:
+            parent.installEventFilter(self)
+            self._watching = parent
+        visible = parent.visibleRegion().boundingRect()
+        margin = visible.height() // 2
+        return visible.adjusted(0, -margin, 0, margin)
+
+    def _apply(self, rect, positions):
+        visible = self._visible_rect()
+        origin_x, origin_y = rect.x(), rect.y()
+        self._pending = {}
+        for item, hint, (x, y) in zip(self.itemList, self._item_hints(), positions):
+            target = QRect(origin_x + x, origin_y + y, hint.width(), hint.height())
+            current = item.geometry()
+            if current == target:
+                continue
+            if visible is not None and not target.intersects(visible) and not current.intersects(visible):
+                self._pending[item] = target
+                continue
+            item.setGeometry(target)
+
+    def _apply_pending(self):
+        visible = self._visible_rect()
+        for item, target in list(self._pending.items()):
+            if visible is None or target.intersects(visible) or item.geometry().intersects(visible):
+                item.setGeometry(target)
+                del self._pending[item]
 
 class CircularButton(QPushButton):
     """圓形按鈕
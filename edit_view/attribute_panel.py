@@ -165,10 +165,10 @@ class AttributeForm(QScrollArea):
 
         def _create_option_ui(self):
             if self.attr_type == "font":
+                # 預覽的文字圖層只支援 TTF 字型
                 font_manager = FontManager()
-                self.options = font_manager.get_available_fonts()
-                if not self.options:
-                    self.options = ["Arial"]
+                self.options = font_manager.get_ttf_fonts() or ["Arial"]
+                font_manager.fonts_changed.connect(self._on_fonts_changed)
             right_layout = QHBoxLayout(self.right)
             right_layout.setContentsMargins(0, 0, 0, 0)
             right_layout.setSpacing(4)
@@ -183,6 +183,19 @@ class AttributeForm(QScrollArea):
                 self.signal.emit(str(self.default))
             self.input.wheelEvent = lambda e: e.ignore()
 
+        def _on_fonts_changed(self):
+            """字型增減時更新下拉選單，保留目前的選擇"""
+            self.options = FontManager().get_ttf_fonts() or ["Arial"]
+            current = self.input.currentText()
+            self.input.blockSignals(True)
+            self.input.clear()
+            self.input.addItems(self.options)
+            if current and self.input.findText(current) < 0:
+                # 字型檔已移除但圖層仍使用它，保留在清單中讓面板與圖層一致
+                self.input.addItem(current)
+            self.input.setCurrentIndex(self.input.findText(current))
+            self.input.blockSignals(False)
+
         def _create_color_ui(self):
             right_layout = QHBoxLayout(self.right)
             right_layout.setContentsMargins(0, 0, 0, 0)
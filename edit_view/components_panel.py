@@ -1,4 +1,5 @@
 import os
+from dataclasses import dataclass
 from PyQt5.QtWidgets import (
     QWidget,
     QScrollArea,
@@ -14,33 +15,98 @@ from PyQt5.QtGui import (
     QPixmap,
     QIcon,
 )
+import components
 from common import FlowLayout
 from edit_view.drag_effect import *
 
 
+ICON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "img", "edit")
+ICON_SIZE = QSize(50, 50)
+
+
+@dataclass
+class ComponentEntry:
+    """組件目錄中的一個項目"""
+    name: str                   # 拖放 / 信號使用的名稱（檔名去掉 btn_ 與 .png）
+    tooltip: str
+    image_path: str
+    icon: QIcon                 # 預先縮放、所有按鈕共用的圖示
+    icon_size: QSize
+    registered: bool            # components 中是否有對應的定義
+
+
+class ComponentCatalogue:
+    """img/edit 下的組件按鈕目錄（行程內只建立一次，所有 ComponentPanel 共用）
+
+    掃描目錄、讀取並縮放圖片都只做一次；之後建立的 EditView 直接使用
+    共用的 QIcon。需在 QApplication 建立後使用。
+    """
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls(ICON_DIR)
+        return cls._instance
+
+    def __init__(self, icon_dir):
+        self.icon_dir = icon_dir
+        registry = set(components.__all__)
+        self.entries = []
+        try:
+            filenames = sorted(
+                entry.name for entry in os.scandir(icon_dir)
+                if entry.name.startswith("btn_") and entry.name.endswith(".png")
+            )
+        except OSError:
+            print(f"Warning: Component icon directory not found: {icon_dir}")
+            filenames = []
+
+        for filename in filenames:
+            image_path = os.path.join(icon_dir, filename)
+            tooltip = _generate_tooltip(filename)
+            name = tooltip.replace(" ", "_")
+            # 等比例縮放圖片以適應按鈕
+            pixmap = QPixmap(image_path)
+            if not pixmap.isNull():
+                pixmap = pixmap.scaled(ICON_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self.entries.append(ComponentEntry(
+                name, tooltip, image_path, QIcon(pixmap), pixmap.size(), name in registry
+            ))
+        self._by_name = {entry.name: entry for entry in self.entries}
+
+    def get(self, name):
+        return self._by_name.get(name)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+
 @Dragable("name")
 class ComponentButton(QPushButton):
     """組件按鈕類，支持拖拽"""
 
-    def __init__(self, image_path, tooltip_text, signal, parent=None, name=None):
+    def __init__(self, entry: ComponentEntry, signal, parent=None):
         super().__init__(parent)
         self.setObjectName("componentButton")
         self.setFixedSize(60, 60)
-        self.setToolTip(tooltip_text)
-        self.image_path = image_path
-        self.name = tooltip_text.replace(" ", "_") if name is None else name
+        self.setToolTip(entry.tooltip)
+        # components 中沒有定義的組件無法建立，停用按鈕（也無法拖曳）
+        if not entry.registered:
+            self.setEnabled(False)
+            self.setToolTip(f"{entry.tooltip} (not available yet)")
+        self.image_path = entry.image_path
+        self.name = entry.name
         self.signal = signal
 
-        # 載入圖片並設置為按鈕圖示
-        if os.path.exists(image_path):
-            pixmap = QPixmap(image_path)
-            # 等比例縮放圖片以適應按鈕
-            scaled_pixmap = pixmap.scaled(
-                50, 50, Qt.KeepAspectRatio, Qt.SmoothTransformation
-            )
-            icon = QIcon(scaled_pixmap)
-            self.setIcon(icon)
-            self.setIconSize(scaled_pixmap.size())
+        # 使用目錄中共用的圖示
+        if not entry.icon_size.isEmpty():
+            self.setIcon(entry.icon)
+            self.setIconSize(entry.icon_size)
 
     def mouseMoveEvent(self, event):
         super().mouseMoveEvent(event)
@@ -61,25 +127,8 @@ def _generate_tooltip(filename):
 
 
 def _create_component_buttons(self, signal, data=[""]):
-    """創建組件按鈕"""
-    current_dir = os.path.dirname(__file__)
-    # 2. 取得目前目錄的「父目錄」
-    current_dir = os.path.dirname(current_dir)
-    # 搜索所有 btn_ 開頭的圖片
-    image_folders = ["img/edit"]
-    button_data = []
-
-    for folder in image_folders:
-        folder_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), folder)
-        if os.path.exists(folder_path):
-            for filename in os.listdir(folder_path):
-                if filename.startswith("btn_") and filename.endswith(".png"):
-                    image_path = os.path.join(folder_path, filename)
-                    # 生成 tooltip 文字
-                    tooltip = _generate_tooltip(filename)
-                    button_data.append((image_path, tooltip))
-
-    return [ComponentButton(data[0], data[1], signal, self) for data in button_data]
+    """創建組件按鈕（圖示來自共用的 ComponentCatalogue）"""
+    return [ComponentButton(entry, signal, self) for entry in ComponentCatalogue.instance()]
 
 class ComponentPanel(QScrollArea):
     add_component = pyqtSignal(object, object)
@@ -63,10 +63,8 @@ from PyQt5.QtGui import (
     QFont,
     QVector2D,
 )
-from script_view import ScriptView
 from common import FlowLayout, StackWidget, FontManager
 import components
-import numpy as np
 
 _ANGLE_CURSORS = [
     (  0.0, Qt.SizeHorCursor),        # ←→  East / West
@@ -93,6 +91,25 @@ def _cursor_for_angle(deg: float) -> Qt.CursorShape:
             best_cursor = cursor
     return best_cursor
 
+def _axis_scales(transform):
+    """transform 在 X / Y 軸上的縮放倍率"""
+    return (math.hypot(transform.m11(), transform.m12()),
+            math.hypot(transform.m21(), transform.m22()))
+
+
+def _view_scale(scene):
+    """場景第一個 View 的縮放倍率；GraphicsScene 會在 view 變更時快取"""
+    if scene is None:
+        return None
+    cached = getattr(scene, "view_scale", None)
+    if cached is not None:
+        return cached
+    views = scene.views()
+    if not views:
+        return None
+    return _axis_scales(views[0].viewportTransform())
+
+
 # comunicate obj
 class Signal(QObject):
     thisF = pyqtSignal(float)
@@ -135,138 +152,152 @@ class Signal(QObject):
             self.finish.emit()
 
 
-class OrderlyTransform(QTransform):
-    def __init__(self, inherit=None):
-        super().__init__()
-        self.new = inherit
-        try:
-            self.push()
-        except TypeError:
-            pass
-
-    def next_step(self, matrix=None):
-        if self.new is not None:
-            self.push()
-        if matrix is None:
-            self.new = QTransform()
-            return
-        self.new = matrix
-
-    def push(self):
-        self *= self.new
-        self.new = None
-
-    def rotate(self, angle, axis=Qt.ZAxis):
-        if self.new is None:
-            return super().rotate(angle, axis)
-        self.new.rotate(angle, axis)
-
-    def rotateRadians(self, angle, axis=Qt.ZAxis):
-        if self.new is None:
-            return super().rotateRadians(angle, axis)
-        self.new.rotateRadians(angle, axis)
+def _rotation_components(angle):
+    """角度的 (cos, sin)；90 度的倍數回傳精確值（同 QTransform.rotate）"""
+    angle = float(angle)
+    quarter = angle % 360.0
+    if quarter == 0.0:
+        return 1.0, 0.0
+    if quarter == 90.0:
+        return 0.0, 1.0
+    if quarter == 180.0:
+        return -1.0, 0.0
+    if quarter == 270.0:
+        return 0.0, -1.0
+    radians = math.radians(angle)
+    return math.cos(radians), math.sin(radians)
+
+
+class LayerTransform:
+    """圖層 transform 的快取分量，以封閉式一次組合成 QTransform
+
+    套用順序（Qt 的列向量慣例，p' = p * M）：
+        縮放 (scale) → 平移 (offset) → 錯切 (shear) → 平移 (align) → 旋轉 (rotation)
+    各 setter 只在數值改變時重算對應分量並標記 dirty；matrix() 只有在
+    dirty 時才重新組合。
+    """
 
-    def scale(self, sx, sy):
-        if self.new is None:
-            return super().scale(sx, sy)
-        self.new.scale(sx, sy)
+    __slots__ = (
+        "skew", "shear", "angle", "rotation", "scale", "offset", "align",
+        "dirty", "_matrix",
+    )
+
+    def __init__(self):
+        self.skew = (0.0, 0.0)       # 錯切角度（度）
+        self.shear = (0.0, 0.0)      # (tan(skew_x), tan(skew_y))
+        self.angle = 0.0             # 旋轉角度（度）
+        self.rotation = (1.0, 0.0)   # (cos, sin)
+        self.scale = (1.0, 1.0)
+        self.offset = (0.0, 0.0)
+        self.align = (0.0, 0.0)
+        self.dirty = True
+        self._matrix = QTransform()
+
+    def set_skew(self, skew_x, skew_y):
+        skew = (float(skew_x), float(skew_y))
+        if skew != self.skew:
+            self.skew = skew
+            self.shear = (math.tan(math.radians(skew[0])), math.tan(math.radians(skew[1])))
+            self.dirty = True
+
+    def set_rotation(self, angle):
+        angle = float(angle)
+        if angle != self.angle:
+            self.angle = angle
+            self.rotation = _rotation_components(angle)
+            self.dirty = True
+
+    def set_scale(self, sx, sy):
+        scale = (float(sx), float(sy))
+        if scale != self.scale:
+            self.scale = scale
+            self.dirty = True
+
+    def set_offset(self, dx, dy):
+        offset = (float(dx), float(dy))
+        if offset != self.offset:
+            self.offset = offset
+            self.dirty = True
+
+    def set_alignment(self, dx, dy):
+        align = (float(dx), float(dy))
+        if align != self.align:
+            self.align = align
+            self.dirty = True
+
+    def matrix(self):
+        if self.dirty:
+            self._matrix = self.compose(*self.rotation)
+            self.dirty = False
+        return self._matrix
+
+    def unrotated(self):
+        """不含旋轉的 transform（SelectionBox 以此計算控制框）"""
+        return self.compose(1.0, 0.0)
+
+    def compose(self, cos_r, sin_r):
+        sx, sy = self.scale
+        ox, oy = self.offset
+        shx, shy = self.shear
+        ax, ay = self.align
+        # 錯切後再旋轉的線性部分：Shear * R
+        m11 = cos_r - shy * sin_r
+        m12 = sin_r + shy * cos_r
+        m21 = shx * cos_r - sin_r
+        m22 = shx * sin_r + cos_r
+        # 平移：offset 經錯切後加上 align，再旋轉
+        ux = ox + shx * oy + ax
+        uy = shy * ox + oy + ay
+        return QTransform(
+            sx * m11, sx * m12,
+            sy * m21, sy * m22,
+            ux * cos_r - uy * sin_r, ux * sin_r + uy * cos_r,
+        )
 
-    def setMatrix(self, m11, m12, m13, m21, m22, m23, m31, m32, m33):
-        if self.new is None:
-            return super().setMatrix(m11, m12, m13, m21, m22, m23, m31, m32, m33)
-        self.new.setMatrix(m11, m12, m13, m21, m22, m23, m31, m32, m33)
 
-    def shear(self, sh, sv):
-        if self.new is None:
-            return super().shear(sh, sv)
-        self.new.shear(sh, sv)
+class ItemGroup:
+    """固定成員的圖形項目群組（key -> item），以明確的方法批次操作
 
-    def translate(self, dx, dy):
-        if self.new is None:
-            return super().translate(dx, dy)
-        self.new.translate(dx, dy)
+    取代以 __getattr__ 動態轉發的容器：成員在建立時決定，批次方法直接
+    迴圈呼叫，不會在每次存取時檢查屬性或配置新的容器。
+    """
 
+    __slots__ = ("_items",)
 
-class BatchProcessContainer:
-    def __init__(self, container):
-        iter(container)
-        self._container = container
+    def __init__(self, items):
+        self._items = dict(items)
 
     def __getitem__(self, key):
-        return self._container[key]
+        return self._items[key]
 
     def __len__(self):
-        return len(self._container)
+        return len(self._items)
 
     def __iter__(self):
-        return iter(self._container)
-
-    def __contains__(self, item):
-        return item in self._container
+        return iter(self._items)
 
-    def __setitem__(self, key, value):
-        self._container[key] = value
-
-    def __delitem__(self, key):
-        del self._container[key]
+    def __contains__(self, key):
+        return key in self._items
 
     def __repr__(self):
-        return f"{self.__class__.__name__}({self._container!r})"
-
-    def __getattr__(self, name):
-        if hasattr(self._container, name):
-            return getattr(self._container, name)
+        return f"{self.__class__.__name__}({self._items!r})"
 
-        is_callable_feature = None
+    def keys(self):
+        return self._items.keys()
 
-        if isinstance(self._container, dict):
-            result_dict = {}
-            for key, value in self._container.items():
-                var = getattr(value, name)
+    def values(self):
+        return self._items.values()
 
-                current_is_callable = callable(var)
-                if is_callable_feature is None:
-                    is_callable_feature = current_is_callable
-                elif is_callable_feature != current_is_callable:
-                    raise AttributeError(
-                        f"All elements of {type(self)} should have the same feature type for '{name}'"
-                    )
+    def items(self):
+        return self._items.items()
 
-                result_dict[key] = var
+    def setZValue(self, z):
+        for item in self._items.values():
+            item.setZValue(z)
 
-            return BatchProcessContainer(result_dict)
-
-        result_list = []
-        for item in self._container:
-            var = getattr(item, name)
-
-            current_is_callable = callable(var)
-            if is_callable_feature is None:
-                is_callable_feature = current_is_callable
-            elif is_callable_feature != current_is_callable:
-                raise AttributeError(
-                    f"All elements of {type(self)} should have the same feature type for '{name}'"
-                )
-
-            result_list.append(var)
-
-        return BatchProcessContainer(result_list)
-
-    def __call__(self, *args, **kwargs):
-        if isinstance(self._container, dict):
-            result_dict = {}
-            for key, func in self._container.items():
-                if not callable(func):
-                    raise TypeError(f"Item at key '{key}' is not callable")
-                result_dict[key] = func(*args, **kwargs)
-            return BatchProcessContainer(result_dict)
-
-        result_list = []
-        for func in self._container:
-            if not callable(func):
-                raise TypeError(f"Item {func!r} inside container is not callable")
-            result_list.append(func(*args, **kwargs))
-        return BatchProcessContainer(result_list)
+    def setVisible(self, visible):
+        for item in self._items.values():
+            item.setVisible(visible)
 
 
 # =============================================================================
@@ -282,7 +313,6 @@ class SelectionBox(QGraphicsRectItem):
             | QGraphicsItem.ItemIsMovable
             | QGraphicsItem.ItemIsFocusable
         )
-        self.updating = False
         self.selected = False
         dashed_pen = QPen(QColor(80, 150, 220), 1)
         dashed_pen.setStyle(Qt.DashLine)
@@ -311,22 +341,34 @@ class SelectionBox(QGraphicsRectItem):
     def edit_finish(self,*args):
         self.parent.edit_finish(*args)
 
-    def update_child_state(self):
+    def update_child_state(self, view_scale=None):
+        """更新控制點；View 與控制框本身的縮放只計算一次再傳給各控制點"""
+        if view_scale is None:
+            view_scale = _view_scale(self.scene())
+        item_scale = _axis_scales(self.sceneTransform())
         self.scale_handle.update_pos(self.rect().width(), self.rect().height())
-        self.rotate.update_pos(self.parent.x_offset,self.parent.y_offset)
-        self.scale_handle.update_transform()
+        self.rotate.update_pos(self.parent.x_offset,self.parent.y_offset, view_scale, item_scale)
+        self.scale_handle.update_transform(view_scale, item_scale)
 
     # ▼ 新增這個方法：動態計算控制點位置，抵消父元件縮放
     def update_scale(self):
-        if self.updating:
-            return
-        x_offset=0
-        y_offset=0
-        self.updating = True
-        parent_rotate = self.parent.rotation()
-        self.parent.rotate(0)
-        self.parent.setLayerTransform()
-        rect = self.parent.sceneBoundingRect()
+        """依圖層的本地邊界與目前的 transform 直接計算控制框
+
+        圖層 transform 的最後一步是旋轉，直接由快取的分量組合出未旋轉的
+        transform，不需要把圖層轉回 0 度重建兩次。
+        """
+        self.parent.count_update("controllers")
+        parent_rotate = float(self.parent.rotation())
+        parent_rect = self.parent.boundingRect()
+        # 顯示時圖層可能還有等待中的更新 (例如文字剛改變)，先依目前邊界更新分量
+        self.parent.update_transform_components()
+        unrotated = self.parent.layer_transform.unrotated()
+        scene_transform = unrotated * QTransform.fromTranslate(self.parent.x(), self.parent.y())
+        parent_item = self.parent.parentItem()
+        if parent_item is not None:
+            scene_transform *= parent_item.sceneTransform()
+        rect = scene_transform.mapRect(parent_rect)
+
         transform = QTransform()
         transform.translate(rect.width() / 2, rect.height() / 2)
         self.setTransform(transform)
@@ -334,17 +376,11 @@ class SelectionBox(QGraphicsRectItem):
         rect.moveTo(-rect.width() / 2, -rect.height() / 2)
         self.setRect(rect)
         if self.alignment:
-            pb_rect=self.parent.boundingRect()
-            x_offset=self.parent.x_offset
-            y_offset=self.parent.y_offset
-            align_dx = pb_rect.width() * x_offset
-            align_dy = pb_rect.height() * y_offset
+            align_dx = parent_rect.width() * self.parent.x_offset
+            align_dy = parent_rect.height() * self.parent.y_offset
             self.setTransformOriginPoint(align_dx,align_dy)
         self.setRotation(parent_rotate)
         self.update_child_state()
-        self.parent.rotate(parent_rotate)
-        self.parent.setLayerTransform()
-        self.updating = False
 
     def set_scale(self,direction: str, delta: QPointF):
         app = QApplication.instance()
@@ -411,16 +447,16 @@ class RotateHandle(QGraphicsEllipseItem):
         self.pie_chart = None
         self.radius = None
 
-    def update_pos(self,x_offset,y_offset):
+    def update_pos(self,x_offset,y_offset,view_scale=None,item_scale=None):
         # 1. 取得 Item 相對於場景的縮放 (sy_item)
-        t_item = self.parent.sceneTransform()
-        sy_item = math.hypot(t_item.m21(), t_item.m22())
+        if item_scale is None:
+            item_scale = _axis_scales(self.parent.sceneTransform())
+        sy_item = item_scale[1]
         # 2. 取得 View 相對於場景的縮放 (sy_view)
         # 假設只有一個 View
-        sy_view = 1.0
-        if self.scene() and self.scene().views():
-            t_view = self.scene().views()[0].viewportTransform()
-            sy_view = math.hypot(t_view.m21(), t_view.m22())
+        if view_scale is None:
+            view_scale = _view_scale(self.scene())
+        sy_view = view_scale[1] if view_scale is not None else 1.0
         # 3. 總合縮放比例
         total_sy = sy_item * sy_view
         if total_sy == 0:
@@ -519,24 +555,28 @@ class ScaleHandle(QGraphicsRectItem):
 
         self._drag_start_scene: QPointF | None = None
 
-    def update_transform(self):
-        p = self.parentItem()  # SelectionBox
-        if not p or not self.scene() or not self.scene().views():
-            return
+    def update_transform(self, view_scale=None, item_scale=None):
+        t = self.counter_scale(view_scale, item_scale)
+        if t is not None:
+            self.setTransform(t)
 
-        # 1. 取得 View 的縮放比例 (注意：這不包含 Item 自身的變換)
-        view = self.scene().views()[0]
-        view_t = view.viewportTransform()
+    def counter_scale(self, view_scale=None, item_scale=None):
+        """抵消 View 與控制框縮放的 transform；無法計算時回傳 None"""
+        p = self.parentItem()  # SelectionBox
+        if view_scale is None:
+            view_scale = _view_scale(self.scene())
+        if not p or view_scale is None:
+            return None
 
-        # 計算 View 在 X 和 Y 軸上的視覺縮放倍率
-        view_sx = math.hypot(view_t.m11(), view_t.m12())
-        view_sy = math.hypot(view_t.m21(), view_t.m22())
+        # 1. View 的縮放比例 (注意：這不包含 Item 自身的變換)
+        # 由 SelectionBox 在每次 view 變更時計算一次後傳入
+        view_sx, view_sy = view_scale
 
         # 2. 取得 Item (Component) 自身的縮放比例
         # 這是為了確保手柄也不會因為你拉大圖層而變形
-        item_t = p.sceneTransform()
-        item_sx = math.hypot(item_t.m11(), item_t.m12())
-        item_sy = math.hypot(item_t.m21(), item_t.m22())
+        if item_scale is None:
+            item_scale = _axis_scales(p.sceneTransform())
+        item_sx, item_sy = item_scale
 
         # 3. 總合抵銷倍率
         # 我們要抵銷 (View縮放 * Item縮放)，讓手柄在螢幕上永遠是固定像素大小
@@ -551,7 +591,7 @@ class ScaleHandle(QGraphicsRectItem):
         # 使用 setTransform 並保持矩陣的旋轉部分為 0 (因為旋轉由父元件繼承)
         t = QTransform()
         t.scale(inv_sx, inv_sy)
-        self.setTransform(t)
+        return t
 
     def update_pos(self, w, h):
         x = self.handle_direction[self.direction][0] * w
@@ -629,15 +669,106 @@ class ScaleHandle(QGraphicsRectItem):
 
     @classmethod
     def create_Handle(cls, method, parent):
-        handles = {}
-        w, h = parent.boundingRect().width(), parent.boundingRect().height()
-        for direction in cls.handle_direction:
-            handle = cls(direction, method, parent)
-            x = cls.handle_direction[direction][0] * w
-            y = cls.handle_direction[direction][1] * h
-            handle.setPos(x, y)
-            handles[direction] = handle
-        return BatchProcessContainer(handles)
+        handles = ScaleHandleGroup(
+            (direction, cls(direction, method, parent)) for direction in cls.handle_direction
+        )
+        rect = parent.boundingRect()
+        handles.update_pos(rect.width(), rect.height())
+        return handles
+
+
+class ScaleHandleGroup(ItemGroup):
+    """SelectionBox 的八個縮放控制點（方向 -> ScaleHandle）"""
+
+    __slots__ = ("_placement",)
+
+    def __init__(self, handles):
+        super().__init__(handles)
+        # (控制點, X 比例, Y 比例)
+        self._placement = tuple(
+            (handle, *ScaleHandle.handle_direction[direction])
+            for direction, handle in self._items.items()
+        )
+
+    def update_pos(self, w, h):
+        for handle, fx, fy in self._placement:
+            handle.setPos(fx * w, fy * h)
+
+    def update_transform(self, view_scale=None, item_scale=None):
+        """所有控制點共用同一個縮放抵消 transform，只計算一次"""
+        if not self._placement:
+            return
+        t = self._placement[0][0].counter_scale(view_scale, item_scale)
+        if t is None:
+            return
+        for handle, _, _ in self._placement:
+            handle.setTransform(t)
+
+
+# 圖層更新旗標：屬性變更只標記 dirty，由 LayerUpdateScheduler 每個 frame 合併處理
+DIRTY_TRANSFORM = 1   # 重新組合圖層的 QTransform（包含控制框）
+DIRTY_CONTROLLER = 2  # 重新計算 SelectionBox 幾何（只在控制框可見時）
+
+
+class LayerUpdateScheduler(QObject):
+    """場景內圖層更新的排程器
+
+    一次拖曳或屬性變更會觸發多個 slot（例如 Skew X 同時呼叫 skew_x 與
+    setLayerTransform），這裡只記錄哪些圖層需要更新，回到事件迴圈後
+    （下一次繪製前）每個圖層只重建一次 transform 與控制框。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._dirty = {}  # 圖層 -> 旗標
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.flush)
+        self.reset_stats()
+
+    def mark(self, layer, flags=DIRTY_TRANSFORM):
+        self.requests += 1
+        pending = self._dirty.get(layer, 0)
+        if pending:
+            self.coalesced += 1
+        self._dirty[layer] = pending | flags
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self, layer=None):
+        """立即套用等待中的更新；layer 不為 None 時只處理該圖層"""
+        if layer is not None:
+            flags = self._dirty.pop(layer, 0)
+            if flags:
+                layer.flush_update(flags)
+            return
+        if not self._dirty:
+            return
+        self.flushes += 1
+        dirty, self._dirty = self._dirty, {}
+        for layer, flags in dirty.items():
+            layer.flush_update(flags)
+
+    def count(self, name):
+        setattr(self, name, getattr(self, name) + 1)
+
+    def reset_stats(self):
+        self.requests = 0      # mark() 次數
+        self.coalesced = 0     # 已是 dirty 而被合併的次數
+        self.flushes = 0       # 實際處理的 frame 數
+        self.transforms = 0    # QTransform 重建次數
+        self.controllers = 0   # SelectionBox.update_scale 次數
+
+    def stats(self):
+        return {
+            "pending": len(self._dirty),
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "flushes": self.flushes,
+            "transforms": self.transforms,
+            "controllers": self.controllers,
+        }
 
 
 class GraphicsScene(QGraphicsScene):
@@ -647,6 +778,9 @@ class GraphicsScene(QGraphicsScene):
     def __init__(self, parent=None, signal=None):
         super().__init__(parent)
         self.signal = signal
+        self.update_scheduler = LayerUpdateScheduler(self)
+        self.view_scale = None      # 目前 View 的 (X, Y) 縮放倍率
+        self._controllers = set()   # 場景中的 SelectionBox
         if signal is not None:
             self.signal.connect(self.viewChangeEvent)
         self.selectionChanged.connect(self._on_selection_changed)
@@ -661,14 +795,22 @@ class GraphicsScene(QGraphicsScene):
     def addItem(self, item):
         super().addItem(item)
         if isinstance(item, SelectionBox):
-            self.view_transform.connect(item.update_child_state)
+            self._controllers.add(item)
 
     def removeItem(self, item):
+        # 先套用等待中的更新，排程器不再持有已移除的圖層；
+        # 之後 (例如復原) 再加入時 transform 也已是最新狀態
+        self.update_scheduler.flush(item)
         super().removeItem(item)
         if isinstance(item, SelectionBox):
-            self.view_transform.disconnect(item.update_child_state)
+            self._controllers.discard(item)
 
     def viewChangeEvent(self, view, transform):
+        """縮放倍率只計算一次，且只更新可見的控制框（隱藏的在顯示時才更新）"""
+        self.view_scale = _axis_scales(view.viewportTransform())
+        for controller in self._controllers:
+            if controller.isVisible():
+                controller.update_child_state(self.view_scale)
         self.view_transform.emit(transform)
 
 
@@ -702,6 +844,7 @@ class Component:
         self.rotate_value = 0
         self.skew_x_value = 0
         self.skew_y_value = 0
+        self.layer_transform = LayerTransform()
         self._connected_signal=[]
         self.last_emit={}
         self.recording=False
@@ -733,39 +876,66 @@ class Component:
 
     def move_x(self, value):
         self.setPos(float(value), self.y())
-        self.controller.update_scale()
+        self.request_update(DIRTY_CONTROLLER)
 
     def move_y(self, value):
         self.setPos(self.x(), float(value))
-        self.controller.update_scale()
+        self.request_update(DIRTY_CONTROLLER)
 
     def gyro(self, value):
         return
 
     def skew_x(self, value):
         self.skew_x_value = value
+        self.layer_transform.set_skew(value, self.skew_y_value)
 
     def skew_y(self, value):
         self.skew_y_value = value
+        self.layer_transform.set_skew(self.skew_x_value, value)
 
     def rotate(self, value):
         self.rotate_value = value
+        self.layer_transform.set_rotation(value)
 
     def rotation(self):
         return self.rotate_value
 
-    def setLayerTransform(self, _=None, matrix: OrderlyTransform = None, combine=False):
-        if matrix is None:
-            matrix = OrderlyTransform()
-        matrix.next_step()
-        matrix.shear(
-            np.tan(np.deg2rad(self.skew_x_value)), np.tan(np.deg2rad(self.skew_y_value))
-        )
-        matrix.next_step()
-        matrix.rotate(float(self.rotate_value))
-        matrix.push()
-        QGraphicsItem.setTransform(self, matrix, combine)
-        self.controller.update_scale()
+    def _update_scheduler(self):
+        return getattr(self.scene() or self.parent, "update_scheduler", None)
+
+    def request_update(self, flags=DIRTY_TRANSFORM):
+        """標記需要更新；不在 GraphicsScene 中時立即更新"""
+        scheduler = self._update_scheduler()
+        if scheduler is None:
+            self.flush_update(flags)
+        else:
+            scheduler.mark(self, flags)
+
+    def flush_update(self, flags):
+        """由 LayerUpdateScheduler 每個 frame 呼叫一次"""
+        if flags & DIRTY_TRANSFORM:
+            self.apply_transform()
+        # 隱藏的控制框在顯示時 (ItemVisibleChange) 才會重新計算
+        if self.controller.isVisible():
+            self.controller.update_scale()
+
+    def count_update(self, name):
+        scheduler = self._update_scheduler()
+        if scheduler is not None:
+            scheduler.count(name)
+
+    def setLayerTransform(self, _=None):
+        self.request_update(DIRTY_TRANSFORM)
+
+    def apply_transform(self):
+        """分量有變動時才重新組合並套用 transform"""
+        self.update_transform_components()
+        if self.layer_transform.dirty:
+            self.count_update("transforms")
+            QGraphicsItem.setTransform(self, self.layer_transform.matrix())
+
+    def update_transform_components(self):
+        """更新依賴邊界的分量（置中、對齊、縮放），由子類別覆寫"""
 
     def setLayerOpacity(self, opacity):
         opacity = float(opacity) / 100
@@ -833,6 +1003,7 @@ class Group(Component):
     #
     pass
 
+
 class textLayer(Component, QGraphicsTextItem):
     # text
     # animation
@@ -870,34 +1041,16 @@ class textLayer(Component, QGraphicsTextItem):
         # tap_action
         # text_effect
 
-    def setLayerTransform(self, _=None, matrix: OrderlyTransform = None, combine=False):
-        if matrix is None:
-            matrix = OrderlyTransform()
-        matrix.next_step()
+    def update_transform_components(self):
         rect = self.boundingRect()
-        matrix.translate(-rect.width() / 2, -rect.height() / 2)
-        matrix.next_step()
-        matrix.shear(
-            np.tan(np.deg2rad(self.skew_x_value)),
-            np.tan(np.deg2rad(self.skew_y_value)),
+        self.layer_transform.set_offset(-rect.width() / 2, -rect.height() / 2)
+        self.layer_transform.set_alignment(
+            -rect.width() * self.x_offset, -rect.height() * self.y_offset
         )
-        matrix.next_step(self.layerAlignment(QTransform()))
-        matrix.next_step()
-        matrix.rotate(self.rotate_value)
-        matrix.push()
-        QGraphicsItem.setTransform(self, matrix, combine)
-        self.controller.update_scale()
-
-    def layerAlignment(self, matrix):
-        rect = self.boundingRect()
-        align_dx = -rect.width() * self.x_offset
-        align_dy = -rect.height() * self.y_offset
-        matrix.translate(align_dx, align_dy)
-        return matrix
 
     def setPlainText(self, value):
         QGraphicsTextItem.setPlainText(self, value)
-        self.controller.update_scale()
+        self.request_update(DIRTY_TRANSFORM)
 
     def setFontStyle(self, value):
         font_manager = FontManager()
@@ -944,6 +1097,10 @@ class textLayer(Component, QGraphicsTextItem):
         self.attribute["Y"].emit(y + align_dy)
 
     def set_scale(self, direction, delta):
+        # 控制框尺寸需為最新（同一 frame 內可能已有等待中的更新）
+        scheduler = self._update_scheduler()
+        if scheduler is not None:
+            scheduler.flush(self)
         rect = self.controller.boundingRect()
         W = rect.width()+math.tan(-self.skew_x_value)
         H = rect.height()+math.tan(-self.skew_y_value)
@@ -1010,8 +1167,8 @@ class imageLayer(QGraphicsPixmapItem, Component):
         Component.init_component(self, attribute)
         self.setPixmap(self.attribute["Custom image"])
         self.connect("Custom image", self.setPixmap)
-        self.connect("Width", self.setLayerTransform)
-        self.connect("Height", self.setLayerTransform)
+        self.connect("Width", self.set_width)
+        self.connect("Height", self.set_height)
         # TODO: Load actual image from Custom image path
 
     def setPixmap(self, pixmap):
@@ -1019,34 +1176,22 @@ class imageLayer(QGraphicsPixmapItem, Component):
         super().setPixmap(pixmap)
         self.setLayerTransform()
 
-    def setLayerTransform(self, value=None, matrix=None, combine=False):
-        if matrix is None:
-            matrix = QTransform()
-        matrix = self.shear(
-            matrix,
-            np.tan(np.deg2rad(self.attribute["Skew X"])),
-            np.tan(np.deg2rad(self.attribute["Skew Y"])),
-        )
-        matrix2 = QTransform()
-        try:
-            pixmap = self.pixmap()
-            sw = self.attribute["Width"] / pixmap.width()
-            sh = self.attribute["Height"] / pixmap.height()
-            matrix2.scale(sw, sh)
-        except:
-            pass
-        self.rotate(matrix2)
-        matrix2 = self.layerAlignment(matrix2)
-        matrix3 = matrix * matrix2
-        QGraphicsItem.setTransform(self, matrix3)
-        self.controller.update_scale()
+    def set_width(self, value):
+        self.width_value = float(value)
+        self.setLayerTransform()
+
+    def set_height(self, value):
+        self.height_value = float(value)
+        self.setLayerTransform()
 
-    def layerAlignment(self, matrix):
+    def update_transform_components(self):
         rect = self.boundingRect()
-        align_dx = -rect.width() * self.x_offset
-        align_dy = -rect.height() * self.y_offset
-        matrix.translate(align_dx, align_dy)
-        return matrix
+        width = getattr(self, "width_value", rect.width())
+        height = getattr(self, "height_value", rect.height())
+        if rect.width() > 0 and rect.height() > 0:
+            self.layer_transform.set_scale(width / rect.width(), height / rect.height())
+        # 縮放後的尺寸依對齊方式平移，之後才錯切與旋轉
+        self.layer_transform.set_offset(-width * self.x_offset, -height * self.y_offset)
 
     def setAlignment(self, value):
         if "c" in value.lower():
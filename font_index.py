@@ -0,0 +1,222 @@
+"""字型索引
+
+掃描 font 目錄並維護 檔名 -> (類型, 字型家族) 的索引，存放於
+cache/font_index.json，以檔案的 mtime 與大小判斷是否需要重新讀取。
+索引命中時不需要載入任何字型；TTF/OTF 在第一次被使用時才以
+QFontDatabase.addApplicationFont 註冊，BMFont 則由使用者自行延遲解析。
+
+名稱查詢（含副檔名或不含、不分大小寫）皆為 O(1) 的 dict 查詢。
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "font")
+INDEX_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "cache", "font_index.json"
+)
+
+# 索引格式變更時遞增，舊的快取檔即失效
+INDEX_VERSION = 1
+
+TTF_EXTENSIONS = ('.ttf', '.otf')
+BMFONT_EXTENSIONS = ('.fnt',)
+
+
+@dataclass
+class FontEntry:
+    """font 目錄中的一個字型檔"""
+    filename: str
+    kind: str                       # "ttf" 或 "bmfont"
+    mtime: float
+    size: int
+    family: Optional[str] = None    # TTF 的字型家族名稱（無法載入時為 None）
+
+    @property
+    def name(self) -> str:
+        """不含副檔名的字型名稱"""
+        return os.path.splitext(os.path.basename(self.filename))[0]
+
+
+class FontIndex:
+    """font 目錄的字型索引（行程內共用一份）"""
+
+    _instance = None
+
+    @classmethod
+    def instance(cls) -> "FontIndex":
+        if cls._instance is None:
+            cls._instance = cls(FONT_DIR, INDEX_CACHE_PATH)
+        return cls._instance
+
+    def __init__(self, font_dir: str, cache_path: Optional[str] = None):
+        self.font_dir = font_dir
+        self.cache_path = cache_path
+        self._entries: Dict[str, FontEntry] = {}   # 檔名 -> 項目，依檔名排序
+        # 類型 -> casefold(檔名或名稱) -> 項目；TTF 與 BMFont 可同名
+        self._lookup: Dict[str, Dict[str, FontEntry]] = {}
+        self._font_ids: Dict[str, int] = {}        # 已註冊的 TTF 檔名 -> Qt font id
+        self._added: List[FontEntry] = []          # add() 加入的目錄外字型（不寫入快取）
+        self.scan()
+
+    # -- 索引 ---------------------------------------------------------------
+
+    def scan(self):
+        """重新掃描目錄；只有新增或變更過的 TTF 需要讀取家族名稱"""
+        if not os.path.isdir(self.font_dir):
+            print(f"Warning: Font directory not found: {self.font_dir}")
+            self._set_entries([])
+            return
+
+        cached = self._load_cache()
+        entries = []
+        changed = False
+        for filename in sorted(os.listdir(self.font_dir)):
+            lower = filename.lower()
+            if lower.endswith(TTF_EXTENSIONS):
+                kind = "ttf"
+            elif lower.endswith(BMFONT_EXTENSIONS):
+                kind = "bmfont"
+            else:
+                continue
+
+            try:
+                stat = os.stat(os.path.join(self.font_dir, filename))
+            except OSError:
+                continue
+
+            entry = cached.get(filename)
+            if (entry is None or entry.kind != kind
+                    or entry.mtime != stat.st_mtime or entry.size != stat.st_size):
+                entry = FontEntry(filename, kind, stat.st_mtime, stat.st_size)
+                if kind == "ttf":
+                    entry.family = self._register(filename)
+                changed = True
+            entries.append(entry)
+
+        if changed or len(entries) != len(cached):
+            self._save_cache(entries)
+        self._set_entries(entries + self._added)
+
+    def add(self, font_path: str) -> Optional[FontEntry]:
+        """在執行期間加入 font 目錄外的字型檔（僅限本次執行）"""
+        font_path = os.path.abspath(font_path)
+        lower = font_path.lower()
+        if lower.endswith(TTF_EXTENSIONS):
+            kind = "ttf"
+        elif lower.endswith(BMFONT_EXTENSIONS):
+            kind = "bmfont"
+        else:
+            return None
+        if font_path in self._entries:
+            return self._entries[font_path]
+
+        try:
+            stat = os.stat(font_path)
+        except OSError:
+            return None
+        # 絕對路徑作為檔名，os.path.join(font_dir, 檔名) 仍指向原檔
+        entry = FontEntry(font_path, kind, stat.st_mtime, stat.st_size)
+        if kind == "ttf":
+            entry.family = self._register(font_path)
+            if entry.family is None:
+                return None
+        self._added.append(entry)
+        self._set_entries(list(self._entries.values()) + [entry])
+        return entry
+
+    def _set_entries(self, entries: List[FontEntry]):
+        self._entries = {entry.filename: entry for entry in entries}
+        self._lookup = {"ttf": {}, "bmfont": {}}
+        for entry in entries:
+            # 不含副檔名的名稱與完整檔名都可查詢
+            lookup = self._lookup[entry.kind]
+            lookup.setdefault(entry.name.casefold(), entry)
+            lookup.setdefault(entry.filename.casefold(), entry)
+
+    def _load_cache(self) -> Dict[str, FontEntry]:
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return {}
+            return {item["filename"]: FontEntry(**item) for item in data["fonts"]}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return {}
+
+    def _save_cache(self, entries: List[FontEntry]):
+        if not self.cache_path:
+            return
+        data = {
+            "version": INDEX_VERSION,
+            "fonts": [
+                {"filename": e.filename, "kind": e.kind, "mtime": e.mtime,
+                 "size": e.size, "family": e.family}
+                for e in entries
+            ],
+        }
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.debug("Failed to write font index %s: %s", self.cache_path, e)
+
+    # -- 查詢 ---------------------------------------------------------------
+
+    def find(self, font_name: str, kind: Optional[str] = None) -> Optional[FontEntry]:
+        """依名稱（可含副檔名、不分大小寫）找字型，kind 為 None 時先找 TTF"""
+        if not font_name:
+            return None
+        folded = font_name.casefold()
+        for lookup_kind in ((kind,) if kind else ("ttf", "bmfont")):
+            entry = self._lookup[lookup_kind].get(folded)
+            if entry is not None:
+                return entry
+        return None
+
+    def path(self, entry: FontEntry) -> str:
+        return os.path.join(self.font_dir, entry.filename)
+
+    def family(self, font_name: str) -> Optional[str]:
+        """TTF 字型家族名稱；第一次使用時才向 Qt 註冊字型"""
+        entry = self.find(font_name, "ttf")
+        if entry is None or entry.family is None:
+            return None
+        if entry.filename not in self._font_ids:
+            family = self._register(entry.filename)
+            if family is None:
+                return None
+            entry.family = family
+        return entry.family
+
+    def names(self, kind: Optional[str] = None) -> List[str]:
+        """字型名稱（不含副檔名）列表；無法載入的 TTF 不列入"""
+        return [
+            entry.name for entry in self._entries.values()
+            if (kind is None or entry.kind == kind)
+            and (entry.kind != "ttf" or entry.family is not None)
+        ]
+
+    def _register(self, filename: str) -> Optional[str]:
+        """以 QFontDatabase 註冊字型並回傳家族名稱"""
+        from PyQt5.QtGui import QFontDatabase
+
+        font_path = os.path.join(self.font_dir, filename)
+        font_id = QFontDatabase.addApplicationFont(font_path)
+        if font_id == -1:
+            print(f"Warning: Failed to load font: {font_path}")
+            return None
+
+        self._font_ids[filename] = font_id
+        families = QFontDatabase.applicationFontFamilies(font_id)
+        return families[0] if families else None
@@ -0,0 +1,384 @@
+"""背景圖片載入
+
+在工作執行緒以 QImageReader 解碼（可直接解碼成縮小尺寸），再回到 GUI
+執行緒轉為 QPixmap 交給呼叫端。QPixmap 只能在 GUI 執行緒建立，所以工作
+執行緒只處理 QImage。
+
+用法：
+    ImageLoader.instance().load(path, QSize(64, 64), label.setPixmap, receiver=label)
+
+相同 (路徑, 尺寸) 的請求在解碼完成前會合併為一次；receiver 已被刪除時
+不會再呼叫 callback。
+
+縮圖 (load_thumbnail) 另有兩層快取：記憶體中的 PixmapLRU，以及
+cache/thumbnails 下以 (路徑, mtime, 檔案大小, 縮圖尺寸) 雜湊命名的 PNG，
+所以每張圖只需縮放一次，之後的執行也能直接使用。原圖的 stat 結果在記憶體
+保留 THUMBNAIL_STAT_TTL 秒，繪製時不必每次讀取檔案系統；磁碟快取在共用的
+ImageLoader 建立時於背景清理，超過 THUMBNAIL_MAX_AGE 或總大小超過 THUMBNAIL_DISK_LIMIT 的
+最舊檔案會被刪除。
+"""
+
+import hashlib
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from PyQt5 import sip
+from PyQt5.QtCore import QCoreApplication, QObject, QRunnable, QSize, QThread, QThreadPool, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader, QPixmap
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "cache", "thumbnails"
+)
+# 磁碟縮圖快取上限：總大小與未使用的天數
+THUMBNAIL_DISK_LIMIT = 256 * 1024 * 1024
+THUMBNAIL_MAX_AGE = 30 * 24 * 3600
+# 原圖 stat 結果在記憶體中的有效秒數，過期後才重新檢查檔案是否變更
+THUMBNAIL_STAT_TTL = 2.0
+
+
+def read_image(path, size=None, aspect_mode=Qt.KeepAspectRatio):
+    """解碼圖片為 QImage（可在任何執行緒呼叫），失敗時回傳空的 QImage
+
+    Args:
+        path: 圖片路徑
+        size: 目標尺寸 (QSize)，None 表示原始大小
+        aspect_mode: 縮放到 size 時的比例模式
+    """
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    if size is not None and size.isValid():
+        original = reader.size()
+        if original.isValid():
+            reader.setScaledSize(original.scaled(size, aspect_mode))
+        else:
+            reader.setScaledSize(size)
+    image = reader.read()
+    return image if not image.isNull() else QImage()
+
+
+class PixmapLRU:
+    """以記憶體用量為上限的 QPixmap LRU 快取
+
+    超過 max_bytes 時從最久未使用的項目開始淘汰，並記錄命中 / 未命中 / 淘汰次數。
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()  # key -> (pixmap, 位元組數)
+
+    @staticmethod
+    def pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * max(1, pixmap.depth() // 8)
+
+    def get(self, key):
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item[0]
+
+    def put(self, key, pixmap, size=None):
+        if size is None:
+            size = self.pixmap_bytes(pixmap)
+        if size > self.max_bytes:
+            return  # 單一項目超過上限則不快取
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self._items[key] = (pixmap, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted_size) = self._items.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def discard_where(self, predicate):
+        """移除 key 符合條件的項目（例如某個字型的所有項目）"""
+        for key in [key for key in self._items if predicate(key)]:
+            self.bytes -= self._items.pop(key)[1]
+
+    def clear(self):
+        self._items.clear()
+        self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._items),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._items)
+
+
+def thumbnail_key(path, stat, size, aspect_mode=Qt.KeepAspectRatio):
+    """縮圖的內容位址：原圖變更（mtime 或大小不同）即得到新的 key"""
+    source = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|" \
+             f"{size.width()}x{size.height()}|{int(aspect_mode)}"
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+def read_thumbnail(path, key, size, aspect_mode=Qt.KeepAspectRatio, thumbnail_dir=THUMBNAIL_DIR):
+    """從磁碟快取讀取縮圖，沒有時從原圖縮放並寫入（可在任何執行緒呼叫）"""
+    cached_path = os.path.join(thumbnail_dir, key + ".png")
+    if os.path.exists(cached_path):
+        image = read_image(cached_path)
+        if not image.isNull():
+            try:
+                os.utime(cached_path)  # 更新 mtime，清理時以此判斷最近使用
+            except OSError:
+                pass
+            return image
+
+    image = read_image(path, size, aspect_mode)
+    if not image.isNull():
+        try:
+            os.makedirs(thumbnail_dir, exist_ok=True)
+            tmp_path = f"{cached_path}.{threading.get_ident()}.tmp"
+            if image.save(tmp_path, "PNG"):
+                os.replace(tmp_path, cached_path)
+        except OSError as e:
+            logger.debug("Failed to write thumbnail %s: %s", cached_path, e)
+    return image
+
+
+def prune_thumbnails(thumbnail_dir=THUMBNAIL_DIR, max_bytes=THUMBNAIL_DISK_LIMIT,
+                     max_age=THUMBNAIL_MAX_AGE):
+    """刪除過期的縮圖與殘留的暫存檔，再從最久未使用的開始刪除直到總大小低於上限
+
+    Returns:
+        刪除的檔案數
+    """
+    try:
+        names = os.listdir(thumbnail_dir)
+    except OSError:
+        return 0
+
+    now = time.time()
+    files = []  # (mtime, 大小, 路徑)
+    removed = 0
+    for name in names:
+        path = os.path.join(thumbnail_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        expired = now - stat.st_mtime > max_age
+        # 寫入中斷留下的暫存檔，超過一小時即視為殘留
+        if expired or (name.endswith(".tmp") and now - stat.st_mtime > 3600):
+            removed += _remove_file(path)
+        elif name.endswith(".png"):
+            files.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in files)
+    files.sort()
+    for _, size, path in files:
+        if total <= max_bytes:
+            break
+        removed += _remove_file(path)
+        total -= size
+    return removed
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+        return 1
+    except OSError as e:
+        logger.debug("Failed to remove thumbnail %s: %s", path, e)
+        return 0
+
+
+class _Task(QRunnable):
+    """在執行緒池中執行 func，完成後經由 loader 的信號回到 GUI 執行緒"""
+
+    def __init__(self, loader, key, func):
+        super().__init__()
+        self._loader = loader
+        self._key = key
+        self._func = func
+
+    def run(self):
+        try:
+            result = self._func()
+        except Exception as e:
+            logger.warning("Background load failed for %s: %s", self._key, e)
+            result = None
+        try:
+            self._loader._finished.emit(self._key, result)
+        except RuntimeError:
+            pass  # 程式結束時 loader 已被刪除
+
+
+class ImageLoader(QObject):
+    """共用的背景解碼執行緒池（需在 GUI 執行緒建立）"""
+
+    # (請求 key, 結果) - 從工作執行緒發出，以 queued connection 回到 GUI 執行緒
+    _finished = pyqtSignal(object, object)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+            # 共用的 loader 建立時清理一次磁碟縮圖快取
+            cls._instance.prune_disk_cache()
+        return cls._instance
+
+    def __init__(self, parent=None, thumbnail_dir=THUMBNAIL_DIR):
+        super().__init__(parent)
+        self.thumbnail_dir = thumbnail_dir
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max(2, min(QThread.idealThreadCount(), 4)))
+        self._pending = {}   # key -> (轉換函式, [(callback, receiver)])
+        self._ids = itertools.count()
+        self._finished.connect(self._deliver, Qt.QueuedConnection)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._shutdown)
+        # 縮圖的記憶體快取：縮圖 key -> QPixmap
+        self.thumbnails = PixmapLRU(64 * 1024 * 1024)
+        # (路徑, 寬, 高, 比例模式) -> (重新 stat 的時間, 縮圖 key)
+        self._thumbnail_keys = {}
+
+    def load(self, path, size=None, callback=None, receiver=None,
+             aspect_mode=Qt.KeepAspectRatio):
+        """背景解碼圖片，完成後以 QPixmap 呼叫 callback（失敗時為空的 QPixmap）
+
+        Args:
+            path: 圖片路徑
+            size: 目標尺寸 (QSize 或 (寬, 高))，None 表示原始大小
+            callback: 接收 QPixmap 的函式
+            receiver: callback 所屬的 QObject，被刪除後即不再呼叫
+            aspect_mode: 縮放到 size 時的比例模式
+        """
+        if isinstance(size, tuple):
+            size = QSize(*size)
+        size_key = (size.width(), size.height()) if size is not None else None
+        key = ("image", path, size_key, int(aspect_mode))
+        self._submit(key, lambda: read_image(path, size, aspect_mode),
+                     callback, receiver, _to_pixmap)
+
+    def cached_thumbnail(self, path, size, aspect_mode=Qt.KeepAspectRatio):
+        """記憶體中已有的縮圖，沒有時回傳 None（不會觸發載入）"""
+        key = self._thumbnail_key(path, size, aspect_mode)
+        return self.thumbnails.get(key) if key is not None else None
+
+    def load_thumbnail(self, path, size, callback=None, receiver=None,
+                       aspect_mode=Qt.KeepAspectRatio):
+        """取得預先縮放的縮圖，參數同 load()
+
+        記憶體快取命中時會立即（同步）呼叫 callback；否則在背景從磁碟快取
+        或原圖取得。
+        """
+        if isinstance(size, tuple):
+            size = QSize(*size)
+        key = self._thumbnail_key(path, size, aspect_mode)
+        if key is None:
+            if callback is not None:
+                callback(QPixmap())
+            return
+
+        pixmap = self.thumbnails.get(key)
+        if pixmap is not None:
+            if callback is not None:
+                callback(pixmap)
+            return
+
+        def remember(image):
+            pixmap = _to_pixmap(image)
+            if not pixmap.isNull():
+                self.thumbnails.put(key, pixmap)
+            return pixmap
+
+        self._submit(("thumbnail", key), lambda: read_thumbnail(path, key, size, aspect_mode, self.thumbnail_dir),
+                     callback, receiver, remember)
+
+    def _thumbnail_key(self, path, size, aspect_mode):
+        """縮圖 key；THUMBNAIL_STAT_TTL 秒內重複查詢同一張圖不會再 stat"""
+        if isinstance(size, tuple):
+            size = QSize(*size)
+        try:
+            cache_key = (path, size.width(), size.height(), int(aspect_mode))
+        except (AttributeError, TypeError):
+            return None
+        now = time.monotonic()
+        cached = self._thumbnail_keys.get(cache_key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        try:
+            stat = _stat_source(path)
+        except (OSError, TypeError, ValueError):
+            key = None
+        else:
+            key = thumbnail_key(path, stat, size, aspect_mode)
+        self._thumbnail_keys[cache_key] = (now + THUMBNAIL_STAT_TTL, key)
+        return key
+
+    def prune_disk_cache(self):
+        """在背景清理 thumbnail_dir（見 prune_thumbnails）"""
+        thumbnail_dir = self.thumbnail_dir
+        self.submit(lambda: prune_thumbnails(thumbnail_dir))
+
+    def submit(self, func, callback=None, receiver=None):
+        """在背景執行 func()，完成後於 GUI 執行緒以結果呼叫 callback
+
+        func 不可建立 QPixmap 或操作 widget；例外時結果為 None。
+        """
+        self._submit(("task", next(self._ids)), func, callback, receiver, None)
+
+    def wait_for_done(self, msecs=-1):
+        """等待所有背景工作結束（結果仍需回到事件迴圈才會送出）"""
+        return self._pool.waitForDone(msecs)
+
+    def _shutdown(self):
+        """結束時捨棄尚未開始的工作並等待執行中的工作"""
+        self._pool.clear()
+        self._pool.waitForDone()
+        self._pending.clear()
+
+    def _submit(self, key, func, callback, receiver, convert):
+        pending = self._pending.get(key)
+        if pending is not None:
+            pending[1].append((callback, receiver))
+            return
+        self._pending[key] = (convert, [(callback, receiver)])
+        self._pool.start(_Task(self, key, func))
+
+    def _deliver(self, key, result):
+        convert, callbacks = self._pending.pop(key, (None, []))
+        if convert is not None:
+            result = convert(result)
+        for callback, receiver in callbacks:
+            if callback is None or (receiver is not None and sip.isdeleted(receiver)):
+                continue
+            callback(result)
+
+
+def _stat_source(path):
+    """原圖的 stat（縮圖 key 用）"""
+    return os.stat(path)
+
+
+def _to_pixmap(image):
+    return QPixmap.fromImage(image) if image is not None and not image.isNull() else QPixmap()
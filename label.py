@@ -8,28 +8,71 @@
 
 import os
 import re
+from PyQt5 import sip
 from PyQt5.QtWidgets import QLabel, QWidget
-from PyQt5.QtCore import Qt, pyqtSignal, QRect
-from PyQt5.QtGui import QFont, QFontDatabase, QColor, QPixmap, QPainter, QImage
+from PyQt5.QtCore import Qt, pyqtSignal, QObject, QRect
+from PyQt5.QtGui import QFont, QColor, QPixmap, QPainter, QImage
+import numpy as np
+
+from font_index import FontIndex
+from image_loader import ImageLoader, PixmapLRU, read_image
+
+
+# 字元度量表的欄位（每個字元一列）
+GLYPH_DTYPE = np.dtype([
+    ('id', np.int32),        # 字元 ID (Unicode code point)
+    ('x', np.int32),         # 在圖片中的 X 座標
+    ('y', np.int32),         # 在圖片中的 Y 座標
+    ('width', np.int32),     # 字元寬度
+    ('height', np.int32),    # 字元高度
+    ('xoffset', np.int32),   # 繪製時的 X 偏移
+    ('yoffset', np.int32),   # 繪製時的 Y 偏移
+    ('xadvance', np.int32),  # 繪製下一個字元時的水平前進量
+    ('page', np.int32),      # 所在頁面 ID
+    ('chnl', np.int32),      # 通道
+])
+
+# 二進位 .fnt 的 chars / kerning 區塊格式（小端序）
+_BINARY_CHAR_DTYPE = np.dtype([
+    ('id', '<u4'), ('x', '<u2'), ('y', '<u2'), ('width', '<u2'), ('height', '<u2'),
+    ('xoffset', '<i2'), ('yoffset', '<i2'), ('xadvance', '<i2'), ('page', 'u1'), ('chnl', 'u1'),
+])
+_BINARY_KERNING_DTYPE = np.dtype([('first', '<u4'), ('second', '<u4'), ('amount', '<i2')])
+
+# 文字 .fnt 的 key=value 或 key="value"
+_KEY_VALUE_PATTERN = re.compile(r'(\w+)=(?:"([^"]*)"|(\S+))')
+
+
+def _to_int(value, default=0):
+    """解析整數值"""
+    try:
+        return int(value) if value else default
+    except (ValueError, TypeError):
+        return default
 
 
 class BMFontChar:
-    """BMFont 單個字元資訊"""
-    def __init__(self):
-        self.id = 0          # 字元 ID (ASCII/Unicode)
-        self.x = 0           # 在圖片中的 X 座標
-        self.y = 0           # 在圖片中的 Y 座標
-        self.width = 0       # 字元寬度
-        self.height = 0      # 字元高度
-        self.xoffset = 0     # 繪製時的 X 偏移
-        self.yoffset = 0     # 繪製時的 Y 偏移
-        self.xadvance = 0    # 繪製下一個字元時的水平前進量
-        self.page = 0        # 所在頁面 ID
-        self.chnl = 0        # 通道
+    """BMFont 單個字元資訊（GLYPH_DTYPE 一列的物件形式）"""
+    __slots__ = GLYPH_DTYPE.names
+
+    def __init__(self, record=None):
+        for name in GLYPH_DTYPE.names:
+            setattr(self, name, int(record[name]) if record is not None else 0)
+
+
+# 著色後的字型頁面：(字型路徑, 顏色) -> {page_id: QPixmap}
+GLYPH_ATLAS_CACHE = PixmapLRU(32 * 1024 * 1024)
+# 渲染好的字串：(字型路徑, 文字, 縮放, 顏色) -> QPixmap
+RENDERED_TEXT_CACHE = PixmapLRU(16 * 1024 * 1024)
 
 
 class BMFont:
-    """BMFont 點陣圖字型解析器"""
+    """BMFont 點陣圖字型解析器（支援文字與二進位 .fnt）
+
+    字元度量存放在 GLYPH_DTYPE 結構化陣列 glyphs 中，_glyph_rows 以 code point
+    為索引指向 glyphs 的列（-1 表示沒有此字元）；字距表以 (first << 32 | second)
+    排序存放，可用 searchsorted 一次查詢整串文字。
+    """
 
     def __init__(self, fnt_path):
         """載入 BMFont 字型
@@ -52,123 +95,196 @@ class BMFont:
         self.scale_w = 0
         self.scale_h = 0
 
-        # 頁面圖片
-        self.pages = {}  # page_id -> QPixmap
+        # 頁面圖片：解析時只解碼為 QImage（可在背景執行緒進行），
+        # 第一次繪製時才在 GUI 執行緒轉為 QPixmap
+        self.page_images = {}  # page_id -> QImage
+        self._page_pixmaps = None
 
-        # 字元映射
-        self.chars = {}  # char_id -> BMFontChar
+        # 字元度量
+        self.glyphs = np.zeros(0, dtype=GLYPH_DTYPE)
+        self._glyph_rows = np.full(1, -1, dtype=np.int32)  # code point -> glyphs 列
 
-        # 字距調整
-        self.kernings = {}  # (first, second) -> amount
+        # 字距調整（依 key 排序）
+        self._kerning_keys = np.zeros(0, dtype=np.int64)   # first << 32 | second
+        self._kerning_amounts = np.zeros(0, dtype=np.int32)
 
         # 解析 .fnt 檔案
         self._parse_fnt()
 
     def _parse_fnt(self):
-        """解析 .fnt 檔案"""
+        """解析 .fnt 檔案（依檔頭判斷文字或二進位格式）"""
         try:
-            with open(self.fnt_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    if line.startswith('info '):
-                        self._parse_info(line)
-                    elif line.startswith('common '):
-                        self._parse_common(line)
-                    elif line.startswith('page '):
-                        self._parse_page(line)
-                    elif line.startswith('char '):
-                        self._parse_char(line)
-                    elif line.startswith('kerning '):
-                        self._parse_kerning(line)
+            with open(self.fnt_path, 'rb') as f:
+                data = f.read()
+            if data[:3] == b'BMF':
+                self._parse_binary(data)
+            else:
+                self._parse_text(data.decode('utf-8'))
         except Exception as e:
             print(f"Error parsing BMFont file {self.fnt_path}: {e}")
 
-    def _parse_value(self, line, key):
-        """從行中解析指定 key 的值"""
-        # 匹配 key=value 或 key="value"
-        pattern = rf'{key}=(?:"([^"]*)"|(\S+))'
-        match = re.search(pattern, line)
-        if match:
-            return match.group(1) if match.group(1) is not None else match.group(2)
-        return None
+    def _parse_text(self, content):
+        """解析文字格式：每行只做一次 key/value 切分"""
+        chars = []
+        kernings = []
+        fields = GLYPH_DTYPE.names
 
-    def _parse_int(self, line, key, default=0):
-        """解析整數值"""
-        value = self._parse_value(line, key)
-        try:
-            return int(value) if value else default
-        except (ValueError, TypeError):
-            return default
-
-    def _parse_info(self, line):
-        """解析 info 行"""
-        self.face = self._parse_value(line, 'face') or ""
-        self.size = self._parse_int(line, 'size')
-        self.bold = self._parse_int(line, 'bold') == 1
-        self.italic = self._parse_int(line, 'italic') == 1
-
-    def _parse_common(self, line):
-        """解析 common 行"""
-        self.line_height = self._parse_int(line, 'lineHeight')
-        self.base = self._parse_int(line, 'base')
-        self.scale_w = self._parse_int(line, 'scaleW')
-        self.scale_h = self._parse_int(line, 'scaleH')
-
-    def _parse_page(self, line):
-        """解析 page 行並載入圖片"""
-        page_id = self._parse_int(line, 'id')
-        filename = self._parse_value(line, 'file')
-
-        if filename:
-            # 移除可能的引號
-            filename = filename.strip('"')
-            image_path = os.path.join(self.base_dir, filename)
-
-            if os.path.exists(image_path):
-                pixmap = QPixmap(image_path)
-                if not pixmap.isNull():
-                    self.pages[page_id] = pixmap
-                else:
-                    print(f"Warning: Failed to load BMFont image: {image_path}")
+        for line in content.splitlines():
+            tag, _, rest = line.strip().partition(' ')
+            if not tag:
+                continue
+            values = {key: quoted or plain for key, quoted, plain in _KEY_VALUE_PATTERN.findall(rest)}
+
+            if tag == 'char':
+                chars.append(tuple(_to_int(values.get(name)) for name in fields))
+            elif tag == 'kerning':
+                kernings.append((_to_int(values.get('first')), _to_int(values.get('second')),
+                                 _to_int(values.get('amount'))))
+            elif tag == 'info':
+                self.face = values.get('face') or ""
+                self.size = _to_int(values.get('size'))
+                self.bold = _to_int(values.get('bold')) == 1
+                self.italic = _to_int(values.get('italic')) == 1
+            elif tag == 'common':
+                self.line_height = _to_int(values.get('lineHeight'))
+                self.base = _to_int(values.get('base'))
+                self.scale_w = _to_int(values.get('scaleW'))
+                self.scale_h = _to_int(values.get('scaleH'))
+            elif tag == 'page':
+                filename = values.get('file')
+                if filename:
+                    self._load_page(_to_int(values.get('id')), filename)
+
+        self._set_glyphs(np.array(chars, dtype=GLYPH_DTYPE))
+        kerning = np.array(kernings, dtype=np.int64).reshape(-1, 3)
+        self._set_kernings(kerning[:, 0], kerning[:, 1], kerning[:, 2])
+
+    def _parse_binary(self, data):
+        """解析二進位格式 (BMF 版本 3)：區塊為 1 位元組類型 + 4 位元組長度"""
+        if data[3] != 3:
+            raise ValueError(f"unsupported binary BMFont version {data[3]}")
+
+        offset = 4
+        while offset + 5 <= len(data):
+            block_type = data[offset]
+            block_size = int.from_bytes(data[offset + 1:offset + 5], 'little')
+            block = data[offset + 5:offset + 5 + block_size]
+            offset += 5 + block_size
+
+            if block_type == 1:  # info
+                self.size = abs(int.from_bytes(block[0:2], 'little', signed=True))
+                self.italic = bool(block[2] & 0x04)
+                self.bold = bool(block[2] & 0x08)
+                self.face = block[14:].split(b'\0', 1)[0].decode('utf-8', 'replace')
+            elif block_type == 2:  # common
+                self.line_height, self.base, self.scale_w, self.scale_h = (
+                    int.from_bytes(block[i:i + 2], 'little') for i in range(0, 8, 2))
+            elif block_type == 3:  # pages：等長、以 \0 結尾的檔名
+                names = block.split(b'\0')[:-1]
+                for page_id, name in enumerate(names):
+                    self._load_page(page_id, name.decode('utf-8'))
+            elif block_type == 4:  # chars
+                records = np.frombuffer(block, dtype=_BINARY_CHAR_DTYPE)
+                glyphs = np.zeros(len(records), dtype=GLYPH_DTYPE)
+                for name in GLYPH_DTYPE.names:
+                    glyphs[name] = records[name]
+                self._set_glyphs(glyphs)
+            elif block_type == 5:  # kerning pairs
+                pairs = np.frombuffer(block, dtype=_BINARY_KERNING_DTYPE)
+                self._set_kernings(pairs['first'], pairs['second'], pairs['amount'])
+
+    def _load_page(self, page_id, filename):
+        """載入頁面圖片"""
+        image_path = os.path.join(self.base_dir, filename.strip('"'))
+
+        if os.path.exists(image_path):
+            image = read_image(image_path)
+            if not image.isNull():
+                self.page_images[page_id] = image
             else:
-                print(f"Warning: BMFont image not found: {image_path}")
-
-    def _parse_char(self, line):
-        """解析 char 行"""
-        char = BMFontChar()
-        char.id = self._parse_int(line, 'id')
-        char.x = self._parse_int(line, 'x')
-        char.y = self._parse_int(line, 'y')
-        char.width = self._parse_int(line, 'width')
-        char.height = self._parse_int(line, 'height')
-        char.xoffset = self._parse_int(line, 'xoffset')
-        char.yoffset = self._parse_int(line, 'yoffset')
-        char.xadvance = self._parse_int(line, 'xadvance')
-        char.page = self._parse_int(line, 'page')
-        char.chnl = self._parse_int(line, 'chnl')
-
-        self.chars[char.id] = char
-
-    def _parse_kerning(self, line):
-        """解析 kerning 行"""
-        first = self._parse_int(line, 'first')
-        second = self._parse_int(line, 'second')
-        amount = self._parse_int(line, 'amount')
-        self.kernings[(first, second)] = amount
+                print(f"Warning: Failed to load BMFont image: {image_path}")
+        else:
+            print(f"Warning: BMFont image not found: {image_path}")
+
+    @property
+    def pages(self):
+        """page_id -> QPixmap（僅限 GUI 執行緒）"""
+        if self._page_pixmaps is None:
+            self._page_pixmaps = {page_id: QPixmap.fromImage(image)
+                                  for page_id, image in self.page_images.items()}
+        return self._page_pixmaps
+
+    def _set_glyphs(self, glyphs):
+        """設定字元表並建立 code point 索引"""
+        self.glyphs = glyphs
+        size = int(glyphs['id'].max()) + 1 if len(glyphs) else 1
+        self._glyph_rows = np.full(size, -1, dtype=np.int32)
+        # 重複的 ID 以最後一筆為準（與逐行覆寫 dict 相同）
+        self._glyph_rows[glyphs['id']] = np.arange(len(glyphs), dtype=np.int32)
+
+    def _set_kernings(self, first, second, amount):
+        """設定字距表，依 (first, second) 排序"""
+        keys = (np.asarray(first, dtype=np.int64) << 32) | np.asarray(second, dtype=np.int64)
+        # 排序且重複 key 保留最後一筆
+        order = np.argsort(keys, kind='stable')[::-1]
+        keys, index = np.unique(keys[order], return_index=True)
+        self._kerning_keys = keys
+        self._kerning_amounts = np.asarray(amount, dtype=np.int32)[order][index]
+
+    def _kerning_between(self, first_ids, second_ids):
+        """多組字元對的字距（以陣列查詢）"""
+        if not len(self._kerning_keys) or not len(first_ids):
+            return np.zeros(len(first_ids), dtype=np.int32)
+        keys = (first_ids.astype(np.int64) << 32) | second_ids.astype(np.int64)
+        index = np.searchsorted(self._kerning_keys, keys)
+        index[index >= len(self._kerning_keys)] = 0
+        found = self._kerning_keys[index] == keys
+        return np.where(found, self._kerning_amounts[index], 0)
+
+    @property
+    def kernings(self):
+        """字距表的 dict 形式 {(first, second): amount}"""
+        return {(int(key >> 32), int(key & 0xFFFFFFFF)): int(amount)
+                for key, amount in zip(self._kerning_keys, self._kerning_amounts)}
+
+    def _glyph_row(self, char_id):
+        if 0 <= char_id < len(self._glyph_rows):
+            return int(self._glyph_rows[char_id])
+        return -1
 
     def get_kerning(self, first_char, second_char):
         """取得兩個字元之間的字距調整值"""
         first_id = ord(first_char) if isinstance(first_char, str) else first_char
         second_id = ord(second_char) if isinstance(second_char, str) else second_char
-        return self.kernings.get((first_id, second_id), 0)
+        return int(self._kerning_between(np.array([first_id]), np.array([second_id]))[0])
 
     def get_char(self, char):
         """取得字元資訊"""
         char_id = ord(char) if isinstance(char, str) else char
-        return self.chars.get(char_id)
+        row = self._glyph_row(char_id)
+        return BMFontChar(self.glyphs[row]) if row >= 0 else None
+
+    def _layout(self, text, scale):
+        """整串文字的排版：回傳 (字元列, 每個字元的起始 x, 總寬度)
+
+        與逐字累加相同：有字元資訊的字元先加上與前一個字元（不論是否存在）的
+        字距，再放置並前進 xadvance。
+        """
+        codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+        in_range = codes < len(self._glyph_rows)
+        rows = np.where(in_range, self._glyph_rows[np.where(in_range, codes, 0)], -1)
+        present = rows >= 0
+
+        advance = np.where(present, self.glyphs['xadvance'][rows], 0) * scale
+        kerning = np.zeros(len(codes))
+        if len(codes) > 1:
+            kerning[1:] = self._kerning_between(codes[:-1], codes[1:]) * scale
+        kerning[~present] = 0
+
+        # x 在加上本字元的字距後、前進之前的位置
+        starts = np.cumsum(kerning) + np.concatenate(([0.0], np.cumsum(advance)[:-1]))
+        width = float(kerning.sum() + advance.sum())
+        return rows[present], starts[present], width
 
     def measure_text(self, text, scale=1.0):
         """測量文字尺寸
@@ -183,25 +299,15 @@ class BMFont:
         if not text:
             return (0, 0)
 
-        width = 0
-        height = self.line_height * scale
-
-        prev_char = None
-        for char in text:
-            char_info = self.get_char(char)
-            if char_info:
-                # 加上字距調整
-                if prev_char:
-                    width += self.get_kerning(prev_char, char) * scale
-
-                width += char_info.xadvance * scale
-            prev_char = char
-
-        return (int(width), int(height))
+        _, _, width = self._layout(text, scale)
+        return (int(width), int(self.line_height * scale))
 
     def render_text(self, text, scale=1.0, color=None):
         """渲染文字為 QPixmap
 
+        結果依 (文字, 縮放, 顏色) 快取於 RENDERED_TEXT_CACHE；未命中時從
+        已著色的字型頁面 (GLYPH_ATLAS_CACHE) 直接繪製字元，不需再逐次著色。
+
         Args:
             text: 要渲染的文字
             scale: 縮放比例
@@ -210,14 +316,23 @@ class BMFont:
         Returns:
             QPixmap
         """
-        if not text or not self.pages:
+        if not text or not self.page_images:
             return QPixmap()
 
-        # 計算文字尺寸
-        width, height = self.measure_text(text, scale)
+        color_key = color.rgba() if color is not None and color.isValid() else None
+        cache_key = (self.fnt_path, text, scale, color_key)
+        cached = RENDERED_TEXT_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # 計算文字尺寸與每個字元的位置
+        rows, starts, width = self._layout(text, scale)
+        width, height = int(width), int(self.line_height * scale)
         if width <= 0 or height <= 0:
             return QPixmap()
 
+        pages = self._glyph_atlas(color) if color_key is not None else self.pages
+
         # 建立透明背景的圖片
         result = QPixmap(width, height)
         result.fill(Qt.transparent)
@@ -225,211 +340,224 @@ class BMFont:
         painter = QPainter(result)
         painter.setRenderHint(QPainter.SmoothPixmapTransform)
 
-        # 繪製每個字元
-        x = 0
-        prev_char = None
-
-        for char in text:
-            char_info = self.get_char(char)
-            if not char_info:
-                prev_char = char
-                continue
+        glyphs = self.glyphs[rows]
+        dst_x = (starts + glyphs['xoffset'] * scale).astype(np.int64)
+        dst_y = (glyphs['yoffset'] * scale).astype(np.int64)
+        dst_w = (glyphs['width'] * scale).astype(np.int64)
+        dst_h = (glyphs['height'] * scale).astype(np.int64)
 
-            # 字距調整
-            if prev_char:
-                x += self.get_kerning(prev_char, char) * scale
-
-            # 取得頁面圖片
-            page_pixmap = self.pages.get(char_info.page)
+        for i, glyph in enumerate(glyphs.tolist()):
+            # glyph 欄位順序同 GLYPH_DTYPE
+            page_pixmap = pages.get(glyph[8])
             if page_pixmap:
-                # 來源區域
-                src_rect = QRect(
-                    char_info.x,
-                    char_info.y,
-                    char_info.width,
-                    char_info.height
-                )
-
-                # 目標區域
-                dst_x = x + char_info.xoffset * scale
-                dst_y = char_info.yoffset * scale
-                dst_rect = QRect(
-                    int(dst_x),
-                    int(dst_y),
-                    int(char_info.width * scale),
-                    int(char_info.height * scale)
+                painter.drawPixmap(
+                    QRect(int(dst_x[i]), int(dst_y[i]), int(dst_w[i]), int(dst_h[i])),
+                    page_pixmap,
+                    QRect(glyph[1], glyph[2], glyph[3], glyph[4])
                 )
 
-                # 繪製字元
-                painter.drawPixmap(dst_rect, page_pixmap, src_rect)
-
-            x += char_info.xadvance * scale
-            prev_char = char
-
         painter.end()
 
-        # 如果指定了顏色，對圖片進行著色
-        if color and color.isValid():
-            result = self._colorize_pixmap(result, color)
-
+        RENDERED_TEXT_CACHE.put(cache_key, result)
         return result
 
+    def _glyph_atlas(self, color):
+        """以指定顏色著色後的所有頁面 {page_id: QPixmap}
+
+        著色在原始頁面上進行，縮放留到繪製時，所以同一顏色的所有縮放比例共用一份。
+        """
+        key = (self.fnt_path, color.rgba())
+        atlas = GLYPH_ATLAS_CACHE.get(key)
+        if atlas is None:
+            atlas = {page_id: self._colorize_pixmap(page, color)
+                     for page_id, page in self.pages.items()}
+            GLYPH_ATLAS_CACHE.put(key, atlas, sum(map(PixmapLRU.pixmap_bytes, atlas.values())))
+        return atlas
+
     def _colorize_pixmap(self, pixmap, color):
-        """對 pixmap 進行著色，保留透明度"""
+        """對 pixmap 進行著色，保留透明度
+
+        直接以 NumPy 陣列檢視 QImage 的像素記憶體（不複製），一次向量化完成
+        """
         if pixmap.isNull():
             return pixmap
 
-        # 轉換為 QImage 以便逐像素處理
-        image = pixmap.toImage()
-        image = image.convertToFormat(QImage.Format_ARGB32)
-
-        for y in range(image.height()):
-            for x in range(image.width()):
-                pixel = image.pixelColor(x, y)
-                if pixel.alpha() > 0:
-                    # 保留原始亮度作為新顏色的強度
-                    gray = (pixel.red() + pixel.green() + pixel.blue()) // 3
-                    intensity = gray / 255.0
-
-                    new_color = QColor(
-                        int(color.red() * intensity),
-                        int(color.green() * intensity),
-                        int(color.blue() * intensity),
-                        pixel.alpha()
-                    )
-                    image.setPixelColor(x, y, new_color)
+        image = pixmap.toImage().convertToFormat(QImage.Format_ARGB32)
+        pixels = _argb32_array(image)
+
+        # 保留原始亮度作為新顏色的強度：gray = (r + g + b) // 3
+        bgr = pixels[..., :3]
+        gray = bgr.sum(axis=2, dtype=np.uint16) // 3
+        tint = np.array([color.blue(), color.green(), color.red()], dtype=np.uint16)
+        tinted = (gray[..., None] * tint // 255).astype(np.uint8)
+
+        # 完全透明的像素維持原樣，alpha 不變
+        visible = pixels[..., 3] > 0
+        bgr[visible] = tinted[visible]
 
         return QPixmap.fromImage(image)
 
 
-class FontManager:
-    """字型管理器，負責載入和管理自訂字型"""
+def _argb32_array(image):
+    """QImage (Format_ARGB32) 像素的可寫入 (height, width, 4) 檢視，通道順序為 B, G, R, A
+
+    ARGB32 以 32 位元整數儲存，小端序機器上記憶體順序即為 BGRA。
+    """
+    ptr = image.bits()
+    ptr.setsize(image.sizeInBytes())
+    rows = np.frombuffer(ptr, np.uint8).reshape(image.height(), image.bytesPerLine())
+    return rows[:, :image.width() * 4].reshape(image.height(), image.width(), 4)
+
+
+class FontManager(QObject):
+    """字型管理器，負責載入和管理自訂字型（預覽與屬性面板共用同一個實例）
+
+    字型清單來自 FontIndex，TTF 在第一次使用時才註冊，BMFont 在第一次使用時
+    才解析 .fnt 並解碼頁面圖片。排序後的字型清單與 (家族, 大小) 的 QFont 皆有快取，
+    字型增減時發出 fonts_changed。
+    """
+
+    fonts_changed = pyqtSignal()
 
     _instance = None
-    _fonts_loaded = False
-    _font_families = {}   # 字型檔名 -> 字型家族名稱 的映射 (TTF)
-    _bmfonts = {}         # 字型檔名 -> BMFont 實例 的映射
+    _bmfonts = {}         # .fnt 檔名 -> BMFont 實例（無法載入時為 None）
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
         return cls._instance
 
     def __init__(self):
-        if not FontManager._fonts_loaded:
-            self._load_fonts()
-            FontManager._fonts_loaded = True
-
-    def _load_fonts(self):
-        """載入 font 目錄中的所有字型"""
-        # 取得 font 目錄路徑
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        font_dir = os.path.join(base_dir, "font")
-
-        if not os.path.exists(font_dir):
-            print(f"Warning: Font directory not found: {font_dir}")
-            return
-
-        # 遍歷 font 目錄中的所有檔案
-        for filename in os.listdir(font_dir):
-            filepath = os.path.join(font_dir, filename)
-
-            if filename.lower().endswith(('.ttf', '.otf')):
-                # 載入 TTF/OTF 字型
-                self._load_ttf_font(filepath, filename)
-            elif filename.lower().endswith('.fnt'):
-                # 載入 BMFont 字型
-                self._load_bmfont(filepath, filename)
-
-    def _load_ttf_font(self, font_path, filename):
-        """載入 TTF/OTF 字型檔案"""
-        font_id = QFontDatabase.addApplicationFont(font_path)
-
-        if font_id == -1:
-            print(f"Warning: Failed to load font: {font_path}")
+        if self._initialized:
             return
-
-        # 取得字型家族名稱
-        families = QFontDatabase.applicationFontFamilies(font_id)
-        if families:
-            family_name = families[0]
-            # 使用不含副檔名的檔名作為 key
-            font_key = os.path.splitext(filename)[0]
-            FontManager._font_families[font_key] = family_name
-            FontManager._font_families[filename] = family_name
-
-    def _load_bmfont(self, fnt_path, filename):
-        """載入 BMFont 字型"""
+        super().__init__()
+        self._initialized = True
+        self._index = FontIndex.instance()
+        self._font_lists = {}   # 類型 (None = 全部) -> 排序後的字型名稱
+        self._qfonts = {}       # (家族, 大小) -> QFont
+        self._bmfont_waiters = {}  # 背景載入中的 .fnt 檔名 -> [(callback, receiver)]
+
+    def refresh(self):
+        """重新掃描 font 目錄，字型有增減時發出 fonts_changed"""
+        before = self._index.names()
+        self._index.scan()
+        FontManager._bmfonts.clear()
+        self.clear_render_caches()
+        if self._index.names() != before:
+            self._fonts_changed()
+
+    def add_font(self, font_path):
+        """在執行期間加入字型檔（TTF/OTF/FNT），成功時回傳字型名稱"""
+        entry = self._index.add(font_path)
+        if entry is None:
+            return None
+        self._fonts_changed()
+        return entry.name
+
+    def _fonts_changed(self):
+        self._font_lists.clear()
+        self.fonts_changed.emit()
+
+    def _font_list(self, kind=None):
+        """排序後的字型名稱（複本，可自由修改）"""
+        if kind not in self._font_lists:
+            self._font_lists[kind] = sorted(set(self._index.names(kind)))
+        return list(self._font_lists[kind])
+
+    def _load_bmfont(self, entry):
+        """載入 BMFont 字型（不建立 QPixmap，可在背景執行緒執行）"""
+        fnt_path = self._index.path(entry)
         try:
             bmfont = BMFont(fnt_path)
-            if bmfont.pages:  # 確保至少有一個頁面載入成功
-                font_key = os.path.splitext(filename)[0]
-                FontManager._bmfonts[font_key] = bmfont
-                FontManager._bmfonts[filename] = bmfont
+            if bmfont.page_images:  # 確保至少有一個頁面載入成功
+                return bmfont
         except Exception as e:
             print(f"Warning: Failed to load BMFont: {fnt_path}, {e}")
+        return None
 
     def get_font_family(self, font_name):
         """根據字型名稱取得 TTF 字型家族名稱"""
-        if font_name in FontManager._font_families:
-            return FontManager._font_families[font_name]
-
-        font_name_lower = font_name.lower()
-        for key, family in FontManager._font_families.items():
-            if key.lower() == font_name_lower:
-                return family
-
-        return None
+        return self._index.family(font_name)
 
     def get_bmfont(self, font_name):
         """根據字型名稱取得 BMFont 實例"""
-        if font_name in FontManager._bmfonts:
-            return FontManager._bmfonts[font_name]
+        entry = self._index.find(font_name, "bmfont")
+        if entry is None:
+            return None
+        if entry.filename not in FontManager._bmfonts:
+            FontManager._bmfonts[entry.filename] = self._load_bmfont(entry)
+        return FontManager._bmfonts[entry.filename]
 
-        font_name_lower = font_name.lower()
-        for key, bmfont in FontManager._bmfonts.items():
-            if key.lower() == font_name_lower:
-                return bmfont
+    def load_bmfont(self, font_name, callback, receiver=None):
+        """在背景解析 BMFont，完成後於 GUI 執行緒呼叫 callback(BMFont 或 None)
 
-        return None
+        已載入的字型會立即（同步）呼叫 callback。
+        """
+        entry = self._index.find(font_name, "bmfont")
+        if entry is None:
+            callback(None)
+            return
+        if entry.filename in FontManager._bmfonts:
+            callback(FontManager._bmfonts[entry.filename])
+            return
 
-    def is_bmfont(self, font_name):
-        """檢查字型是否為 BMFont 格式"""
-        return self.get_bmfont(font_name) is not None
+        waiters = self._bmfont_waiters.get(entry.filename)
+        if waiters is not None:
+            waiters.append((callback, receiver))
+            return
+        self._bmfont_waiters[entry.filename] = [(callback, receiver)]
 
-    def get_available_fonts(self):
-        """取得所有可用字型的列表"""
-        fonts = set()
+        def loaded(bmfont):
+            FontManager._bmfonts.setdefault(entry.filename, bmfont)
+            for waiting_callback, waiting_receiver in self._bmfont_waiters.pop(entry.filename, []):
+                if waiting_receiver is None or not sip.isdeleted(waiting_receiver):
+                    waiting_callback(FontManager._bmfonts[entry.filename])
 
-        # TTF 字型
-        for key in FontManager._font_families.keys():
-            if not key.lower().endswith(('.ttf', '.otf')):
-                fonts.add(key)
+        ImageLoader.instance().submit(lambda: self._load_bmfont(entry), loaded)
 
-        # BMFont 字型
-        for key in FontManager._bmfonts.keys():
-            if not key.lower().endswith('.fnt'):
-                fonts.add(key)
+    def is_bmfont(self, font_name):
+        """檢查字型是否為 BMFont 格式（不需載入字型）"""
+        return self._index.find(font_name, "bmfont") is not None
 
-        return sorted(list(fonts))
+    def get_available_fonts(self):
+        """取得所有可用字型的列表（TTF 與 BMFont）"""
+        return self._font_list()
 
     def get_ttf_fonts(self):
         """取得所有 TTF 字型列表"""
-        return sorted([k for k in FontManager._font_families.keys()
-                      if not k.lower().endswith(('.ttf', '.otf'))])
+        return self._font_list("ttf")
 
     def get_bitmap_fonts(self):
         """取得所有 BMFont 字型列表"""
-        return sorted([k for k in FontManager._bmfonts.keys()
-                      if not k.lower().endswith('.fnt')])
+        return self._font_list("bmfont")
 
     def get_font(self, font_name, size=12):
-        """取得 QFont 物件（僅適用於 TTF 字型）"""
-        family = self.get_font_family(font_name)
-        if family:
-            return QFont(family, size)
-        else:
-            return QFont("Arial", size)
+        """取得 QFont 物件（僅適用於 TTF 字型，找不到時使用 Arial）"""
+        key = (self.get_font_family(font_name) or "Arial", size)
+        font = self._qfonts.get(key)
+        if font is None:
+            font = self._qfonts[key] = QFont(*key)
+        # QFont 為隱式共享，複本很便宜，呼叫端修改也不影響快取
+        return QFont(font)
+
+    def get_cache_stats(self):
+        """BMFont 渲染快取的統計（命中、未命中、淘汰、記憶體用量）"""
+        return {
+            "glyph_atlases": GLYPH_ATLAS_CACHE.stats(),
+            "rendered_text": RENDERED_TEXT_CACHE.stats(),
+        }
+
+    def clear_render_caches(self, font_name=None):
+        """清除 BMFont 渲染快取；指定 font_name 時只清除該字型"""
+        if font_name is None:
+            GLYPH_ATLAS_CACHE.clear()
+            RENDERED_TEXT_CACHE.clear()
+            return
+        bmfont = self.get_bmfont(font_name)
+        if bmfont:
+            GLYPH_ATLAS_CACHE.discard_where(lambda key: key[0] == bmfont.fnt_path)
+            RENDERED_TEXT_CACHE.discard_where(lambda key: key[0] == bmfont.fnt_path)
 
 
 class Watch_Face_Text(QLabel):
@@ -466,6 +594,7 @@ class Watch_Face_Text(QLabel):
         self._text_color = QColor(255, 255, 255)
         self._is_bmfont = False
         self._bmfont = None
+        self._pending_bmfont_size = None  # BMFont 載入中時要求的大小
 
         # 設定基本樣式
         self.setAlignment(Qt.AlignCenter)
@@ -484,37 +613,57 @@ class Watch_Face_Text(QLabel):
         """
         self._font_name = font_name
 
-        # 檢查是否為 BMFont
-        bmfont = self._font_manager.get_bmfont(font_name)
-
-        if bmfont:
-            # BMFont 模式
+        # 檢查是否為 BMFont：字型在背景載入，完成前以一般文字作為佔位
+        if self._font_manager.is_bmfont(font_name):
             self._is_bmfont = True
-            self._bmfont = bmfont
-
-            if size is not None:
-                # 對於 BMFont，size 參數作為縮放因子
-                # 如果 size 較大（如 48），計算相對於原始大小的比例
-                if size > 10:
-                    self._font_scale = size / bmfont.size if bmfont.size > 0 else 1.0
-                else:
-                    self._font_scale = size
-            else:
-                self._font_scale = 1.0
-
+            self._bmfont = None
+            self._pending_bmfont_size = size
             self._update_bmfont_display()
+            self._font_manager.load_bmfont(
+                font_name,
+                lambda bmfont: self._on_bmfont_loaded(font_name, bmfont),
+                receiver=self
+            )
         else:
-            # TTF 模式
-            self._is_bmfont = False
-            self._bmfont = None
+            self._set_ttf_font(font_name, size)
 
-            if size is not None:
-                self._font_size = size
+        self.font_changed.emit(font_name)
 
-            font = self._font_manager.get_font(font_name, self._font_size)
-            super().setFont(font)
+    def _set_ttf_font(self, font_name, size):
+        """TTF 模式"""
+        self._is_bmfont = False
+        self._bmfont = None
 
-        self.font_changed.emit(font_name)
+        if size is not None:
+            self._font_size = size
+
+        font = self._font_manager.get_font(font_name, self._font_size)
+        super().setFont(font)
+
+    def _on_bmfont_loaded(self, font_name, bmfont):
+        """BMFont 載入完成（已載入的字型會在 set_font 中同步呼叫）"""
+        if font_name != self._font_name or not self._is_bmfont:
+            return  # 載入期間已改用其他字型
+        if bmfont is None:
+            # 載入失敗時改用 TTF 模式
+            self._set_ttf_font(font_name, None)
+            return
+
+        self._bmfont = bmfont
+        self._font_scale = self._bmfont_scale(bmfont, self._pending_bmfont_size)
+        self._update_bmfont_display()
+
+    @staticmethod
+    def _bmfont_scale(bmfont, size):
+        """對於 BMFont，size 參數作為縮放因子
+
+        如果 size 較大（如 48），計算相對於原始大小的比例
+        """
+        if size is None:
+            return 1.0
+        if size > 10:
+            return size / bmfont.size if bmfont.size > 0 else 1.0
+        return size
 
     def set_font_size(self, size):
         """設定字型大小
@@ -523,10 +672,10 @@ class Watch_Face_Text(QLabel):
             size: 字型大小（TTF）或縮放比例（BMFont）
         """
         if self._is_bmfont:
-            if self._bmfont and size > 10:
-                self._font_scale = size / self._bmfont.size if self._bmfont.size > 0 else 1.0
-            else:
-                self._font_scale = size
+            if self._bmfont is None:
+                self._pending_bmfont_size = size  # 字型載入完成時套用
+                return
+            self._font_scale = self._bmfont_scale(self._bmfont, size)
             self._update_bmfont_display()
         else:
             self._font_size = size
@@ -577,8 +726,9 @@ class Watch_Face_Text(QLabel):
     def _update_bmfont_display(self):
         """更新 BMFont 顯示"""
         if not self._bmfont or not self._text:
-            super().setText("")
+            # 字型尚在載入時以一般文字作為佔位
             self.setPixmap(QPixmap())
+            super().setText(self._text if not self._bmfont else "")
             return
 
         # 渲染文字
@@ -0,0 +1,634 @@
+"""WatchMaker Lua API tables
+
+Pure-data definitions of the WatchMaker Lua API, actions, easing
+functions and tags, plus the sorted keyword and tag arrays built once
+at import and the prefix trie the completion engine indexes with. Kept
+free of PyQt so the syntax checker and the command-line linter can
+import them headless.
+"""
+
+
+# WatchMaker Lua API 定義
+WATCHMAKER_API = {
+    # 核心函數
+    'wm_schedule': {
+        'signature': "wm_schedule(config)",
+        'description': "Manage animations and timed events. config is a table containing action, tween, from, to, duration, easing properties.",
+        'example': "wm_schedule { action='tween', tween='rotation', from=0, to=360, duration=1, easing='outQuad' }"
+    },
+    'wm_unschedule_all': {
+        'signature': "wm_unschedule_all()",
+        'description': "Cancel all scheduled animations or events.",
+        'example': "wm_unschedule_all()"
+    },
+    'wm_action': {
+        'signature': "wm_action(action_name)",
+        'description': "Execute various watch control actions like media playback, volume, weather update, etc.",
+        'example': "wm_action('media_play_pause')"
+    },
+    'wm_tag': {
+        'signature': "wm_tag(tag_name)",
+        'description': "Return the dynamic value of a WatchMaker tag.",
+        'example': "local hour = wm_tag('{dh}')"
+    },
+    'wm_vibrate': {
+        'signature': "wm_vibrate(duration, repeat)",
+        'description': "Trigger haptic feedback. duration in milliseconds, repeat is the repeat count.",
+        'example': "wm_vibrate(100, 2)"
+    },
+    'wm_sfx': {
+        'signature': "wm_sfx(filename)",
+        'description': "Play an MP3 file from the sfx folder.",
+        'example': "wm_sfx('click.mp3')"
+    },
+    'wm_transition': {
+        'signature': "wm_transition(effect)",
+        'description': "Execute screen transition effects.",
+        'example': "wm_transition('fade')"
+    },
+    'wm_anim_set': {
+        'signature': "wm_anim_set(layer, property, value)",
+        'description': "Configure animation properties for a layer.",
+        'example': "wm_anim_set('layer1', 'opacity', 0.5)"
+    },
+    'wm_anim_start': {
+        'signature': "wm_anim_start(layer)",
+        'description': "Start animation on the specified layer.",
+        'example': "wm_anim_start('layer1')"
+    },
+
+    # Callback Functions
+    'on_hour': {
+        'signature': "function on_hour(h)",
+        'description': "Executes every hour. h is the current hour (0-23).",
+        'example': "function on_hour(h)\n  print('Hour: ' .. h)\nend"
+    },
+    'on_minute': {
+        'signature': "function on_minute(h, m)",
+        'description': "Executes every minute. h is hour, m is minute.",
+        'example': "function on_minute(h, m)\n  print(h .. ':' .. m)\nend"
+    },
+    'on_second': {
+        'signature': "function on_second(h, m, s)",
+        'description': "Executes every second. h is hour, m is minute, s is second.",
+        'example': "function on_second(h, m, s)\n  var_s_time = h * 3600 + m * 60 + s\nend"
+    },
+    'on_millisecond': {
+        'signature': "function on_millisecond(dt)",
+        'description': "Executes every millisecond. dt is delta time in ms. Use var_ms_ prefix for variables.",
+        'example': "function on_millisecond(dt)\n  var_ms_counter = var_ms_counter + dt\nend"
+    },
+    'on_display_bright': {
+        'signature': "function on_display_bright()",
+        'description': "Executes when the watch screen turns on (becomes bright).",
+        'example': "function on_display_bright()\n  wm_anim_start('intro')\nend"
+    },
+    'on_display_not_bright': {
+        'signature': "function on_display_not_bright()",
+        'description': "Executes when the watch screen turns off (becomes dim).",
+        'example': "function on_display_not_bright()\n  wm_unschedule_all()\nend"
+    },
+
+    # Variables
+    'is_bright': {
+        'signature': "is_bright",
+        'description': "Boolean value indicating whether the screen is currently bright.",
+        'example': "if is_bright then\n  -- screen is on\nend"
+    },
+}
+
+# WatchMaker 動作列表
+WATCHMAKER_ACTIONS = [
+    'media_play_pause', 'media_next', 'media_prev', 'media_stop',
+    'sw_start_stop', 'sw_reset', 'sw_lap',
+    'vol_up', 'vol_down', 'vol_mute',
+    'm_update_weather', 'm_task:',
+    'flashlight_on', 'flashlight_off',
+    'alarm', 'timer', 'stopwatch',
+]
+
+# Easing 函數列表
+EASING_FUNCTIONS = [
+    'linear',
+    'inQuad', 'outQuad', 'inOutQuad',
+    'inCubic', 'outCubic', 'inOutCubic',
+    'inQuart', 'outQuart', 'inOutQuart',
+    'inQuint', 'outQuint', 'inOutQuint',
+    'inSine', 'outSine', 'inOutSine',
+    'inExpo', 'outExpo', 'inOutExpo',
+    'inCirc', 'outCirc', 'inOutCirc',
+    'inElastic', 'outElastic', 'inOutElastic',
+    'inBack', 'outBack', 'inOutBack',
+    'inBounce', 'outBounce', 'inOutBounce',
+]
+
+# Lua 標準關鍵字與函數
+LUA_STANDARD_NAMES = [
+    'and', 'break', 'do', 'else', 'elseif', 'end', 'false',
+    'for', 'function', 'goto', 'if', 'in', 'local', 'nil',
+    'not', 'or', 'repeat', 'return', 'then', 'true', 'until', 'while',
+    'print', 'type', 'tonumber', 'tostring', 'pairs', 'ipairs',
+    'next', 'select', 'unpack', 'pcall', 'xpcall', 'error', 'assert',
+    'string.len', 'string.sub', 'string.find', 'string.format',
+    'string.lower', 'string.upper', 'string.rep', 'string.reverse',
+    'math.abs', 'math.ceil', 'math.floor', 'math.max', 'math.min',
+    'math.random', 'math.sin', 'math.cos', 'math.tan', 'math.sqrt',
+    'table.insert', 'table.remove', 'table.sort', 'table.concat',
+]
+
+# WatchMaker 標籤系統（從 TAG_REFERENCE.md 擷取）
+# 格式: 分類 -> {"Description:{tag}": "{tag}"} (空格以底線替代)
+TAG_CATEGORIES = {
+    "Date / 日期": {
+        "Day_in_month:{dd}": "{dd}",
+        "Day_in_month_with_leading_zero:{ddz}": "{ddz}",
+        "Day_in_year:{ddy}": "{ddy}",
+        "Day_of_week_format_1:{ddw1}": "{ddw1}",
+        "Day_of_week_format_2:{ddw2}": "{ddw2}",
+        "Day_of_week:{ddw}": "{ddw}",
+        "Day_of_week_full:{ddww}": "{ddww}",
+        "Day_of_week_next_format_1:{ddw1_1}": "{ddw1_1}",
+        "Day_of_week_next_format_2:{ddw2_1}": "{ddw2_1}",
+        "Day_of_week_next:{ddw_1}": "{ddw_1}",
+        "Day_of_week_next_full:{ddww_1}": "{ddww_1}",
+        "Day_of_week_Sun=0_Sat=6:{ddw0}": "{ddw0}",
+        "Days_in_current_month:{ddim}": "{ddim}",
+        "Month_in_year:{dn}": "{dn}",
+        "Month_short:{dnn}": "{dnn}",
+        "Month_medium:{dnnn}": "{dnnn}",
+        "Month_full:{dnnnn}": "{dnnnn}",
+        "Year_2_digits:{dy}": "{dy}",
+        "Year_4_digits:{dyy}": "{dyy}",
+        "Week_in_month:{dwm}": "{dwm}",
+        "Week_in_year:{dw}": "{dw}",
+    },
+
+    "Time (12-Hour) / 時間（12小時制）": {
+        "Hour_1-12:{dh}": "{dh}",
+        "Hour_0-11:{dh11}": "{dh11}",
+        "Hour_1-12_with_leading_zero:{dhz}": "{dhz}",
+        "Hour_0-11_with_leading_zero:{dh11z}": "{dh11z}",
+        "Hour_text_1-12:{dht}": "{dht}",
+        "Hour_tens_1-12:{dhtt}": "{dhtt}",
+        "Hour_ones_1-12:{dhto}": "{dhto}",
+        "Hour_tens_0-11:{dh11tt}": "{dh11tt}",
+        "Hour_ones_0-11:{dh11to}": "{dh11to}",
+        "Hour_UTC_12hr:{dhutc12}": "{dhutc12}",
+        "Hour_UTC_12hr_with_leading_zero:{dhutc12z}": "{dhutc12z}",
+        "AM/PM:{da}": "{da}",
+    },
+
+    "Time (24-Hour) / 時間（24小時制）": {
+        "Hour_1-24:{dh24}": "{dh24}",
+        "Hour_0-23:{dh23}": "{dh23}",
+        "Hour_1-24_with_leading_zero:{dh24z}": "{dh24z}",
+        "Hour_0-23_with_leading_zero:{dh23z}": "{dh23z}",
+        "Hour_text_1-24:{dh24t}": "{dh24t}",
+        "Hour_tens_1-24:{dh24tt}": "{dh24tt}",
+        "Hour_ones_1-24:{dh24to}": "{dh24to}",
+        "Hour_tens_0-23:{dh23tt}": "{dh23tt}",
+        "Hour_ones_0-23:{dh23to}": "{dh23to}",
+        "Hour_UTC_24hr:{dhutc24}": "{dhutc24}",
+        "Hour_UTC_24hr_with_leading_zero:{dhutc24z}": "{dhutc24z}",
+        "UTC_Offset:{dutcoff}": "{dutcoff}",
+    },
+
+    "Minutes / 分鐘": {
+        "Minute_in_hour:{dm}": "{dm}",
+        "Minute_with_leading_zero:{dmz}": "{dmz}",
+        "Minute_tens:{dmt}": "{dmt}",
+        "Minute_ones:{dmo}": "{dmo}",
+        "Minute_text_all:{dmat}": "{dmat}",
+        "Minute_text_tens:{dmtt}": "{dmtt}",
+        "Minute_text_ones:{dmot}": "{dmot}",
+    },
+
+    "Seconds & Milliseconds / 秒與毫秒": {
+        "Second_in_minute:{ds}": "{ds}",
+        "Second_with_leading_zero:{dsz}": "{dsz}",
+        "Second_tens:{dst}": "{dst}",
+        "Second_ones:{dso}": "{dso}",
+        "Second_text_all:{dsat}": "{dsat}",
+        "Second_text_tens:{dstt}": "{dstt}",
+        "Second_text_ones:{dsot}": "{dsot}",
+        "Milliseconds:{dss}": "{dss}",
+        "Milliseconds_with_leading_zeros:{dssz}": "{dssz}",
+        "Seconds_*_1000_+_milliseconds:{dsps}": "{dsps}",
+        "Seconds_since_epoch:{depoch}": "{depoch}",
+        "Time_percent_24_hours:{dtp}": "{dtp}",
+        "Timezone:{dz}": "{dz}",
+    },
+
+    "Rotation Values / 旋轉值": {
+        "Hour_hand_rotation_12h:{drh}": "{drh}",
+        "Hour_hand_rotation_24h:{drh24}": "{drh24}",
+        "Hour_hand_rotation_12h_no_adjust:{drh0}": "{drh0}",
+        "Minute_hand_rotation:{drm}": "{drm}",
+        "Second_hand_rotation:{drs}": "{drs}",
+        "Second_hand_smooth_rotation:{drss}": "{drss}",
+        "Milliseconds_rotation:{drms}": "{drms}",
+    },
+
+    "Time Zone 1 / 時區1": {
+        "Time_Zone_1_Location:{tz1l}": "{tz1l}",
+        "Time_Zone_1_Location_Long:{tz1ll}": "{tz1ll}",
+        "Time_Zone_1_UTC_Offset:{tz1o}": "{tz1o}",
+        "Time_Zone_1_UTC_Offset_Mins:{tz1om}": "{tz1om}",
+        "Time_Zone_1_Daylight_Savings:{tz1dst}": "{tz1dst}",
+        "Time_Zone_1_Time:{tz1t}": "{tz1t}",
+        "Time_Zone_1_Rotation_hour:{tz1rh}": "{tz1rh}",
+        "Time_Zone_1_Rotation_hour_24h:{tz1rh24}": "{tz1rh24}",
+        "Time_Zone_1_Rotation_minute:{tz1rm}": "{tz1rm}",
+    },
+
+    "Time Zone 2 / 時區2": {
+        "Time_Zone_2_Location:{tz2l}": "{tz2l}",
+        "Time_Zone_2_Location_Long:{tz2ll}": "{tz2ll}",
+        "Time_Zone_2_UTC_Offset:{tz2o}": "{tz2o}",
+        "Time_Zone_2_UTC_Offset_Mins:{tz2om}": "{tz2om}",
+        "Time_Zone_2_Daylight_Savings:{tz2dst}": "{tz2dst}",
+        "Time_Zone_2_Time:{tz2t}": "{tz2t}",
+        "Time_Zone_2_Rotation_hour:{tz2rh}": "{tz2rh}",
+        "Time_Zone_2_Rotation_hour_24h:{tz2rh24}": "{tz2rh24}",
+        "Time_Zone_2_Rotation_minute:{tz2rm}": "{tz2rm}",
+    },
+
+    "Time Zone 3 / 時區3": {
+        "Time_Zone_3_Location:{tz3l}": "{tz3l}",
+        "Time_Zone_3_Location_Long:{tz3ll}": "{tz3ll}",
+        "Time_Zone_3_UTC_Offset:{tz3o}": "{tz3o}",
+        "Time_Zone_3_UTC_Offset_Mins:{tz3om}": "{tz3om}",
+        "Time_Zone_3_Daylight_Savings:{tz3dst}": "{tz3dst}",
+        "Time_Zone_3_Time:{tz3t}": "{tz3t}",
+        "Time_Zone_3_Rotation_hour:{tz3rh}": "{tz3rh}",
+        "Time_Zone_3_Rotation_hour_24h:{tz3rh24}": "{tz3rh24}",
+        "Time_Zone_3_Rotation_minute:{tz3rm}": "{tz3rm}",
+    },
+
+    "Color Switcher / 顏色切換器": {
+        "Current_Color:{ucolor}": "{ucolor}",
+        "Current_Color_Brighter:{ucolor_b}": "{ucolor_b}",
+    },
+
+    "Counter / 計數器": {
+        "Seconds_elapsed_since_loaded:{c_elapsed}": "{c_elapsed}",
+        "0_to_100_in_2s_stop:{c_0_100_2_st}": "{c_0_100_2_st}",
+        "0_to_100_in_2s_repeat:{c_0_100_2_rp}": "{c_0_100_2_rp}",
+        "0_to_100_in_2s_reverse:{c_0_100_2_rv}": "{c_0_100_2_rv}",
+        "0_to_100_in_2s_reverse_delay:{c_0_100_2_rv_2}": "{c_0_100_2_rv_2}",
+    },
+
+    "Watch Battery / 手錶電池": {
+        "Battery_level:{bl}": "{bl}",
+        "Battery_level_percent:{blp}": "{blp}",
+        "Battery_rotation:{br}": "{br}",
+        "Battery_temperature_C:{btc}": "{btc}",
+        "Battery_temperature_F:{btf}": "{btf}",
+        "Battery_temperature_C_percent:{btcd}": "{btcd}",
+        "Battery_temperature_F_percent:{btfd}": "{btfd}",
+        "Battery_charging:{bc}": "{bc}",
+    },
+
+    "Phone Battery / 手機電池": {
+        "Phone_Battery_level:{pbl}": "{pbl}",
+        "Phone_Battery_level_percent:{pblp}": "{pblp}",
+        "Phone_Battery_rotation:{pbr}": "{pbr}",
+        "Phone_Battery_temperature_C:{pbtc}": "{pbtc}",
+        "Phone_Battery_temperature_F:{pbtf}": "{pbtf}",
+        "Phone_Battery_temperature_C_percent:{pbtcd}": "{pbtcd}",
+        "Phone_Battery_temperature_F_percent:{pbtfd}": "{pbtfd}",
+        "Phone_Battery_charging:{pbc}": "{pbc}",
+    },
+
+    "System / 系統": {
+        "Operating_System:{aos}": "{aos}",
+        "OS_Version:{aosv}": "{aosv}",
+        "Language_Code:{alangcode}": "{alangcode}",
+        "Language_Region:{alangreg}": "{alangreg}",
+        "Language_Full:{alangfull}": "{alangfull}",
+        "Device_name:{aname}": "{aname}",
+        "Device_model:{amodel}": "{amodel}",
+        "Device_manufacturer:{aman}": "{aman}",
+        "System_Volume:{avol}": "{avol}",
+        "Screen_Brightness:{abrt}": "{abrt}",
+        "Low_Power_Mode:{alowpw}": "{alowpw}",
+        "Bluetooth_Enabled:{abtc}": "{abtc}",
+        "Watch_name:{awname}": "{awname}",
+        "Is_round:{around}": "{around}",
+        "Has_flat_tyre:{atyre}": "{atyre}",
+        "Is_bright:{abright}": "{abright}",
+        "Dim_mode_lo-bit_only:{adimlo}": "{adimlo}",
+        "Milliseconds_since_bright:{abss}": "{abss}",
+        "Seconds_since_bright_capped_30:{abssl}": "{abssl}",
+        "Is_dark_mode:{adark}": "{adark}",
+        "Last_Reboot_Time:{areboot}": "{areboot}",
+    },
+
+    "Memory / 記憶體": {
+        "Used_Memory:{amu}": "{amu}",
+        "Used_Memory_Formatted:{amuf}": "{amuf}",
+        "Used_Memory_Percentage:{amup}": "{amup}",
+        "Free_Memory:{amf}": "{amf}",
+        "Free_Memory_Formatted:{amff}": "{amff}",
+        "Free_Memory_Percentage:{amfp}": "{amfp}",
+        "Total_Memory:{amt}": "{amt}",
+        "Total_Memory_Formatted:{amtf}": "{amtf}",
+    },
+
+    "Disk Space / 磁碟空間": {
+        "Used_Disk_Space:{adsu}": "{adsu}",
+        "Used_Disk_Space_Formatted:{adsuf}": "{adsuf}",
+        "Used_Disk_Space_Percentage:{adsup}": "{adsup}",
+        "Free_Disk_Space:{adsf}": "{adsf}",
+        "Free_Disk_Space_Formatted:{adsff}": "{adsff}",
+        "Free_Disk_Space_Percentage:{adsfp}": "{adsfp}",
+        "Total_Disk_Space:{adst}": "{adst}",
+        "Total_Disk_Space_Formatted:{adstf}": "{adstf}",
+    },
+
+    "Location / 位置": {
+        "Current_latitude:{alat}": "{alat}",
+        "Current_longitude:{alon}": "{alon}",
+        "Current_latitude_degrees:{alatd}": "{alatd}",
+        "Current_longitude_degrees:{alond}": "{alond}",
+        "Current_latitude_degrees_direction:{alatdd}": "{alatdd}",
+        "Current_longitude_degrees_direction:{alondd}": "{alondd}",
+        "Current_altitude:{aalt}": "{aalt}",
+        "what3words_address:{aw3w}": "{aw3w}",
+        "what3words_Word_1:{aw3w1}": "{aw3w1}",
+        "what3words_Word_2:{aw3w2}": "{aw3w2}",
+        "what3words_Word_3:{aw3w3}": "{aw3w3}",
+    },
+
+    "Network / 網路": {
+        "Device_Online:{nc}": "{nc}",
+        "Cellular_Connected:{ncc}": "{ncc}",
+        "WiFi_Strength_percent:{pws}": "{pws}",
+        "WiFi_Connected:{pwc}": "{pwc}",
+        "WiFi_IP_Address:{nwip}": "{nwip}",
+    },
+
+    "Stopwatch / 碼錶": {
+        "Stopwatch_hours:{swh}": "{swh}",
+        "Stopwatch_minutes:{swm}": "{swm}",
+        "Stopwatch_seconds:{sws}": "{sws}",
+        "Stopwatch_milliseconds_2_digits:{swss}": "{swss}",
+        "Stopwatch_milliseconds_3_digits:{swsss}": "{swsss}",
+        "Stopwatch_milliseconds_total:{swsst}": "{swsst}",
+        "Stopwatch_is_running:{swr}": "{swr}",
+        "Stopwatch_minute_rotation:{swrm}": "{swrm}",
+        "Stopwatch_second_rotation:{swrs}": "{swrs}",
+        "Stopwatch_millisecond_rotation:{swrss}": "{swrss}",
+    },
+
+    "Weather - Current / 天氣 - 當前": {
+        "Weather_Location:{wl}": "{wl}",
+        "Current_Temperature:{wt}": "{wt}",
+        "Today_High:{wth}": "{wth}",
+        "Today_Low:{wtl}": "{wtl}",
+        "Current_Temperature_degrees:{wtd}": "{wtd}",
+        "Today_High_degrees:{wthd}": "{wthd}",
+        "Today_Low_degrees:{wtld}": "{wtld}",
+        "Weather_Units:{wm}": "{wm}",
+        "Current_Condition_Text:{wct}": "{wct}",
+        "Current_Condition_Icon:{wci}": "{wci}",
+        "Current_Humidity_Number:{wh}": "{wh}",
+        "Current_Humidity_Percentage:{whp}": "{whp}",
+        "Atmospheric_Pressure:{wp}": "{wp}",
+        "Wind_Speed_mph:{wws}": "{wws}",
+        "Wind_Direction_degrees:{wwd}": "{wwd}",
+        "Wind_Direction_NE:{wwdb}": "{wwdb}",
+        "Wind_Direction_NNE:{wwdbb}": "{wwdbb}",
+        "Cloudiness_percent:{wcl}": "{wcl}",
+        "Rain_volume_3hrs_mm:{wr}": "{wr}",
+        "Is_daytime:{wisday}": "{wisday}",
+        "Sunrise_time:{wsr}": "{wsr}",
+        "Sunset_time:{wss}": "{wss}",
+        "Sunrise_percent_24hrs:{wsrp}": "{wsrp}",
+        "Sunset_percent_24hrs:{wssp}": "{wssp}",
+        "Moon_Phase:{wmp}": "{wmp}",
+        "Weather_manual_location:{wml}": "{wml}",
+        "Weather_last_update:{wlu}": "{wlu}",
+    },
+
+    "Weather - Hourly Forecast / 天氣 - 每小時預報": {
+        "Forecast_Hour_1_Temp:{wf1ht}": "{wf1ht}",
+        "Forecast_Hour_1_Hour:{wf1hh}": "{wf1hh}",
+        "Forecast_Hour_1_Condition_Text:{wf1hct}": "{wf1hct}",
+        "Forecast_Hour_1_Condition_Icon:{wf1hci}": "{wf1hci}",
+        "Forecast_Hour_2_Temp:{wf2ht}": "{wf2ht}",
+        "Forecast_Hour_2_Hour:{wf2hh}": "{wf2hh}",
+        "Forecast_Hour_2_Condition_Text:{wf2hct}": "{wf2hct}",
+        "Forecast_Hour_2_Condition_Icon:{wf2hci}": "{wf2hci}",
+    },
+
+    "Weather - Daily Forecast / 天氣 - 每日預報": {
+        "Forecast_Day_0_Temp:{wf0dt}": "{wf0dt}",
+        "Forecast_Day_0_High:{wf0dth}": "{wf0dth}",
+        "Forecast_Day_0_Low:{wf0dtl}": "{wf0dtl}",
+        "Forecast_Day_0_Condition_Text:{wf0dct}": "{wf0dct}",
+        "Forecast_Day_0_Condition_Icon:{wf0dci}": "{wf0dci}",
+        "Forecast_Day_1_Temp:{wf1dt}": "{wf1dt}",
+        "Forecast_Day_1_High:{wf1dth}": "{wf1dth}",
+        "Forecast_Day_1_Low:{wf1dtl}": "{wf1dtl}",
+        "Forecast_Day_1_Condition_Text:{wf1dct}": "{wf1dct}",
+        "Forecast_Day_1_Condition_Icon:{wf1dci}": "{wf1dci}",
+    },
+
+    "Calendar / 日曆": {
+        "Events_Exist:{cex}": "{cex}",
+        "Event_1_Exists:{c1ex}": "{c1ex}",
+        "Event_1_Text:{c1t}": "{c1t}",
+        "Event_1_Begin_Date:{c1bd}": "{c1bd}",
+        "Event_1_Begin_Time:{c1b}": "{c1b}",
+        "Event_1_Begin_Rotation:{c1br}": "{c1br}",
+        "Event_1_Begin_percent_24hrs:{c1bp}": "{c1bp}",
+        "Event_1_End_Date:{c1ed}": "{c1ed}",
+        "Event_1_End_Time:{c1e}": "{c1e}",
+        "Event_1_End_Rotation:{c1er}": "{c1er}",
+        "Event_1_End_percent_24hrs:{c1ep}": "{c1ep}",
+        "Event_1_Location:{c1l}": "{c1l}",
+        "Event_1_Color:{c1c}": "{c1c}",
+        "Event_1_is_All_Day:{c1ad}": "{c1ad}",
+        "Event_1_Calendar:{c1cal}": "{c1cal}",
+        "Event_1_ID:{c1i}": "{c1i}",
+    },
+
+    "Health & Fitness - Steps / 健康與健身 - 步數": {
+        "Steps:{ssc}": "{ssc}",
+        "Steps_Goal:{stsc}": "{stsc}",
+        "Steps_percent_of_Goal:{sscp}": "{sscp}",
+        "Distance_Units:{sdstu}": "{sdstu}",
+        "Distance:{sdst}": "{sdst}",
+        "Distance_Goal:{stdst}": "{stdst}",
+        "Distance_percent_of_Goal:{sdstp}": "{sdstp}",
+        "Calories_kCal:{scal}": "{scal}",
+        "Calories_Goal_kCal:{stcal}": "{stcal}",
+        "Calories_percent_of_Goal:{scalp}": "{scalp}",
+    },
+
+    "Health & Fitness - Activity Rings / 健康與健身 - 活動圓環": {
+        "Move_kCal:{ham}": "{ham}",
+        "Move_Goal_kCal:{htam}": "{htam}",
+        "Exercise_mins:{hae}": "{hae}",
+        "Exercise_Goal_mins:{htae}": "{htae}",
+        "Stand_hrs:{has}": "{has}",
+        "Stand_Goal_hrs:{htas}": "{htas}",
+        "Flights_Climbed:{hfc}": "{hfc}",
+    },
+
+    "Health & Fitness - Heart Rate / 健康與健身 - 心率": {
+        "Heart_Rate:{shr}": "{shr}",
+        "Heart_Rate_Maximum:{sthr}": "{sthr}",
+        "Heart_Rate_percent_of_Maximum:{shrp}": "{shrp}",
+        "Heart_Rate_Previous:{shr_1}": "{shr_1}",
+        "Heart_Rate_Previous_2:{shr_2}": "{shr_2}",
+    },
+
+    "Sensors - Accelerometer / 感測器 - 加速度計": {
+        "Accelerometer_X:{sax}": "{sax}",
+        "Accelerometer_Y:{say}": "{say}",
+        "Accelerometer_Z:{saz}": "{saz}",
+    },
+
+    "Sensors - Gyroscope / 感測器 - 陀螺儀": {
+        "Gyroscope_X:{sgx}": "{sgx}",
+        "Gyroscope_Y:{sgy}": "{sgy}",
+        "Gyroscope_Z:{sgz}": "{sgz}",
+    },
+
+    "Sensors - Compass / 感測器 - 指南針": {
+        "Compass_for_Rotation:{scr}": "{scr}",
+        "Compass_Display:{sct}": "{sct}",
+        "Compass_Display_degrees:{sctd}": "{sctd}",
+        "Compass_Bearing_NE:{scb}": "{scb}",
+        "Compass_Bearing_NNE:{scbb}": "{scbb}",
+        "Compass_Display_degrees_NE:{sctdb}": "{sctdb}",
+        "Compass_Display_degrees_NNE:{sctdbb}": "{sctdbb}",
+    },
+
+    "Sensors - Other / 感測器 - 其他": {
+        "Barometric_Pressure:{sprs}": "{sprs}",
+    },
+
+    "Complications / 複雜功能": {
+        "Complication_1_Text:{m1text}": "{m1text}",
+        "Complication_1_Title:{m1title}": "{m1title}",
+        "Complication_1_Value:{m1value}": "{m1value}",
+        "Complication_1_Min:{m1min}": "{m1min}",
+        "Complication_1_Max:{m1max}": "{m1max}",
+        "Complication_2_Text:{m2text}": "{m2text}",
+        "Complication_2_Title:{m2title}": "{m2title}",
+        "Complication_2_Value:{m2value}": "{m2value}",
+        "Complication_2_Min:{m2min}": "{m2min}",
+        "Complication_2_Max:{m2max}": "{m2max}",
+        "Complication_3_Text:{m3text}": "{m3text}",
+        "Complication_3_Title:{m3title}": "{m3title}",
+        "Complication_3_Value:{m3value}": "{m3value}",
+        "Complication_3_Min:{m3min}": "{m3min}",
+        "Complication_3_Max:{m3max}": "{m3max}",
+        "Complication_4_Text:{m4text}": "{m4text}",
+        "Complication_4_Title:{m4title}": "{m4title}",
+        "Complication_4_Value:{m4value}": "{m4value}",
+        "Complication_4_Min:{m4min}": "{m4min}",
+        "Complication_4_Max:{m4max}": "{m4max}",
+    },
+}
+
+# 扁平標籤表: "Description:{tag}" -> "{tag}"
+WATCHMAKER_TAGS = {
+    display: tag
+    for category_tags in TAG_CATEGORIES.values()
+    for display, tag in category_tags.items()
+}
+
+
+class PrefixTrie:
+    """Case-insensitive prefix tree mapping words to values
+
+    Completions come back in case-folded alphabetical order.
+    """
+
+    _VALUE = ''  # node key holding the entries that end at this node
+
+    def __init__(self, items=()):
+        self._root = {}
+        self._size = 0
+        for word, value in items:
+            self.insert(word, value)
+
+    def insert(self, word: str, value=None):
+        node = self._root
+        for char in word.casefold():
+            node = node.setdefault(char, {})
+        entries = node.setdefault(self._VALUE, [])
+        entries.append((word, word if value is None else value))
+        self._size += 1
+
+    def remove(self, word: str, value=None) -> bool:
+        """Remove one (word, value) entry, pruning nodes left empty"""
+        entry = (word, word if value is None else value)
+        path = [self._root]
+        for char in word.casefold():
+            node = path[-1].get(char)
+            if node is None:
+                return False
+            path.append(node)
+
+        entries = path[-1].get(self._VALUE)
+        if not entries or entry not in entries:
+            return False
+        entries.remove(entry)
+        if not entries:
+            del path[-1][self._VALUE]
+        self._size -= 1
+
+        folded = word.casefold()
+        for depth in range(len(folded), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][folded[depth - 1]]
+        return True
+
+    def complete(self, prefix: str, limit: int = None) -> list:
+        """(word, value) pairs whose word starts with prefix"""
+        node = self._root
+        for char in prefix.casefold():
+            node = node.get(char)
+            if node is None:
+                return []
+
+        results = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            results.extend(node.get(self._VALUE, ()))
+            if limit is not None and len(results) >= limit:
+                return results[:limit]
+            # Push in reverse so the smallest child is visited first
+            stack.extend(node[char] for char in sorted(node, reverse=True) if char)
+        return results
+
+    def __contains__(self, word: str) -> bool:
+        node = self._root
+        for char in word.casefold():
+            node = node.get(char)
+            if node is None:
+                return False
+        return any(entry[0] == word for entry in node.get(self._VALUE, ()))
+
+    def __len__(self) -> int:
+        return self._size
+
+
+# ---------------------------------------------------------------------------
+# Precomputed indexes (built once at import)
+# ---------------------------------------------------------------------------
+
+# 自動完成關鍵字: Lua 標準名稱 + API 函數 + easing + 動作，排序後的不可變序列
+API_KEYWORDS = tuple(sorted(
+    set(LUA_STANDARD_NAMES) | set(WATCHMAKER_API) | set(EASING_FUNCTIONS) | set(WATCHMAKER_ACTIONS)
+))
+
+# 標籤顯示文字，排序後供標籤自動完成清單使用
+SORTED_TAG_DISPLAYS = tuple(sorted(WATCHMAKER_TAGS))
@@ -0,0 +1,99 @@
+"""Lua Check Service
+
+Runs LuaSyntaxChecker on a background worker thread so that parsing
+never blocks the editor. Requests are versioned per owner; only the
+newest pending request of each owner is kept, stale ones are dropped
+before they reach the parser.
+"""
+
+import os
+import threading
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from lua_syntax_checker import LuaSyntaxChecker
+
+logger = logging.getLogger(__name__)
+
+# On-disk store of check results, so reopened scripts get markers instantly
+RESULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "cache", "lua_check_results.json"
+)
+
+
+class LuaCheckService(QObject):
+    """Background syntax checking service shared by all script editors"""
+
+    # (owner, version, errors) - delivered queued to the GUI thread
+    check_finished = pyqtSignal(object, int, object)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls, watchmaker_api: Dict[str, Any] = None,
+                 watchmaker_actions: List[str] = None,
+                 easing_functions: List[str] = None) -> "LuaCheckService":
+        """Return the process-wide service, creating it on first use"""
+        if cls._instance is None:
+            LuaSyntaxChecker.result_cache.persist_to(RESULT_CACHE_PATH)
+            cls._instance = cls(LuaSyntaxChecker(
+                watchmaker_api=watchmaker_api,
+                watchmaker_actions=watchmaker_actions,
+                easing_functions=easing_functions
+            ))
+        return cls._instance
+
+    def __init__(self, checker: LuaSyntaxChecker, parent=None):
+        super().__init__(parent)
+        self._checker = checker
+        self._condition = threading.Condition()
+        self._pending: Dict[Any, Tuple[int, str]] = {}  # owner -> (version, code)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def checker(self) -> LuaSyntaxChecker:
+        """The checker owned by the worker thread"""
+        return self._checker
+
+    def request_check(self, owner, version: int, code: str):
+        """Queue a check; replaces any older pending request of the same owner"""
+        with self._condition:
+            self._pending[owner] = (version, code)
+            self._ensure_worker()
+            self._condition.notify()
+
+    def cancel(self, owner):
+        """Drop the pending request of an owner (e.g. when its editor closes)"""
+        with self._condition:
+            self._pending.pop(owner, None)
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="LuaCheckService", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        """Worker loop: always checks the oldest owner's newest version"""
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                owner = next(iter(self._pending))
+                version, code = self._pending.pop(owner)
+
+            try:
+                errors = self._checker.check(code)
+            except Exception:
+                logger.exception("Lua check failed")
+                continue
+
+            with self._condition:
+                # A newer edit arrived while parsing: its result supersedes ours
+                if owner in self._pending:
+                    continue
+
+            self.check_finished.emit(owner, version, errors)
@@ -0,0 +1,153 @@
+"""Lua Completion Engine
+
+Ranks completion candidates for the script editor. Lookups go through a
+case-folded prefix trie that also indexes every word segment (after `_`
+or `.`), so "sched" finds "wm_schedule" without scanning the catalogue.
+Subsequence ("fuzzy") matches are only tried among at most
+FUZZY_CANDIDATES words with a segment starting like the query: first
+those sharing its first two letters, then its first letter. A lookup
+therefore costs the prefix matches plus a bounded number of subsequence
+tests, whatever the catalogue size; in very large catalogues some weaker
+fuzzy matches are left out.
+
+Ranking, best first:
+  0  prefix match with the same case
+  1  case-insensitive prefix match
+  2  prefix match of a later segment ("sched" -> wm_schedule)
+  3  subsequence match ("wsch" -> wm_schedule), fewer gaps first
+Ties are broken by length, then alphabetically.
+"""
+
+import re
+from collections import defaultdict
+from itertools import chain, islice
+from typing import Dict, Iterable, List, Optional, Set
+
+from lua_api import API_KEYWORDS, PrefixTrie
+
+# Word segments start at the beginning and after '_' or '.'
+_SEGMENT_PATTERN = re.compile(r'(?:^|(?<=[_.]))[^_.]')
+
+
+def segment_starts(word: str) -> List[int]:
+    """Offsets where the segments of a word start"""
+    return [match.start() for match in _SEGMENT_PATTERN.finditer(word)]
+
+
+def subsequence_gaps(query: str, word: str) -> Optional[int]:
+    """Number of skipped runs when query is a subsequence of word, else None"""
+    gaps = 0
+    position = 0
+    for char in query:
+        found = word.find(char, position)
+        if found < 0:
+            return None
+        if found != position:
+            gaps += 1
+        position = found + 1
+    return gaps
+
+
+class CompletionEngine:
+    """Ranked completion over a mutable word catalogue"""
+
+    # Subsequence matching needs a little context to be meaningful
+    FUZZY_MIN_LENGTH = 2
+    # Upper bound on the words tested for a subsequence match per lookup
+    FUZZY_CANDIDATES = 512
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._trie = PrefixTrie()
+        self._words: Set[str] = set()
+        # case-folded first one and two letters of a segment -> words having it
+        self._by_start: Dict[str, Set[str]] = defaultdict(set)
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str):
+        if not word or word in self._words:
+            return
+        self._words.add(word)
+        for offset in segment_starts(word):
+            self._trie.insert(word[offset:], word)
+            for start in self._segment_keys(word, offset):
+                self._by_start[start].add(word)
+
+    def discard(self, word: str):
+        if word not in self._words:
+            return
+        self._words.discard(word)
+        for offset in segment_starts(word):
+            self._trie.remove(word[offset:], word)
+            for start in self._segment_keys(word, offset):
+                bucket = self._by_start[start]
+                bucket.discard(word)
+                if not bucket:
+                    del self._by_start[start]
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def complete(self, prefix: str, limit: int = 100) -> List[str]:
+        """Candidates for prefix, best first"""
+        if not prefix:
+            return sorted(self._words, key=str.casefold)[:limit]
+        scores = self.scores(prefix)
+        return sorted(scores, key=scores.__getitem__)[:limit]
+
+    def scores(self, prefix: str) -> Dict[str, tuple]:
+        """Matching words mapped to their sort keys (lower is better)"""
+        best: Dict[str, tuple] = {}
+        for key, word in self._trie.complete(prefix):
+            if len(key) == len(word):
+                rank = 0 if word.startswith(prefix) else 1
+            else:
+                rank = 2
+            score = (rank, 0, len(word), word.casefold())
+            if word not in best or score < best[word]:
+                best[word] = score
+
+        if len(prefix) >= self.FUZZY_MIN_LENGTH:
+            folded = prefix.casefold()
+            for word in self._fuzzy_candidates(folded):
+                if word in best:
+                    continue
+                gaps = subsequence_gaps(folded, word.casefold())
+                if gaps is not None:
+                    best[word] = (3, gaps, len(word), word.casefold())
+
+        return best
+
+    def _fuzzy_candidates(self, folded: str) -> Iterable[str]:
+        """At most FUZZY_CANDIDATES words with a segment starting like folded,
+        those sharing two letters first"""
+        limit = self.FUZZY_CANDIDATES
+        close = self._by_start.get(folded[:2], ())
+        if len(close) >= limit:
+            return islice(close, limit)
+        rest = (word for word in self._by_start.get(folded[0], ()) if word not in close)
+        return chain(close, islice(rest, limit - len(close)))
+
+    @staticmethod
+    def _segment_keys(word: str, offset: int) -> tuple:
+        """Bucket keys of the segment starting at offset"""
+        initial = word[offset].casefold()
+        pair = word[offset:offset + 2].casefold()
+        return (initial, pair) if len(pair) == 2 else (initial,)
+
+
+def complete_from(engines: Iterable[CompletionEngine], prefix: str, limit: int = 100) -> List[str]:
+    """Merge the ranked candidates of several engines"""
+    best: Dict[str, tuple] = {}
+    for engine in engines:
+        for word, score in engine.scores(prefix).items():
+            if word not in best or score < best[word]:
+                best[word] = score
+    return sorted(best, key=best.__getitem__)[:limit]
+
+
+# Shared engine for the static WatchMaker/Lua catalogue
+API_COMPLETION = CompletionEngine(API_KEYWORDS)
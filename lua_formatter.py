@@ -0,0 +1,128 @@
+"""Lua Formatter
+
+Re-indents Lua code from the block structure reported by
+lua_lexer.tokenize_structure(), so keywords inside strings or comments
+and one-liners such as `if x then y end` are handled correctly.
+
+Only leading indentation and trailing blanks change; the number of lines
+never does, which lets the editor apply the result line by line. Lines
+inside multi-line long strings and comments are kept verbatim.
+"""
+
+from typing import List
+
+from lua_lexer import TokenType, tokenize_structure
+
+INDENT = "  "  # Two spaces
+
+# Tokens that open an indentation level
+_OPENERS = frozenset({'function', 'do', 'then', 'repeat', '(', '{', '['})
+
+# Tokens that close one opener; else/elseif close the branch and reopen it
+_CLOSERS = frozenset({'end', 'until', ')', '}', ']', 'else', 'elseif'})
+_REOPEN = frozenset({'else'})   # elseif reopens through its own 'then'
+
+
+def format_lines(code: str, indent: str = INDENT) -> List[str]:
+    """Formatted lines of code, one for every line of code.split('\\n')
+
+    Openers left unclosed on one line add a single level together, so
+    `foo(function()` indents its body once and the matching `end)` closes
+    that level once. `levels` keeps the number of open tokens per level.
+    """
+    lines = code.split('\n')
+    count = len(lines)
+    depth = [0] * count              # indentation of each line
+    verbatim = bytearray(count)      # 1: keep as is, 2: keep trailing blanks
+    line_end = [0] * count           # end offset of the last leading token per line
+
+    offset = 0
+    for number, line in enumerate(lines):
+        line_end[number] = offset
+        offset += len(line) + 1
+
+    string_type = TokenType.STRING
+    comment_type = TokenType.COMMENT
+
+    levels: List[int] = []           # open tokens per indentation level
+    current = -1                     # line being read
+    own_level = False                # the top level was opened on the current line
+    leading = False                  # still reading the leading closers of the line
+    lowest = 0                       # lowest level reached by the leading closers
+
+    for token in tokenize_structure(code):
+        line = token.line
+        if line != current:
+            if current >= 0:
+                depth[current] = lowest
+            for skipped in range(current + 1, line):
+                depth[skipped] = len(levels)
+            current = line
+            lowest = len(levels)
+            own_level = False
+            leading = True
+
+        value = token.value
+        token_type = token.type
+        if token_type is string_type or token_type is comment_type:
+            leading = False
+            newlines = value.count('\n')
+            if newlines:
+                verbatim[line] = verbatim[line] or 2
+                for inner in range(line + 1, line + newlines + 1):
+                    verbatim[inner] = 1
+            elif not token.closed:
+                verbatim[line] = verbatim[line] or 2
+            continue
+
+        if leading:
+            # Only blanks may separate the leading closers (e.g. "end)")
+            if value in _CLOSERS and not code[line_end[line]:token.pos].strip():
+                line_end[line] = token.pos + len(value)
+                # The line starts at the level the closer reaches
+                lowest = min(lowest, max(0, len(levels) - 1))
+            else:
+                leading = False
+
+        if value in _CLOSERS:
+            if levels:
+                levels[-1] -= 1
+                if levels[-1] == 0:
+                    levels.pop()
+                    own_level = False
+            if value in _REOPEN:
+                levels.append(1)
+                own_level = True
+        elif value in _OPENERS:
+            if own_level:
+                levels[-1] += 1
+            else:
+                levels.append(1)
+                own_level = True
+
+    if current >= 0:
+        depth[current] = lowest
+    for skipped in range(current + 1, count):
+        depth[skipped] = len(levels)
+
+    formatted = []
+    append = formatted.append
+    for number, line in enumerate(lines):
+        keep = verbatim[number]
+        if keep == 1:
+            append(line)
+        else:
+            cr = '\r' if line.endswith('\r') else ''
+            body = line[:-1] if cr else line
+            body = body.lstrip(' \t') if keep else body.strip(' \t')
+            if body:
+                append(indent * depth[number] + body + cr)
+            else:
+                append(cr)
+
+    return formatted
+
+
+def format_code(code: str, indent: str = INDENT) -> str:
+    """Formatted copy of code"""
+    return '\n'.join(format_lines(code, indent))
@@ -0,0 +1,211 @@
+"""Lua Lint - headless batch checker for watch-face scripts
+
+Runs LuaSyntaxChecker over many scripts in a process pool, without
+PyQt. Accepted inputs:
+  - *.lua files, checked as whole scripts
+  - *.json project files: a list of layers (or {"layers": [...]}), each
+    layer being the attribute list produced by AttributePanel.pack().
+    The watchSetting "Script" is checked as a script, every numeric
+    attribute holding a `_<` expression is checked as an expression.
+  - directories, searched recursively for the above
+
+Every problem is printed as one JSON object per line. Exit status is 0
+when clean, 1 when errors were found (warnings too with --strict) and
+2 when an input could not be read.
+
+Usage:
+    python lua_lint.py [-j JOBS] [--strict] [--text] PATH [PATH ...]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+import components
+from lua_api import WATCHMAKER_API, WATCHMAKER_ACTIONS, EASING_FUNCTIONS
+from lua_syntax_checker import LuaSyntaxChecker, LuaSyntaxError, ErrorSeverity
+
+
+# Expressions are checked as the value of a return statement
+EXPRESSION_PREFIX = "return "
+
+# Values of numeric attributes that need no checking
+_NUMBER_PATTERN = re.compile(r'^\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*$')
+
+
+@dataclass
+class LintUnit:
+    """One script or expression to check"""
+    path: str
+    source: str            # where in the file, e.g. "Script" or "layers[2].Rotation"
+    code: str
+    expression: bool = False
+
+
+# ---------------------------------------------------------------------------
+# Collecting units
+# ---------------------------------------------------------------------------
+
+def iter_files(paths: List[str]) -> Iterator[str]:
+    """Expand directories into the .lua/.json files they contain"""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(('.lua', '.json')):
+                    yield os.path.join(root, name)
+
+
+def collect_units(path: str, include_text: bool = False) -> List[LintUnit]:
+    """Read one input file into lint units (raises OSError/ValueError)"""
+    if path.endswith('.lua'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return [LintUnit(path, "script", f.read())]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        project = json.load(f)
+    layers = project.get("layers") if isinstance(project, dict) else project
+    if not isinstance(layers, list):
+        raise ValueError("expected a list of layers")
+
+    units = []
+    layer_defs: Dict[str, Dict[str, Any]] = {}
+    for index, layer in enumerate(layers):
+        units.extend(_layer_units(path, f"layers[{index}]", layer, layer_defs, include_text))
+    return units
+
+
+def _layer_units(path: str, prefix: str, attributes: list,
+                 layer_defs: Dict[str, Dict[str, Any]], include_text: bool) -> List[LintUnit]:
+    """Units of one packed layer, recursing into widgets (e.g. Animation)"""
+    if not attributes or not isinstance(attributes, list) or "TYPE" not in attributes[0]:
+        raise ValueError(f"{prefix}: not a packed attribute list")
+
+    layer_type = attributes[0]["TYPE"]
+    if layer_type not in layer_defs:
+        layer_defs[layer_type] = getattr(components, layer_type, {})
+    layer_def = layer_defs[layer_type]
+
+    units = []
+    for attribute in attributes[1:]:
+        title, value = next(iter(attribute.items()))
+        source = f"{prefix}.{title}"
+        typ = layer_def.get(title)
+
+        if isinstance(value, list):
+            units.extend(_layer_units(path, source, value, layer_defs, include_text))
+        elif not isinstance(value, str) or not value.strip():
+            continue
+        elif title == "Script":
+            units.append(LintUnit(path, source, value))
+        elif title == "Text":
+            # Text usually holds tag templates such as "{dh}:{dm}", not Lua
+            if include_text:
+                units.append(LintUnit(path, source, value, expression=True))
+        elif isinstance(typ, tuple) and typ[2] == 0 and not _NUMBER_PATTERN.match(value):
+            # Float attributes get the `_<` script button in the attribute panel
+            units.append(LintUnit(path, source, value, expression=True))
+    return units
+
+
+# ---------------------------------------------------------------------------
+# Checking (runs in worker processes)
+# ---------------------------------------------------------------------------
+
+_checker: Optional[LuaSyntaxChecker] = None
+
+
+def _init_worker():
+    global _checker
+    _checker = LuaSyntaxChecker(
+        watchmaker_api=WATCHMAKER_API,
+        watchmaker_actions=WATCHMAKER_ACTIONS,
+        easing_functions=EASING_FUNCTIONS
+    )
+
+
+def check_unit(unit: LintUnit) -> List[Dict[str, Any]]:
+    """Check one unit and return its problems as JSON-ready records"""
+    if _checker is None:
+        _init_worker()
+
+    code = EXPRESSION_PREFIX + unit.code if unit.expression else unit.code
+    return [_error_record(unit, error) for error in _checker.check(code)]
+
+
+def _error_record(unit: LintUnit, error: LuaSyntaxError) -> Dict[str, Any]:
+    column = error.column
+    if unit.expression and error.line == 0:
+        column = max(0, column - len(EXPRESSION_PREFIX))
+    return {
+        "file": unit.path,
+        "source": unit.source,
+        "line": error.line + 1,
+        "column": column + 1,
+        "severity": error.severity.value,
+        "code": error.error_code,
+        "message": error.message,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Check WatchMaker Lua scripts and expressions, one JSON result per line."
+    )
+    parser.add_argument("paths", nargs="+", help=".lua files, .json projects or directories")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--strict", action="store_true",
+                        help="exit non-zero on warnings as well")
+    parser.add_argument("--text", action="store_true",
+                        help="also check Text attributes as expressions")
+    args = parser.parse_args(argv)
+
+    exit_code = 0
+    units: List[LintUnit] = []
+    for path in iter_files(args.paths):
+        try:
+            units.extend(collect_units(path, include_text=args.text))
+        except (OSError, ValueError) as e:
+            print(json.dumps({"file": path, "severity": "error", "code": "IO",
+                              "message": str(e)}), flush=True)
+            exit_code = 2
+
+    failing = {ErrorSeverity.ERROR.value}
+    if args.strict:
+        failing.add(ErrorSeverity.WARNING.value)
+
+    if args.jobs > 1 and len(units) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker) as pool:
+            results = pool.map(check_unit, units, chunksize=max(1, len(units) // (args.jobs * 4)))
+            exit_code = _report(results, failing, exit_code)
+    else:
+        exit_code = _report(map(check_unit, units), failing, exit_code)
+
+    return exit_code
+
+
+def _report(results, failing: set, exit_code: int) -> int:
+    """Print records in input order and fold their severities into the exit code"""
+    for records in results:
+        for record in records:
+            print(json.dumps(record, ensure_ascii=False))
+            if record["severity"] in failing and exit_code == 0:
+                exit_code = 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
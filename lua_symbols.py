@@ -0,0 +1,194 @@
+"""Lua Symbol Index
+
+Per-document index of the names a script defines: locals, globals,
+WatchMaker variables (var_, var_ms_, var_s_), functions and table
+fields. Symbols are stored per line, so an edit only re-tokenizes the
+lines it touched: the editor reports each modification with splice(),
+and refresh() re-reads the dirty lines.
+
+Lines are lexed on their own, so text inside multi-line long strings or
+comments may contribute a few spurious names; for completion that is
+harmless.
+"""
+
+from collections import Counter
+from typing import Callable, Dict, List, Set, Tuple
+
+from lua_completion import CompletionEngine
+from lua_lexer import TokenType, code_tokens, tokenize
+
+# (name, kind)
+LineSymbols = Tuple[Tuple[str, str], ...]
+
+SYMBOL_KINDS = ('function', 'variable', 'global', 'local', 'field')
+
+# WatchMaker user variables, shared with tags and other layers
+VARIABLE_PREFIXES = ('var_', 'var_ms_', 'var_s_')
+
+
+def extract_symbols(line: str) -> LineSymbols:
+    """Names defined on one line of Lua code"""
+    tokens = code_tokens(tokenize(line))
+    symbols = []
+    count = len(tokens)
+    brace_depth = 0
+    i = 0
+
+    def name_kind(name: str, default: str) -> str:
+        return 'variable' if name.startswith(VARIABLE_PREFIXES) else default
+
+    def read_names(start: int, stop_values: Set[str]) -> int:
+        """Comma separated names from start (e.g. 'a, b' of 'local a, b =')"""
+        j = start
+        while j < count and tokens[j].value not in stop_values:
+            if tokens[j].type is TokenType.NAME and tokens[j - 1].value not in ('<', '.', ':'):
+                symbols.append((tokens[j].value, name_kind(tokens[j].value, 'local')))
+            j += 1
+        return j
+
+    def read_dotted(start: int) -> Tuple[str, int]:
+        """A dotted/colon name from start, e.g. 'a.b:c'; returns (name, next index)"""
+        parts = [tokens[start].value]
+        j = start + 1
+        while (j + 1 < count and tokens[j].value in ('.', ':')
+               and tokens[j + 1].type is TokenType.NAME):
+            parts.append(tokens[j].value + tokens[j + 1].value)
+            j += 2
+        return ''.join(parts), j
+
+    while i < count:
+        token = tokens[i]
+        value = token.value
+
+        if value == '{':
+            brace_depth += 1
+        elif value == '}':
+            brace_depth = max(0, brace_depth - 1)
+
+        if token.type is TokenType.KEYWORD:
+            if value == 'local' and i + 1 < count and tokens[i + 1].value != 'function':
+                i = read_names(i + 1, {'=', ';'})
+                continue
+            if value == 'function':
+                if i + 1 < count and tokens[i + 1].type is TokenType.NAME:
+                    name, i = read_dotted(i + 1)
+                    symbols.append((name, 'function'))
+                else:
+                    i += 1
+                # Parameters are locals of the function
+                if i < count and tokens[i].value == '(':
+                    i = read_names(i + 1, {')'})
+                continue
+            if value == 'for':
+                i = read_names(i + 1, {'=', 'in', 'do'})
+                continue
+
+        elif token.type is TokenType.NAME and (i == 0 or tokens[i - 1].value not in ('.', ':')):
+            name, j = read_dotted(i)
+            assigned = j < count and tokens[j].value == '='
+            if assigned and '.' in name:
+                symbols.append((name, 'field'))
+            elif assigned and ':' not in name:
+                if brace_depth > 0:
+                    symbols.append((name, 'field'))  # key of a table constructor
+                else:
+                    symbols.append((name, name_kind(name, 'global')))
+            i = j
+            continue
+
+        i += 1
+
+    return tuple(symbols)
+
+
+class SymbolIndex:
+    """Incrementally maintained symbols of one document"""
+
+    def __init__(self):
+        self._lines: List[LineSymbols] = [()]
+        self._dirty: Set[int] = set()
+        # Symbols were dropped with deleted lines since the last refresh
+        self._removed = False
+        self._counts: Counter = Counter()          # (name, kind) -> occurrences
+        self._name_counts: Counter = Counter()     # name -> occurrences
+        self.engine = CompletionEngine()
+
+    # -- document changes -------------------------------------------------
+
+    def splice(self, line: int, lines_added: int):
+        """Record an edit starting on line that added (or removed) lines"""
+        line = min(max(0, line), len(self._lines) - 1)
+        if lines_added > 0:
+            self._lines[line + 1:line + 1] = [()] * lines_added
+            self._dirty = {d + lines_added if d > line else d for d in self._dirty}
+            self._dirty.update(range(line, line + lines_added + 1))
+        elif lines_added < 0:
+            removed = -lines_added
+            for symbols in self._lines[line + 1:line + 1 + removed]:
+                self._removed |= self._forget(symbols)
+            del self._lines[line + 1:line + 1 + removed]
+            self._dirty = {
+                d - removed if d > line + removed else d
+                for d in self._dirty if not line < d <= line + removed
+            }
+            self._dirty.add(line)
+        else:
+            self._dirty.add(line)
+
+    def refresh(self, line_text: Callable[[int], str]) -> bool:
+        """Re-read dirty lines; returns True when the set of symbols changed"""
+        changed = self._removed
+        self._removed = False
+        for line in sorted(self._dirty):
+            if line >= len(self._lines):
+                continue
+            symbols = extract_symbols(line_text(line))
+            old = self._lines[line]
+            if symbols == old:
+                continue
+            self._lines[line] = symbols
+            changed |= self._forget(old)
+            changed |= self._remember(symbols)
+        self._dirty.clear()
+        return changed
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._dirty)
+
+    # -- queries ----------------------------------------------------------
+
+    def symbols(self) -> List[Tuple[str, str]]:
+        """(name, kind) pairs sorted by kind order, then name"""
+        return sorted(self._counts, key=lambda item: (SYMBOL_KINDS.index(item[1]), item[0].casefold()))
+
+    def __len__(self) -> int:
+        return len(self._name_counts)
+
+    # -- bookkeeping ------------------------------------------------------
+
+    def _remember(self, symbols: LineSymbols) -> bool:
+        changed = False
+        for symbol in symbols:
+            if self._counts[symbol] == 0:
+                changed = True
+            self._counts[symbol] += 1
+            name = symbol[0]
+            if self._name_counts[name] == 0:
+                self.engine.add(name)
+            self._name_counts[name] += 1
+        return changed
+
+    def _forget(self, symbols: LineSymbols) -> bool:
+        changed = False
+        for symbol in symbols:
+            self._counts[symbol] -= 1
+            if self._counts[symbol] <= 0:
+                del self._counts[symbol]
+                changed = True
+            name = symbol[0]
+            self._name_counts[name] -= 1
+            if self._name_counts[name] <= 0:
+                del self._name_counts[name]
+                self.engine.discard(name)
+        return changed
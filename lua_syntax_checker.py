@@ -4,14 +4,30 @@ Provides AST-based syntax validation for Lua scripts with
 WatchMaker-specific API validation.
 """
 
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from collections import OrderedDict
+from dataclasses import dataclass, replace, asdict
+from typing import List, Optional, Dict, Any, Tuple
 from enum import Enum
+import atexit
+import hashlib
+import json
+import os
 import re
 import logging
+import threading
+
+from lua_lexer import LUA_KEYWORDS, LuaToken, TokenType, tokenize, tokenize_blocks
+
+try:
+    from antlr4.error.ErrorListener import ErrorListener as _AntlrErrorListener
+except ImportError:  # luaparser (and its antlr4 runtime) is optional
+    _AntlrErrorListener = object
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever checking rules change so cached results are invalidated
+CHECKER_VERSION = "5"
+
 
 class ErrorSeverity(Enum):
     ERROR = "error"
@@ -31,6 +47,254 @@ class LuaSyntaxError:
     length: Optional[int] = None     # length of error span
 
 
+@dataclass
+class LuaChunk:
+    """A top-level region of a script that can be parsed on its own"""
+    start_line: int        # 0-indexed line of the chunk's first line
+    start_pos: int         # character offset of the chunk in the script
+    text: str
+    digest: str            # content hash used as cache key
+
+
+class LuaResultCache:
+    """Bounded LRU cache of check results, optionally persisted to disk
+
+    Keys combine the script hash, CHECKER_VERSION and the checker
+    configuration. The cache is thread-safe; when a path is set, updates
+    are written back atomically as a small JSON file at most once per
+    save_delay seconds, and once more at interpreter exit.
+    """
+
+    def __init__(self, max_entries: int = 256, path: Optional[str] = None,
+                 save_delay: float = 2.0):
+        self.max_entries = max_entries
+        self.save_delay = save_delay
+        self._entries: "OrderedDict[str, List[LuaSyntaxError]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()   # serialises writers of the file
+        self._path = None
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        if path:
+            self.persist_to(path)
+
+    def persist_to(self, path: str):
+        """Load previously stored results and keep the file up to date"""
+        with self._lock:
+            if self._path is None:
+                atexit.register(self.flush)
+            self._path = path
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    stored = json.load(f)
+            except (OSError, ValueError):
+                return
+
+            for key, errors in stored.items():
+                if key not in self._entries:
+                    self._entries[key] = [self._error_from_dict(e) for e in errors]
+            self._trim()
+
+    def get(self, key: str) -> Optional[List[LuaSyntaxError]]:
+        """Return a copy of the cached errors, or None on a miss"""
+        with self._lock:
+            errors = self._entries.get(key)
+            if errors is None:
+                return None
+            self._entries.move_to_end(key)
+            return [replace(e) for e in errors]
+
+    def put(self, key: str, errors: List[LuaSyntaxError]):
+        """Store errors for a key, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[key] = [replace(e) for e in errors]
+            self._entries.move_to_end(key)
+            self._trim()
+            self._schedule_save()
+
+    def clear(self):
+        """Remove all entries (the on-disk store is cleared as well)"""
+        with self._lock:
+            self._entries.clear()
+            self._schedule_save()
+
+    def flush(self):
+        """Write pending changes to disk now"""
+        with self._save_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                if not (self._dirty and self._path):
+                    return
+                self._dirty = False
+                path = self._path
+                data = {
+                    key: [self._error_to_dict(e) for e in errors]
+                    for key, errors in self._entries.items()
+                }
+            self._write(path, data)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _trim(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _schedule_save(self):
+        """Mark the store dirty and start the debounce timer (lock held)"""
+        if not self._path:
+            return
+        self._dirty = True
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.save_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    @staticmethod
+    def _write(path: str, data: Dict[str, Any]):
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug("Failed to write Lua result cache %s: %s", path, e)
+
+    @staticmethod
+    def _error_to_dict(error: LuaSyntaxError) -> Dict[str, Any]:
+        data = asdict(error)
+        data["severity"] = error.severity.value
+        return data
+
+    @staticmethod
+    def _error_from_dict(data: Dict[str, Any]) -> LuaSyntaxError:
+        data = dict(data)
+        data["severity"] = ErrorSeverity(data["severity"])
+        return LuaSyntaxError(**data)
+
+
+class AntlrErrorCollector(_AntlrErrorListener):
+    """ANTLR error listener that keeps syntax errors as objects
+
+    Replaces luaparser's console/bail listeners, so nothing is printed
+    and no global stream has to be captured while parsing.
+    """
+
+    # Keywords that open a block closed by 'end' or 'until'
+    _BLOCK_OPENERS = frozenset({'function', 'if', 'for', 'while', 'do', 'repeat'})
+
+    def __init__(self, code: str = ""):
+        super().__init__()
+        self.errors: List[LuaSyntaxError] = []
+        self._lexer_failed = False
+        self._code = code
+        self._line_starts = [0]
+        for match in re.finditer('\n', code):
+            self._line_starts.append(match.end())
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        # Parser errors after unreadable input are only follow-up noise
+        if self._lexer_failed:
+            return
+
+        start_token = getattr(e, 'startToken', None)
+
+        if offendingSymbol is None:
+            # Lexer error: highlight the unreadable text, at most to the end of the line
+            self._lexer_failed = True
+            start_pos = self._offset(line, column)
+            length = len(self._recognition_text(msg)) or 1
+        elif offendingSymbol.type == -1:
+            # Unexpected end of input (e.g. a missing 'end'): point at the open block
+            opener = self._open_block(getattr(e, 'ctx', None))
+            if opener is None:
+                opener = self._last_token(recognizer)
+            if opener is not None:
+                line, column = opener.line, opener.column
+                start_pos = opener.start
+                length = opener.stop + 1 - start_pos
+            else:
+                start_pos = self._offset(line, column)
+                length = 1
+        elif start_token is not None and start_token.line == offendingSymbol.line:
+            # "no viable alternative": highlight the whole alternative on that line
+            line, column = start_token.line, start_token.column
+            start_pos = start_token.start
+            length = offendingSymbol.stop + 1 - start_pos
+        elif start_token is not None and start_token.type != -1:
+            # The alternative started on an earlier line, which is where the mistake is
+            line, column = start_token.line, start_token.column
+            start_pos = start_token.start
+            length = start_token.stop + 1 - start_pos
+        else:
+            start_pos = offendingSymbol.start
+            length = offendingSymbol.stop + 1 - start_pos
+
+        start_pos = max(0, start_pos)
+        self.errors.append(LuaSyntaxError(
+            line=max(0, line - 1),
+            column=max(0, column),
+            message=self._clean_message(msg),
+            severity=ErrorSeverity.ERROR,
+            error_code="E001",
+            start_pos=start_pos,
+            length=self._clamp_to_line(start_pos, length)
+        ))
+
+    def _offset(self, line: int, column: int) -> int:
+        """Character offset of a 1-based line and 0-based column"""
+        index = min(max(0, line - 1), len(self._line_starts) - 1)
+        return min(self._line_starts[index] + max(0, column), len(self._code))
+
+    def _clamp_to_line(self, start_pos: int, length: int) -> int:
+        """Keep a span on one line; always at least one character"""
+        line_end = self._code.find('\n', start_pos)
+        if line_end == -1:
+            line_end = len(self._code)
+        return max(1, min(length, line_end - start_pos))
+
+    @staticmethod
+    def _recognition_text(msg: str) -> str:
+        """The unreadable text quoted in a lexer 'token recognition error'"""
+        match = re.search(r"at: '(.*)'$", msg, re.DOTALL)
+        if not match:
+            return ""
+        text = match.group(1)
+        return re.split(r'\\n|\n', text, maxsplit=1)[0]
+
+    @classmethod
+    def _open_block(cls, ctx):
+        """Start token of the innermost block statement around a parse context"""
+        while ctx is not None:
+            start = getattr(ctx, 'start', None)
+            if start is not None and start.text in cls._BLOCK_OPENERS:
+                return start
+            ctx = getattr(ctx, 'parentCtx', None)
+        return None
+
+    @staticmethod
+    def _last_token(recognizer):
+        """Last real token before end of input"""
+        stream = recognizer.getInputStream()
+        index = stream.index - 1
+        while index >= 0:
+            token = stream.get(index)
+            if token.type != -1 and token.channel == 0:
+                return token
+            index -= 1
+        return None
+
+    @staticmethod
+    def _clean_message(msg: str) -> str:
+        """Keep only the first line of multi-line token text in ANTLR messages"""
+        msg = re.sub(r"'([^']*?)\\n[^']*'", r"'\1'", msg)
+        return msg.replace('\\n', ' ').strip()
+
+
 # Error message templates
 ERROR_MESSAGES = {
     # Syntax errors
@@ -39,6 +303,7 @@ ERROR_MESSAGES = {
     "E002": "Unexpected token: {token}",
     "E003": "Unclosed block: '{keyword}' started at line {start_line}",
     "E004": "Unmatched bracket: '{bracket}'",
+    "E005": "Unfinished {kind}",
 
     # WatchMaker-specific warnings
     "W001": "Unknown WatchMaker function: '{func_name}'",
@@ -52,6 +317,9 @@ ERROR_MESSAGES = {
 class LuaSyntaxChecker:
     """Main syntax checker class using luaparser"""
 
+    # Result cache shared by every checker instance
+    result_cache = LuaResultCache()
+
     # Valid WatchMaker callback functions
     VALID_CALLBACKS = [
         'on_hour', 'on_minute', 'on_second', 'on_millisecond',
@@ -61,6 +329,26 @@ class LuaSyntaxChecker:
     # WatchMaker tag pattern: {tag_name}
     TAG_PATTERN = re.compile(r'\{([a-zA-Z0-9_]+)\}')
 
+    # Maximum number of lines grouped into one chunk of plain statements
+    CHUNK_MAX_LINES = 40
+
+    _BLOCK_OPENERS = {'function', 'if', 'do', 'repeat', '(', '{', '['}
+    _BLOCK_CLOSERS = {'end', 'until', ')', '}', ']'}
+
+    # Tokens after which a statement is still incomplete
+    _CONTINUATION_TOKENS = {
+        'and', 'or', 'not', 'local', 'function', 'return', 'then', 'do',
+        'else', 'elseif', 'in', 'while', 'until', 'if', 'for', 'repeat', 'goto',
+        '=', '+', '-', '*', '/', '//', '%', '^', '#', '&', '~', '|', '<<', '>>',
+        '<', '>', '<=', '>=', '==', '~=', '..', '(', '{', '[', ',', '.', ':',
+    }
+
+    # Keywords that may begin a top-level statement
+    _STATEMENT_KEYWORDS = {
+        'local', 'function', 'if', 'for', 'while', 'do', 'repeat',
+        'return', 'goto', 'break',
+    }
+
     def __init__(self, watchmaker_api: Dict[str, Any] = None,
                  watchmaker_actions: List[str] = None,
                  easing_functions: List[str] = None):
@@ -71,9 +359,18 @@ class LuaSyntaxChecker:
         self._last_ast = None
         self._fallback_warned = False
 
-        # Cache for performance
-        self._cache_code = None
-        self._cache_errors = None
+        # Identifies this configuration in the shared result cache
+        config = json.dumps([
+            CHECKER_VERSION,
+            self._parser_available,
+            sorted(self.watchmaker_api),
+            sorted(self.watchmaker_actions),
+            sorted(self.easing_functions),
+        ])
+        self._config_digest = hashlib.sha1(config.encode('utf-8')).hexdigest()
+
+        # chunk digest -> (syntax errors, semantic errors), chunk-relative
+        self._chunk_cache: Dict[str, Tuple[List[LuaSyntaxError], List[LuaSyntaxError]]] = {}
 
     def _check_parser_available(self) -> bool:
         """Check if luaparser is installed"""
@@ -125,9 +422,11 @@ class LuaSyntaxChecker:
         if not code or not code.strip():
             return []
 
-        # Return cached result if code unchanged
-        if code == self._cache_code and self._cache_errors is not None:
-            return self._cache_errors.copy()
+        # Return cached result if this script was checked before
+        cache_key = self.result_key(code)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         # Preprocess WatchMaker tags to avoid syntax errors
         preprocessed_code = self._preprocess_tags(code)
@@ -142,197 +441,221 @@ class LuaSyntaxChecker:
             error.message = self._restore_tags_in_message(error.message)
 
         # Update cache
-        self._cache_code = code
-        self._cache_errors = errors
+        self.result_cache.put(cache_key, errors)
 
         return errors
 
+    def cached_result(self, code: str) -> Optional[List[LuaSyntaxError]]:
+        """Return cached errors for a script without checking it, or None"""
+        if not code or not code.strip():
+            return []
+        return self.result_cache.get(self.result_key(code))
+
+    def result_key(self, code: str) -> str:
+        """Cache key of a script: content hash plus checker version/config"""
+        code_digest = hashlib.sha1(code.encode('utf-8')).hexdigest()
+        return f"{code_digest}:{self._config_digest}"
+
     def _do_full_check(self, code: str) -> List[LuaSyntaxError]:
-        """Perform full parser-based check"""
-        errors = []
+        """Perform full parser-based check, re-parsing only changed chunks"""
+        syntax_errors = []
+        semantic_errors = []
+        chunk_cache = {}
+
+        for chunk in self.split_chunks(code):
+            result = chunk_cache.get(chunk.digest) or self._chunk_cache.get(chunk.digest)
+            if result is None:
+                result = self._check_chunk(chunk.text)
+            chunk_cache[chunk.digest] = result
+
+            chunk_syntax, chunk_semantic = result
+            syntax_errors.extend(self._shift_errors(chunk_syntax, chunk))
+            semantic_errors.extend(self._shift_errors(chunk_semantic, chunk))
+
+        # Only chunks of the latest script are kept, so the cache stays bounded
+        self._chunk_cache = chunk_cache
+
+        # Semantic analysis is only reported once the whole script parses
+        return syntax_errors if syntax_errors else semantic_errors
+
+    def _check_chunk(self, code: str) -> Tuple[List[LuaSyntaxError], List[LuaSyntaxError]]:
+        """Parse and analyse one chunk, positions relative to the chunk"""
+        syntax_errors = []
+        semantic_errors = []
 
         try:
             # Phase 1: Parse syntax
             syntax_errors = self._parse_syntax(code)
-            errors.extend(syntax_errors)
 
             # Phase 2: Semantic analysis (only if parsing succeeded)
             if not syntax_errors and self._last_ast:
                 semantic_errors = self._analyze_semantics(code)
-                errors.extend(semantic_errors)
 
         except Exception as e:
             # Unexpected error - fall back
             import traceback
             traceback.print_exc()
-            errors.append(LuaSyntaxError(
+            syntax_errors = [LuaSyntaxError(
                 line=0, column=0,
                 message=f"Parser failed: {str(e)}",
                 severity=ErrorSeverity.WARNING,
                 error_code="E000"
-            ))
-            errors.extend(self._basic_fallback_check(code))
-
-        return errors
-
-    def _parse_syntax(self, code: str) -> List[LuaSyntaxError]:
-        """Parse Lua code and extract syntax errors"""
-        import sys
-        import io
-        from luaparser import ast
-        from luaparser.ast import SyntaxException
-
-        errors = []
-
-        # Capture luaparser's stdout/stderr output (contains detailed error info)
-        old_stdout = sys.stdout
-        old_stderr = sys.stderr
-        captured_stdout = io.StringIO()
-        captured_stderr = io.StringIO()
-        sys.stdout = captured_stdout
-        sys.stderr = captured_stderr
-
-        try:
-            tree = ast.parse(code)
-            self._last_ast = tree  # Cache for semantic analysis
-
-        except SyntaxException as e:
-            # Get captured stderr which contains ANTLR error messages
-            stderr_output = captured_stderr.getvalue()
-            stdout_output = captured_stdout.getvalue()
-
-            # Parse ANTLR error messages from stderr
-            parsed_errors = self._parse_antlr_errors(stderr_output + stdout_output, code)
-
-            if parsed_errors:
-                errors.extend(parsed_errors)
-            else:
-                # Fallback to exception message parsing
-                error = self._parse_syntax_exception(e, code)
-                errors.append(error)
-
-            self._last_ast = None
-
-        except Exception as e:
-            # Try to extract line info from exception message
-            error = self._parse_generic_exception(e, code)
-            errors.append(error)
-            self._last_ast = None
+            )]
+            syntax_errors.extend(self._basic_fallback_check(code))
+            semantic_errors = []
+
+        return syntax_errors, semantic_errors
+
+    def _shift_errors(self, errors: List[LuaSyntaxError], chunk: LuaChunk) -> List[LuaSyntaxError]:
+        """Copy chunk-relative errors into script coordinates"""
+        return [
+            replace(
+                error,
+                line=error.line + chunk.start_line,
+                start_pos=None if error.start_pos is None else error.start_pos + chunk.start_pos
+            )
+            for error in errors
+        ]
+
+    def split_chunks(self, code: str) -> List[LuaChunk]:
+        """
+        Split a script into top-level chunks that parse independently.
 
-        finally:
-            # Restore stdout/stderr
-            sys.stdout = old_stdout
-            sys.stderr = old_stderr
+        Cuts are only made between complete top-level statements: every
+        function definition gets a chunk of its own, other statements are
+        grouped up to CHUNK_MAX_LINES lines. Nothing is cut after a
+        top-level 'return', which must stay the last statement.
+        """
+        lines = code.split('\n')
+        line_count = len(lines)
 
-        return errors
+        first_token = [None] * line_count
+        second_token = [None] * line_count
+        last_token = [None] * line_count
+        cuttable = [True] * line_count
+        return_line = line_count
 
-    def _parse_antlr_errors(self, output: str, code: str) -> List[LuaSyntaxError]:
-        """Parse ANTLR error messages from luaparser output"""
-        errors = []
-        seen_errors = set()  # Avoid duplicate errors
-        code_lines = code.split('\n')
-
-        # ANTLR error format: "line X:Y message"
-        # Example: "line 4:0 missing 'end' at '<EOF>'"
-        pattern = re.compile(r'line\s+(\d+):(\d+)\s+(.+?)(?=line\s+\d+:|\Z)', re.DOTALL)
-
-        for match in pattern.finditer(output):
-            reported_line = int(match.group(1)) - 1  # Convert to 0-indexed
-            column = int(match.group(2))
-            raw_message = match.group(3).strip().replace('\n', ' ').strip()
-
-            # Extract the problematic token from error message
-            # Format: "no viable alternative at input 'token'" or with escaped newline
-            error_token = None
-
-            # Try to match token with possible escaped newline
-            token_match = re.search(r"at input\s+'([^']*)'", raw_message)
-            if token_match:
-                token_content = token_match.group(1)
-                # Handle escaped newline in token - take first part
-                if '\\n' in token_content:
-                    error_token = token_content.split('\\n')[0].strip()
-                else:
-                    error_token = token_content.strip()
-            else:
-                token_match = re.search(r"mismatched input\s+'([^']*)'", raw_message)
-                if token_match:
-                    error_token = token_match.group(1).strip()
-
-            # Find actual line by searching for the error token in code
-            actual_line = reported_line
-
-            if error_token:
-                # Search backwards from reported line to find the token
-                for search_line in range(min(reported_line, len(code_lines) - 1), -1, -1):
-                    if search_line < len(code_lines):
-                        token_pos = code_lines[search_line].find(error_token)
-                        if token_pos >= 0:
-                            actual_line = search_line
-                            column = token_pos
-                            break
-
-            # Clean up message for display
-            clean_message = raw_message
-            # Remove escaped newlines and content after them in quoted strings
-            clean_message = re.sub(r"'([^']*?)\\n[^']*'", r"'\1'", clean_message)
-            clean_message = clean_message.replace('\\n', ' ').strip()
-
-            # Create unique key to avoid duplicates
-            error_key = (actual_line, clean_message)
-            if error_key in seen_errors:
+        depth = 0
+        line = 0
+        for token in tokenize(code):
+            # A line can start a chunk only if no block is open at its start
+            if token.line > line:
+                for skipped in range(line + 1, token.line + 1):
+                    cuttable[skipped] = depth == 0
+                line = token.line
+
+            end_line = token.end_line
+            if end_line > line:
+                # Lines inside long strings/comments can never start a chunk
+                for inner in range(line + 1, end_line + 1):
+                    cuttable[inner] = False
+                line = end_line
+
+            if token.type is TokenType.COMMENT:
                 continue
-            seen_errors.add(error_key)
-
-            # Calculate character position for highlighting
-            start_pos = sum(len(l) + 1 for l in code_lines[:max(0, actual_line)]) + column
 
-            # Determine highlight length
-            highlight_len = len(error_token) if error_token else 1
+            value = token.value
+            if first_token[token.line] is None:
+                first_token[token.line] = value
+            elif second_token[token.line] is None:
+                second_token[token.line] = value
+            last_token[line] = value
+
+            if value in self._BLOCK_OPENERS:
+                depth += 1
+            elif value in self._BLOCK_CLOSERS:
+                depth = max(0, depth - 1)
+            elif value == 'return' and depth == 0:
+                return_line = min(return_line, line)
+
+        boundaries = [0]
+        chunk_line = None
+        chunk_is_function = False
+        previous = None
+        for i in range(line_count):
+            token = first_token[i]
+            if token is None:
+                continue
 
-            errors.append(LuaSyntaxError(
-                line=max(0, actual_line),
-                column=max(0, column),
-                message=clean_message,
-                severity=ErrorSeverity.ERROR,
-                error_code="E001",
-                start_pos=start_pos,
-                length=max(1, highlight_len)
+            is_function = token == 'function' or (
+                token == 'local' and second_token[i] == 'function'
+            )
+            if chunk_line is None:
+                chunk_line = i
+                chunk_is_function = is_function
+            elif (cuttable[i] and i <= return_line
+                    and previous not in self._CONTINUATION_TOKENS
+                    and self._starts_statement(token)
+                    and (is_function or chunk_is_function
+                         or i - chunk_line >= self.CHUNK_MAX_LINES)):
+                boundaries.append(i)
+                chunk_line = i
+                chunk_is_function = is_function
+
+            previous = last_token[i]
+
+        boundaries.append(line_count)
+
+        chunks = []
+        pos = 0
+        for start, end in zip(boundaries, boundaries[1:]):
+            text = '\n'.join(lines[start:end])
+            chunks.append(LuaChunk(
+                start_line=start,
+                start_pos=pos,
+                text=text,
+                digest=hashlib.sha1(text.encode('utf-8')).hexdigest()
             ))
+            pos += len(text) + 1
+        return chunks
 
-        return errors
+    def _starts_statement(self, token: str) -> bool:
+        """Check whether a line's first token can begin a new statement"""
+        if token in LUA_KEYWORDS:
+            return token in self._STATEMENT_KEYWORDS
+        return token == '::' or token[0].isalpha() or token[0] == '_'
 
-    def _parse_syntax_exception(self, exc: Exception, code: str) -> LuaSyntaxError:
-        """Parse luaparser SyntaxException to extract line/column info (fallback)"""
-        msg = str(exc)
+    def _parse_syntax(self, code: str) -> List[LuaSyntaxError]:
+        """Parse Lua code and collect syntax errors from ANTLR's listener"""
+        from antlr4 import InputStream, CommonTokenStream, Token
+        from antlr4.error.ErrorStrategy import BailErrorStrategy
+        from antlr4.error.Errors import ParseCancellationException
+        from luaparser.builder import BuilderVisitor
+        from luaparser.parser.LuaLexer import LuaLexer
+        from luaparser.parser.LuaParser import LuaParser
+
+        # Same pipeline as luaparser.ast.parse, with our own listener
+        collector = AntlrErrorCollector(code)
+        self._last_ast = None
 
-        # Try to extract line:column from message
-        line = 0
-        column = 0
+        lexer = LuaLexer(InputStream(code))
+        lexer.removeErrorListeners()
+        lexer.addErrorListener(collector)
 
-        match = re.search(r'line\s*(\d+)(?::(\d+))?', msg, re.IGNORECASE)
-        if match:
-            line = int(match.group(1)) - 1  # Convert to 0-indexed
-            column = int(match.group(2)) if match.group(2) else 0
+        token_stream = CommonTokenStream(lexer, channel=Token.DEFAULT_CHANNEL)
+        parser = LuaParser(token_stream)
+        parser.removeErrorListeners()
+        parser.addErrorListener(collector)
+        parser._errHandler = BailErrorStrategy()
 
-        # Calculate character position for highlighting
-        lines = code.split('\n')
-        start_pos = sum(len(l) + 1 for l in lines[:max(0, line)]) + column
+        try:
+            tree = parser.start_()
+        except ParseCancellationException as e:
+            # Inline mismatches bail out before reaching the listener
+            if not collector.errors and e.args:
+                parser._errHandler.reportError(parser, e.args[0])
+            return collector.errors or [self._parse_generic_exception(e, code)]
+        except Exception as e:
+            return [self._parse_generic_exception(e, code)]
 
-        # Clean up error message
-        clean_msg = msg
-        if clean_msg == "syntax errors":
-            clean_msg = "Syntax error in code"
+        if collector.errors:
+            return collector.errors
 
-        return LuaSyntaxError(
-            line=max(0, line),
-            column=max(0, column),
-            message=clean_msg,
-            severity=ErrorSeverity.ERROR,
-            error_code="E001",
-            start_pos=start_pos,
-            length=10
-        )
+        try:
+            self._last_ast = BuilderVisitor(token_stream).visit(tree)  # Cache for semantic analysis
+        except Exception as e:
+            return [self._parse_generic_exception(e, code)]
+        return []
 
     def _parse_generic_exception(self, exc: Exception, code: str) -> LuaSyntaxError:
         """Parse generic exception"""
@@ -535,164 +858,88 @@ class LuaSyntaxChecker:
                     return func.idx.id
         return None
 
+    # Block keywords -> keyword that closes them
+    _FALLBACK_BLOCKS = {
+        'function': 'end', 'if': 'end', 'for': 'end',
+        'while': 'end', 'do': 'end', 'repeat': 'until',
+    }
+    _FALLBACK_BRACKETS = {'(': ')', '[': ']', '{': '}'}
+
     def _basic_fallback_check(self, code: str) -> List[LuaSyntaxError]:
-        """Fallback to basic regex-based checking when parser unavailable"""
+        """Fallback block/bracket pairing on the token stream when parser unavailable"""
         if not self._fallback_warned:
             self._fallback_warned = True
             logger.debug("luaparser not installed, using basic syntax check")
 
         errors = []
-        lines = code.split('\n')
-
-        # Track block pairing
-        block_stack = []
-        block_keywords = {
-            'function': 'end', 'if': 'end', 'for': 'end',
-            'while': 'end', 'do': 'end', 'repeat': 'until',
-        }
-
-        # Track brackets across all lines
-        paren_balance = 0
-        bracket_balance = 0
-        brace_balance = 0
-        paren_open_line = -1
-        bracket_open_line = -1
-        brace_open_line = -1
-
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-
-            if stripped.startswith('--') or not stripped:
-                continue
-
-            clean_line = self._remove_strings_fallback(stripped)
-
-            # Check block start
-            for keyword in block_keywords:
-                if (clean_line.startswith(keyword + ' ') or
-                    clean_line.startswith(keyword + '(') or
-                    clean_line == keyword):
-                    block_stack.append((keyword, i))
-                    break
-
-            # Check block end
-            if (clean_line == 'end' or clean_line.startswith('end ') or
-                clean_line.startswith('end)') or clean_line.startswith('end,')):
-                if block_stack:
-                    block_stack.pop()
-                else:
-                    errors.append(LuaSyntaxError(
-                        line=i, column=0,
-                        message="Unexpected 'end'",
-                        severity=ErrorSeverity.ERROR,
-                        error_code="E003"
-                    ))
-
-            # Check until
-            if clean_line.startswith('until ') or clean_line == 'until':
-                if block_stack and block_stack[-1][0] == 'repeat':
-                    block_stack.pop()
-
-            # Track brackets
-            for char in clean_line:
-                if char == '(':
-                    if paren_balance == 0:
-                        paren_open_line = i
-                    paren_balance += 1
-                elif char == ')':
-                    paren_balance -= 1
-                    if paren_balance < 0:
-                        errors.append(LuaSyntaxError(
-                            line=i, column=0,
-                            message="Unmatched ')'",
-                            severity=ErrorSeverity.ERROR,
-                            error_code="E004"
-                        ))
-                        paren_balance = 0
-                elif char == '[':
-                    if bracket_balance == 0:
-                        bracket_open_line = i
-                    bracket_balance += 1
-                elif char == ']':
-                    bracket_balance -= 1
-                    if bracket_balance < 0:
-                        errors.append(LuaSyntaxError(
-                            line=i, column=0,
-                            message="Unmatched ']'",
-                            severity=ErrorSeverity.ERROR,
-                            error_code="E004"
-                        ))
-                        bracket_balance = 0
-                elif char == '{':
-                    if brace_balance == 0:
-                        brace_open_line = i
-                    brace_balance += 1
-                elif char == '}':
-                    brace_balance -= 1
-                    if brace_balance < 0:
-                        errors.append(LuaSyntaxError(
-                            line=i, column=0,
-                            message="Unmatched '}'",
-                            severity=ErrorSeverity.ERROR,
-                            error_code="E004"
-                        ))
-                        brace_balance = 0
-
-        # Report unclosed blocks
-        for keyword, line_num in block_stack:
-            errors.append(LuaSyntaxError(
-                line=line_num, column=0,
-                message=ERROR_MESSAGES["E003"].format(keyword=keyword, start_line=line_num + 1),
-                severity=ErrorSeverity.ERROR,
-                error_code="E003"
-            ))
+        # Open blocks and brackets: [opening token, expected closer]
+        stack: List[list] = []
+        keyword_type = TokenType.KEYWORD
+        operator_type = TokenType.OPERATOR
+
+        for token in tokenize_blocks(code):
+            token_type = token.type
+            if token_type is keyword_type:
+                value = token.value
+                if value == 'do' and stack and stack[-1][1] == 'do':
+                    # 'for ... do' / 'while ... do' - the loop's own body
+                    stack[-1][1] = 'end'
+                elif value in self._FALLBACK_BLOCKS:
+                    closer = 'do' if value in ('for', 'while') else self._FALLBACK_BLOCKS[value]
+                    stack.append([token, closer])
+                elif value == 'end' or value == 'until':
+                    self._close_fallback(stack, token, errors, "Unexpected '{}'", "E003")
+            elif token_type is operator_type:
+                value = token.value
+                if value in self._FALLBACK_BRACKETS:
+                    stack.append([token, self._FALLBACK_BRACKETS[value]])
+                elif value in (')', ']', '}'):
+                    self._close_fallback(stack, token, errors, "Unmatched '{}'", "E004")
+            elif not token.closed:
+                kind = 'comment' if token_type is TokenType.COMMENT else 'string'
+                errors.append(self._token_error(
+                    token, ERROR_MESSAGES["E005"].format(kind=kind), "E005"
+                ))
 
-        # Report unclosed brackets
-        if paren_balance > 0:
-            errors.append(LuaSyntaxError(
-                line=paren_open_line, column=0,
-                message="Unclosed '('",
-                severity=ErrorSeverity.ERROR,
-                error_code="E004"
-            ))
-        if bracket_balance > 0:
-            errors.append(LuaSyntaxError(
-                line=bracket_open_line, column=0,
-                message="Unclosed '['",
-                severity=ErrorSeverity.ERROR,
-                error_code="E004"
-            ))
-        if brace_balance > 0:
-            errors.append(LuaSyntaxError(
-                line=brace_open_line, column=0,
-                message="Unclosed '{'",
-                severity=ErrorSeverity.ERROR,
-                error_code="E004"
-            ))
+        # Report unclosed blocks and brackets
+        for opener, _ in stack:
+            errors.append(self._unclosed_error(opener))
 
+        errors.sort(key=lambda error: (error.line, error.column))
         return errors
 
-    def _remove_strings_fallback(self, line: str) -> str:
-        """Remove string literals from line to avoid false positives"""
-        result = []
-        in_string = False
-        string_char = None
-        i = 0
-        while i < len(line):
-            char = line[i]
-            if not in_string:
-                if char in '"\'':
-                    in_string = True
-                    string_char = char
-                else:
-                    result.append(char)
-            else:
-                if char == string_char and (i == 0 or line[i-1] != '\\'):
-                    in_string = False
-            i += 1
-        return ''.join(result)
+    def _close_fallback(self, stack: List[list], token: LuaToken,
+                        errors: List[LuaSyntaxError], message: str, error_code: str):
+        """Pop the innermost opener closed by token, reporting skipped openers"""
+        closer = token.value
+        for index in range(len(stack) - 1, -1, -1):
+            expected = stack[index][1]
+            # A loop still waiting for 'do' is closed by 'end' as well
+            if expected == closer or (expected == 'do' and closer == 'end'):
+                for opener, _ in stack[index + 1:]:
+                    errors.append(self._unclosed_error(opener))
+                del stack[index:]
+                return
+        errors.append(self._token_error(token, message.format(closer), error_code))
+
+    def _unclosed_error(self, opener: LuaToken) -> LuaSyntaxError:
+        """Error for a block keyword or bracket that is never closed"""
+        if opener.type is TokenType.KEYWORD:
+            message = ERROR_MESSAGES["E003"].format(keyword=opener.value, start_line=opener.line + 1)
+            return self._token_error(opener, message, "E003")
+        return self._token_error(opener, f"Unclosed '{opener.value}'", "E004")
+
+    def _token_error(self, token: LuaToken, message: str, error_code: str) -> LuaSyntaxError:
+        return LuaSyntaxError(
+            line=token.line, column=token.column,
+            message=message,
+            severity=ErrorSeverity.ERROR,
+            error_code=error_code,
+            start_pos=token.pos,
+            length=len(token.value.split('\n', 1)[0])
+        )
 
     def clear_cache(self):
         """Clear the result cache"""
-        self._cache_code = None
-        self._cache_errors = None
+        self.result_cache.clear()
+        self._chunk_cache = {}
@@ -23,6 +23,7 @@ from PyQt5.QtCore import QObject, pyqtSignal, Qt, QSize
 from PyQt5.QtGui import QCursor, QPixmap, QDesktopServices
 from PyQt5.QtCore import QUrl
 from common import FlowLayout
+from image_loader import ImageLoader
 
 
 def load_style():
@@ -247,17 +248,13 @@ class IconSourceDialog(QDialog):
         icon_label.setFixedSize(self.ICON_SIZE, self.ICON_SIZE)
         icon_label.setAlignment(Qt.AlignCenter)
 
-        pixmap = QPixmap(filepath)
-        if not pixmap.isNull():
-            scaled = pixmap.scaled(
-                self.ICON_SIZE,
-                self.ICON_SIZE,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation,
-            )
-            icon_label.setPixmap(scaled)
-        else:
-            icon_label.setText("?")
+        # 圖示縮圖來自快取或在背景產生，完成前顯示空白佔位
+        ImageLoader.instance().load_thumbnail(
+            filepath,
+            QSize(self.ICON_SIZE, self.ICON_SIZE),
+            lambda pixmap: self._set_icon_pixmap(icon_label, pixmap),
+            receiver=icon_label,
+        )
 
         # 檔名標籤
         name_label = QLabel(name_no_ext)
@@ -274,3 +271,10 @@ class IconSourceDialog(QDialog):
         cell.setFixedWidth(cell_w)
 
         return cell
+
+    @staticmethod
+    def _set_icon_pixmap(icon_label: QLabel, pixmap: QPixmap):
+        if not pixmap.isNull():
+            icon_label.setPixmap(pixmap)
+        else:
+            icon_label.setText("?")
@@ -1,8 +1,10 @@
 import os
+import time
+from dataclasses import dataclass, field
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
-from PyQt5.QtGui import QPixmap, QPainter, QColor, QIcon, QKeyEvent
-from common import FlowLayout
+from PyQt5.QtGui import QPixmap, QPainter, QColor, QIcon, QKeyEvent, QPen, QFont
+from image_loader import ImageLoader
 
 
 def load_style():
@@ -15,88 +17,197 @@ def load_style():
         print(f"Warning: Style file not found: {style_path}")
         return ""
 
-class WatchCard(QFrame):
-    def __init__(self,img,name,parent=None,signal=None,scrapbook=None):
+
+@dataclass(eq=False)
+class WatchInfo:
+    """一個錶面的中繼資料（以物件本身作為開啟編輯視圖的 key）"""
+    name: str
+    image: str = ""                 # 預覽圖路徑
+    watchface: str = ""             # 錶面檔案路徑
+    modified: float = field(default_factory=time.time)
+    is_add_card: bool = False       # 第一張 "add new watch" 卡片
+
+
+class WatchListModel(QAbstractListModel):
+    """My Watches 的清單模型；第 0 列固定為 "add new watch" 卡片"""
+
+    WatchRole = Qt.UserRole + 1      # WatchInfo
+    NameKeyRole = Qt.UserRole + 2    # 排序用的名稱（add 卡片永遠最前）
+    ModifiedRole = Qt.UserRole + 3   # 排序用的修改時間（add 卡片永遠最前）
+
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.setObjectName("card")
-        self.setFrameShape(QFrame.StyledPanel)
-        self.setFixedSize(140, 200)
-        self.tip=signal[0]
-        self.summon=signal[1]
-        self.scrapbook=scrapbook
-        self.watchface=""
-        self.name=name
-        self.img=img
-        self.set_ui(img,name)
+        self.add_card = WatchInfo("add new watch", "img/my_watches/btn_new_watch.png", is_add_card=True)
+        self._watches = [self.add_card]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._watches)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        watch = self._watches[index.row()]
+        if role == Qt.DisplayRole:
+            return watch.name
+        if role == self.WatchRole:
+            return watch
+        if role == self.NameKeyRole:
+            return "" if watch.is_add_card else watch.name.casefold()
+        if role == self.ModifiedRole:
+            return float("inf") if watch.is_add_card else watch.modified
+        return None
+
+    def add_watches(self, watches):
+        """一次加入多個錶面（只發出一次插入通知）"""
+        if not watches:
+            return
+        first = len(self._watches)
+        self.beginInsertRows(QModelIndex(), first, first + len(watches) - 1)
+        self._watches.extend(watches)
+        self.endInsertRows()
+
+    def remove_watch(self, watch):
+        if watch.is_add_card or watch not in self._watches:
+            return
+        row = self._watches.index(watch)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._watches[row]
+        self.endRemoveRows()
+
+    def watches(self):
+        return self._watches[1:]
+
+
+class WatchFilterModel(QSortFilterProxyModel):
+    """依名稱即時搜尋與排序；add 卡片不受搜尋影響"""
+
+    SORT_MODES = {
+        "Name": (WatchListModel.NameKeyRole, Qt.AscendingOrder),
+        "Recently modified": (WatchListModel.ModifiedRole, Qt.DescendingOrder),
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setSortCaseSensitivity(Qt.CaseInsensitive)
+        self.setDynamicSortFilter(True)
+        self.set_sort_mode("Name")
+
+    def set_sort_mode(self, mode):
+        role, order = self.SORT_MODES[mode]
+        self.setSortRole(role)
+        self.sort(0, order)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if source_row == 0:
+            return True  # add 卡片
+        return super().filterAcceptsRow(source_row, source_parent)
+
+
+class WatchCardDelegate(QStyledItemDelegate):
+    """繪製錶面卡片；只為可見的卡片要求縮圖，縮圖在背景載入"""
 
-    def set_ui(self,img,name):
-        card_layout = QVBoxLayout(self)
-        card_layout.setContentsMargins(5, 5, 5, 5)
-        card_layout.setSpacing(5)
+    CARD_SIZE = QSize(140, 200)
+    IMAGE_SIZE = QSize(130, 160)
+    ADD_ICON_SIZE = QSize(80, 80)
+    MARGIN = 5
+
+    # 有縮圖載入完成，需要重繪
+    thumbnail_ready = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._loading = set()   # 載入中的 (路徑, 尺寸)
+        self._missing = set()   # 無法載入的 (路徑, 尺寸)
+        self._name_font = QFont()
+        self._name_font.setPixelSize(16)
+
+    def sizeHint(self, option, index):
+        return self.CARD_SIZE
+
+    def paint(self, painter, option, index):
+        watch = index.data(WatchListModel.WatchRole)
+        card = QRect(option.rect.topLeft(), self.CARD_SIZE)
+        card.moveCenter(option.rect.center())
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # 卡片背景（滑鼠懸停時加亮邊框）
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        painter.setPen(QPen(QColor("#dddddd"), 1) if hovered else QPen(QColor("#4d4d4d"), 2))
+        painter.setBrush(QColor("#404040") if hovered else QColor("#3d3d3d"))
+        painter.drawRoundedRect(QRectF(card).adjusted(1, 1, -1, -1), 8, 8)
 
         # 圖片區域
-        image_label = QLabel()
-        image_label.setObjectName("watchImage")
-        image_label.setFixedSize(130, 160)
-        image_label.setAlignment(Qt.AlignCenter)
-        image_label.setScaledContents(True)
-
-        # 載入圖片（如果路徑存在）
-        pixmap = QPixmap(img)
-        if not pixmap.isNull():
-            image_label.setPixmap(pixmap)
+        image_rect = QRect(card.left() + self.MARGIN, card.top() + self.MARGIN,
+                           self.IMAGE_SIZE.width(), self.IMAGE_SIZE.height())
+        if watch.is_add_card:
+            icon_rect = QRect(QPoint(0, 0), self.ADD_ICON_SIZE)
+            icon_rect.moveCenter(image_rect.center())
+            self._draw_image(painter, icon_rect, watch.image, self.ADD_ICON_SIZE,
+                             Qt.IgnoreAspectRatio, "+", QColor("#0078D4"))
         else:
-            # 如果圖片不存在，顯示佔位符
-            image_label.setText("No Image")
-            image_label.setStyleSheet("background-color: #3d3d3d; color: #888888;")
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#252525"))
+            painter.drawRoundedRect(QRectF(image_rect), 4, 4)
+            self._draw_image(painter, image_rect, watch.image, self.IMAGE_SIZE,
+                             Qt.IgnoreAspectRatio, "No Image", QColor("#888888"))
+
+        # 名稱
+        name_rect = QRect(card.left() + self.MARGIN, image_rect.bottom() + self.MARGIN,
+                          self.IMAGE_SIZE.width(), card.bottom() - image_rect.bottom() - self.MARGIN * 2)
+        painter.setFont(self._name_font)
+        painter.setPen(QColor("#ffffff"))
+        painter.drawText(name_rect, Qt.AlignCenter | Qt.TextWordWrap, watch.name)
 
-        card_layout.addWidget(image_label)
+        painter.restore()
 
-        # 名稱標籤
-        name_label = QLabel(name)
-        name_label.setObjectName("watchName")
-        name_label.setAlignment(Qt.AlignCenter)
-        name_label.setWordWrap(True)
-        name_label.setFixedHeight(30)
-        card_layout.addWidget(name_label)
+    def _draw_image(self, painter, rect, path, size, aspect_mode, fallback_text, fallback_color):
+        loader = ImageLoader.instance()
+        key = (path, size.width(), size.height())
+        pixmap = loader.cached_thumbnail(path, size, aspect_mode) if key not in self._missing else None
 
-    def mousePressEvent(self, event):
-        self.summon.emit(self,self.watchface)
+        if pixmap is not None:
+            painter.drawPixmap(rect, pixmap)
+            return
 
-    def change_watchface(self,watchface):
-        self.watchface=watchface
+        if key not in self._missing and key not in self._loading:
+            self._loading.add(key)
+            loader.load_thumbnail(
+                path, size, lambda pixmap: self._on_thumbnail(key, pixmap),
+                receiver=self, aspect_mode=aspect_mode
+            )
+        if key in self._missing:
+            painter.setPen(fallback_color)
+            painter.drawText(rect, Qt.AlignCenter, fallback_text)
 
-    def enterEvent(self, event):
-        super().enterEvent(event)
-        self.tip.emit("Right-click to display menu.")
+    def _on_thumbnail(self, key, pixmap):
+        self._loading.discard(key)
+        if pixmap.isNull():
+            self._missing.add(key)
+        self.thumbnail_ready.emit()
 
-    def leaveEvent(self, event):
-        super().leaveEvent(event)
-        self.tip.emit("")
 
-class WatchesView(QScrollArea):
+class WatchesView(QWidget):
+    """My Watches 圖庫：QListView + 自繪卡片，只有可見的卡片會被繪製與載入縮圖"""
+
     summon_view=pyqtSignal(object)
+
+    GRID_SIZE = QSize(160, 220)  # 卡片 140x200 + 間距 20
+
     def __init__(self,parent=None,signal=None,scrapbook=None):
         super().__init__(parent)
         self.tip=signal
         self.setObjectName("myWatchesContainer")
-        self.setWidgetResizable(True)
         self.setMinimumWidth(180)
-        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.scrapbook=scrapbook
         self.set_ui()
 
     def set_ui(self):
-        # 創建內部容器 widget
-        self.container = QWidget()
-        self.container.setObjectName("watchesGridWidget")
-        self.setWidget(self.container)
-
-        container_layout = QVBoxLayout(self.container)
+        container_layout = QVBoxLayout(self)
         container_layout.setContentsMargins(20, 20, 20, 20)
         container_layout.setSpacing(15)
-        container_layout.setAlignment(Qt.AlignTop)
 
         title_layout=QHBoxLayout()
         container_layout.addLayout(title_layout)
@@ -104,63 +215,82 @@ class WatchesView(QScrollArea):
         title_label = QLabel("my watches")
         title_label.setObjectName("myWatchesTitle")
         title_layout.addWidget(title_label)
+        title_layout.addStretch()
+
+        # 即時搜尋
+        self.search_input = QLineEdit()
+        self.search_input.setObjectName("watchSearch")
+        self.search_input.setPlaceholderText("Search")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setFixedWidth(200)
+        title_layout.addWidget(self.search_input)
+
         #sort
+        self.sort_combo = QComboBox()
+        self.sort_combo.setObjectName("watchSort")
+        self.sort_combo.addItems(list(WatchFilterModel.SORT_MODES))
+        title_layout.addWidget(self.sort_combo)
 
-        # 創建卡片容器 widget
+        # 模型 / 檢視
+        self.model = WatchListModel(self)
+        self.proxy = WatchFilterModel(self)
+        self.proxy.setSourceModel(self.model)
 
-        self.cards_content = FlowLayout()
-        self.cards_content.setObjectName("cardsContainer")
-        self.cards_content.setContentsMargins(20,10,20,10)
-        self.cards_content.setSpacing(20)
-        container_layout.addLayout(self.cards_content)
+        self.delegate = WatchCardDelegate(self)
 
-        # 儲存手錶列表（目前為空）
-        self.watches_list = []
+        self.cards_view = QListView()
+        self.cards_view.setObjectName("cardsContainer")
+        self.cards_view.setViewMode(QListView.IconMode)
+        self.cards_view.setMovement(QListView.Static)
+        self.cards_view.setResizeMode(QListView.Adjust)
+        self.cards_view.setUniformItemSizes(True)
+        self.cards_view.setLayoutMode(QListView.Batched)
+        self.cards_view.setBatchSize(200)
+        self.cards_view.setGridSize(self.GRID_SIZE)
+        self.cards_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.cards_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.cards_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.cards_view.setMouseTracking(True)
+        self.cards_view.setModel(self.proxy)
+        self.cards_view.setItemDelegate(self.delegate)
+        container_layout.addWidget(self.cards_view)
 
-        # 添加 "Add New Watch" 按鈕作為第一個卡片
-        self.create_add_watch_card()
-        self.setStyleSheet(load_style())
+        self.search_input.textChanged.connect(self.proxy.setFilterFixedString)
+        self.sort_combo.currentTextChanged.connect(self.proxy.set_sort_mode)
+        self.delegate.thumbnail_ready.connect(self.cards_view.viewport().update)
+        self.cards_view.clicked.connect(self._on_card_clicked)
+        self.cards_view.entered.connect(self._on_card_entered)
+        self.cards_view.viewport().installEventFilter(self)
 
-    def create_add_watch_card(self):
-        """創建 'Add New Watch' 卡片（第一個卡片）"""
-        # 卡片容器
-        add_card = QFrame()
-        add_card.setObjectName("card")
-        add_card.setFrameShape(QFrame.StyledPanel)
-        add_card.setFixedSize(140, 200)
-        add_card.setCursor(Qt.PointingHandCursor)
+        self.setStyleSheet(load_style())
 
-        card_layout = QVBoxLayout(add_card)
-        card_layout.setContentsMargins(5, 5, 5, 5)
-        card_layout.setSpacing(5)
+    def add_watch(self,img,name,watchface="",modified=None):
+        """添加新的手錶卡片"""
+        watch = WatchInfo(name, img or "", watchface)
+        if modified is not None:
+            watch.modified = modified
+        self.model.add_watches([watch])
+        return watch
 
-        # 圖片區域
-        image_label = QLabel()
-        image_label.setObjectName("addWatchImage")
-        image_label.setFixedSize(130, 160)
-        image_label.setAlignment(Qt.AlignCenter)
-
-        # 載入添加按鈕圖片
-        pixmap = QPixmap("img/my_watches/btn_new_watch.png")
-        pixmap = pixmap.scaled(80,80)
-        if not pixmap.isNull():
-            image_label.setPixmap(pixmap)
-        else:
-            # 如果圖片不存在，顯示文字
-            image_label.setText("+")
-            image_label.setStyleSheet("background-color: #3d3d3d; color: #0078D4; font-size: 48px;")
-        card_layout.addWidget(image_label)
+    def add_watches(self, watches):
+        """一次加入多個 WatchInfo（大量載入時使用）"""
+        self.model.add_watches(list(watches))
 
-        text_label=QLabel()
-        text_label.setText("add new watch")
-        text_label.setObjectName("addWatchText")
-        card_layout.addWidget(text_label)
+    @property
+    def watches_list(self):
+        return self.model.watches()
 
-        add_card.mousePressEvent=lambda event:self.summon_view.emit(add_card)
+    def _on_card_clicked(self, index):
+        watch = index.data(WatchListModel.WatchRole)
+        if watch is not None:
+            self.summon_view.emit(watch)
 
-        self.cards_content.addWidget(add_card)
+    def _on_card_entered(self, index):
+        watch = index.data(WatchListModel.WatchRole)
+        if self.tip and watch is not None:
+            self.tip.emit("" if watch.is_add_card else "Right-click to display menu.")
 
-    def add_watch(self,img,name):
-        """添加新的手錶卡片"""
-        new_card=WatchCard(img,name,parent=None,signal=[self.tip,self.summon_view],scrapbook=self.scrapbook)
-        self.watches_list.append(new_card)
+    def eventFilter(self, obj, event):
+        if obj is self.cards_view.viewport() and event.type() == QEvent.Leave and self.tip:
+            self.tip.emit("")
+        return super().eventFilter(obj, event)
@@ -13,6 +13,12 @@ from PyQt5.QtGui import QColor, QFont, QFontMetrics, QKeySequence
 from PyQt5.Qsci import QsciScintilla, QsciLexerLua, QsciAPIs
 
 from lua_syntax_checker import LuaSyntaxChecker, LuaSyntaxError, ErrorSeverity
+from lua_check_service import LuaCheckService
+from lua_api import (WATCHMAKER_API, WATCHMAKER_ACTIONS, EASING_FUNCTIONS, WATCHMAKER_TAGS,
+                     LUA_STANDARD_NAMES, API_KEYWORDS, SORTED_TAG_DISPLAYS)
+from lua_completion import API_COMPLETION, complete_from
+from lua_formatter import format_lines
+from lua_symbols import SymbolIndex
 
 
 def load_style():
@@ -26,489 +32,6 @@ def load_style():
         return ""
 
 
-# WatchMaker Lua API 定義
-WATCHMAKER_API = {
-    # 核心函數
-    'wm_schedule': {
-        'signature': "wm_schedule(config)",
-        'description': "Manage animations and timed events. config is a table containing action, tween, from, to, duration, easing properties.",
-        'example': "wm_schedule { action='tween', tween='rotation', from=0, to=360, duration=1, easing='outQuad' }"
-    },
-    'wm_unschedule_all': {
-        'signature': "wm_unschedule_all()",
-        'description': "Cancel all scheduled animations or events.",
-        'example': "wm_unschedule_all()"
-    },
-    'wm_action': {
-        'signature': "wm_action(action_name)",
-        'description': "Execute various watch control actions like media playback, volume, weather update, etc.",
-        'example': "wm_action('media_play_pause')"
-    },
-    'wm_tag': {
-        'signature': "wm_tag(tag_name)",
-        'description': "Return the dynamic value of a WatchMaker tag.",
-        'example': "local hour = wm_tag('{dh}')"
-    },
-    'wm_vibrate': {
-        'signature': "wm_vibrate(duration, repeat)",
-        'description': "Trigger haptic feedback. duration in milliseconds, repeat is the repeat count.",
-        'example': "wm_vibrate(100, 2)"
-    },
-    'wm_sfx': {
-        'signature': "wm_sfx(filename)",
-        'description': "Play an MP3 file from the sfx folder.",
-        'example': "wm_sfx('click.mp3')"
-    },
-    'wm_transition': {
-        'signature': "wm_transition(effect)",
-        'description': "Execute screen transition effects.",
-        'example': "wm_transition('fade')"
-    },
-    'wm_anim_set': {
-        'signature': "wm_anim_set(layer, property, value)",
-        'description': "Configure animation properties for a layer.",
-        'example': "wm_anim_set('layer1', 'opacity', 0.5)"
-    },
-    'wm_anim_start': {
-        'signature': "wm_anim_start(layer)",
-        'description': "Start animation on the specified layer.",
-        'example': "wm_anim_start('layer1')"
-    },
-
-    # Callback Functions
-    'on_hour': {
-        'signature': "function on_hour(h)",
-        'description': "Executes every hour. h is the current hour (0-23).",
-        'example': "function on_hour(h)\n  print('Hour: ' .. h)\nend"
-    },
-    'on_minute': {
-        'signature': "function on_minute(h, m)",
-        'description': "Executes every minute. h is hour, m is minute.",
-        'example': "function on_minute(h, m)\n  print(h .. ':' .. m)\nend"
-    },
-    'on_second': {
-        'signature': "function on_second(h, m, s)",
-        'description': "Executes every second. h is hour, m is minute, s is second.",
-        'example': "function on_second(h, m, s)\n  var_s_time = h * 3600 + m * 60 + s\nend"
-    },
-    'on_millisecond': {
-        'signature': "function on_millisecond(dt)",
-        'description': "Executes every millisecond. dt is delta time in ms. Use var_ms_ prefix for variables.",
-        'example': "function on_millisecond(dt)\n  var_ms_counter = var_ms_counter + dt\nend"
-    },
-    'on_display_bright': {
-        'signature': "function on_display_bright()",
-        'description': "Executes when the watch screen turns on (becomes bright).",
-        'example': "function on_display_bright()\n  wm_anim_start('intro')\nend"
-    },
-    'on_display_not_bright': {
-        'signature': "function on_display_not_bright()",
-        'description': "Executes when the watch screen turns off (becomes dim).",
-        'example': "function on_display_not_bright()\n  wm_unschedule_all()\nend"
-    },
-
-    # Variables
-    'is_bright': {
-        'signature': "is_bright",
-        'description': "Boolean value indicating whether the screen is currently bright.",
-        'example': "if is_bright then\n  -- screen is on\nend"
-    },
-}
-
-# WatchMaker 動作列表
-WATCHMAKER_ACTIONS = [
-    'media_play_pause', 'media_next', 'media_prev', 'media_stop',
-    'sw_start_stop', 'sw_reset', 'sw_lap',
-    'vol_up', 'vol_down', 'vol_mute',
-    'm_update_weather', 'm_task:',
-    'flashlight_on', 'flashlight_off',
-    'alarm', 'timer', 'stopwatch',
-]
-
-# Easing 函數列表
-EASING_FUNCTIONS = [
-    'linear',
-    'inQuad', 'outQuad', 'inOutQuad',
-    'inCubic', 'outCubic', 'inOutCubic',
-    'inQuart', 'outQuart', 'inOutQuart',
-    'inQuint', 'outQuint', 'inOutQuint',
-    'inSine', 'outSine', 'inOutSine',
-    'inExpo', 'outExpo', 'inOutExpo',
-    'inCirc', 'outCirc', 'inOutCirc',
-    'inElastic', 'outElastic', 'inOutElastic',
-    'inBack', 'outBack', 'inOutBack',
-    'inBounce', 'outBounce', 'inOutBounce',
-]
-
-# WatchMaker 標籤系統（從 TAG_REFERENCE.md 擷取）
-# 格式: "Description:{tag}": "{tag}" (空格以底線替代)
-WATCHMAKER_TAGS = {
-    # Date / 日期
-    "Day_in_month:{dd}": "{dd}",
-    "Day_in_month_with_leading_zero:{ddz}": "{ddz}",
-    "Day_in_year:{ddy}": "{ddy}",
-    "Day_of_week_format_1:{ddw1}": "{ddw1}",
-    "Day_of_week_format_2:{ddw2}": "{ddw2}",
-    "Day_of_week:{ddw}": "{ddw}",
-    "Day_of_week_full:{ddww}": "{ddww}",
-    "Day_of_week_next_format_1:{ddw1_1}": "{ddw1_1}",
-    "Day_of_week_next_format_2:{ddw2_1}": "{ddw2_1}",
-    "Day_of_week_next:{ddw_1}": "{ddw_1}",
-    "Day_of_week_next_full:{ddww_1}": "{ddww_1}",
-    "Day_of_week_Sun=0_Sat=6:{ddw0}": "{ddw0}",
-    "Days_in_current_month:{ddim}": "{ddim}",
-    "Month_in_year:{dn}": "{dn}",
-    "Month_short:{dnn}": "{dnn}",
-    "Month_medium:{dnnn}": "{dnnn}",
-    "Month_full:{dnnnn}": "{dnnnn}",
-    "Year_2_digits:{dy}": "{dy}",
-    "Year_4_digits:{dyy}": "{dyy}",
-    "Week_in_month:{dwm}": "{dwm}",
-    "Week_in_year:{dw}": "{dw}",
-
-    # Time (12-Hour) / 時間（12小時制）
-    "Hour_1-12:{dh}": "{dh}",
-    "Hour_0-11:{dh11}": "{dh11}",
-    "Hour_1-12_with_leading_zero:{dhz}": "{dhz}",
-    "Hour_0-11_with_leading_zero:{dh11z}": "{dh11z}",
-    "Hour_text_1-12:{dht}": "{dht}",
-    "Hour_tens_1-12:{dhtt}": "{dhtt}",
-    "Hour_ones_1-12:{dhto}": "{dhto}",
-    "Hour_tens_0-11:{dh11tt}": "{dh11tt}",
-    "Hour_ones_0-11:{dh11to}": "{dh11to}",
-    "Hour_UTC_12hr:{dhutc12}": "{dhutc12}",
-    "Hour_UTC_12hr_with_leading_zero:{dhutc12z}": "{dhutc12z}",
-    "AM/PM:{da}": "{da}",
-
-    # Time (24-Hour) / 時間（24小時制）
-    "Hour_1-24:{dh24}": "{dh24}",
-    "Hour_0-23:{dh23}": "{dh23}",
-    "Hour_1-24_with_leading_zero:{dh24z}": "{dh24z}",
-    "Hour_0-23_with_leading_zero:{dh23z}": "{dh23z}",
-    "Hour_text_1-24:{dh24t}": "{dh24t}",
-    "Hour_tens_1-24:{dh24tt}": "{dh24tt}",
-    "Hour_ones_1-24:{dh24to}": "{dh24to}",
-    "Hour_tens_0-23:{dh23tt}": "{dh23tt}",
-    "Hour_ones_0-23:{dh23to}": "{dh23to}",
-    "Hour_UTC_24hr:{dhutc24}": "{dhutc24}",
-    "Hour_UTC_24hr_with_leading_zero:{dhutc24z}": "{dhutc24z}",
-    "UTC_Offset:{dutcoff}": "{dutcoff}",
-
-    # Minutes / 分鐘
-    "Minute_in_hour:{dm}": "{dm}",
-    "Minute_with_leading_zero:{dmz}": "{dmz}",
-    "Minute_tens:{dmt}": "{dmt}",
-    "Minute_ones:{dmo}": "{dmo}",
-    "Minute_text_all:{dmat}": "{dmat}",
-    "Minute_text_tens:{dmtt}": "{dmtt}",
-    "Minute_text_ones:{dmot}": "{dmot}",
-
-    # Seconds & Milliseconds / 秒與毫秒
-    "Second_in_minute:{ds}": "{ds}",
-    "Second_with_leading_zero:{dsz}": "{dsz}",
-    "Second_tens:{dst}": "{dst}",
-    "Second_ones:{dso}": "{dso}",
-    "Second_text_all:{dsat}": "{dsat}",
-    "Second_text_tens:{dstt}": "{dstt}",
-    "Second_text_ones:{dsot}": "{dsot}",
-    "Milliseconds:{dss}": "{dss}",
-    "Milliseconds_with_leading_zeros:{dssz}": "{dssz}",
-    "Seconds_*_1000_+_milliseconds:{dsps}": "{dsps}",
-    "Seconds_since_epoch:{depoch}": "{depoch}",
-    "Time_percent_24_hours:{dtp}": "{dtp}",
-    "Timezone:{dz}": "{dz}",
-
-    # Rotation Values / 旋轉值
-    "Hour_hand_rotation_12h:{drh}": "{drh}",
-    "Hour_hand_rotation_24h:{drh24}": "{drh24}",
-    "Hour_hand_rotation_12h_no_adjust:{drh0}": "{drh0}",
-    "Minute_hand_rotation:{drm}": "{drm}",
-    "Second_hand_rotation:{drs}": "{drs}",
-    "Second_hand_smooth_rotation:{drss}": "{drss}",
-    "Milliseconds_rotation:{drms}": "{drms}",
-
-    # Time Zone 1 / 時區1
-    "Time_Zone_1_Location:{tz1l}": "{tz1l}",
-    "Time_Zone_1_Location_Long:{tz1ll}": "{tz1ll}",
-    "Time_Zone_1_UTC_Offset:{tz1o}": "{tz1o}",
-    "Time_Zone_1_UTC_Offset_Mins:{tz1om}": "{tz1om}",
-    "Time_Zone_1_Daylight_Savings:{tz1dst}": "{tz1dst}",
-    "Time_Zone_1_Time:{tz1t}": "{tz1t}",
-    "Time_Zone_1_Rotation_hour:{tz1rh}": "{tz1rh}",
-    "Time_Zone_1_Rotation_hour_24h:{tz1rh24}": "{tz1rh24}",
-    "Time_Zone_1_Rotation_minute:{tz1rm}": "{tz1rm}",
-
-    # Time Zone 2 / 時區2
-    "Time_Zone_2_Location:{tz2l}": "{tz2l}",
-    "Time_Zone_2_Location_Long:{tz2ll}": "{tz2ll}",
-    "Time_Zone_2_UTC_Offset:{tz2o}": "{tz2o}",
-    "Time_Zone_2_UTC_Offset_Mins:{tz2om}": "{tz2om}",
-    "Time_Zone_2_Daylight_Savings:{tz2dst}": "{tz2dst}",
-    "Time_Zone_2_Time:{tz2t}": "{tz2t}",
-    "Time_Zone_2_Rotation_hour:{tz2rh}": "{tz2rh}",
-    "Time_Zone_2_Rotation_hour_24h:{tz2rh24}": "{tz2rh24}",
-    "Time_Zone_2_Rotation_minute:{tz2rm}": "{tz2rm}",
-
-    # Time Zone 3 / 時區3
-    "Time_Zone_3_Location:{tz3l}": "{tz3l}",
-    "Time_Zone_3_Location_Long:{tz3ll}": "{tz3ll}",
-    "Time_Zone_3_UTC_Offset:{tz3o}": "{tz3o}",
-    "Time_Zone_3_UTC_Offset_Mins:{tz3om}": "{tz3om}",
-    "Time_Zone_3_Daylight_Savings:{tz3dst}": "{tz3dst}",
-    "Time_Zone_3_Time:{tz3t}": "{tz3t}",
-    "Time_Zone_3_Rotation_hour:{tz3rh}": "{tz3rh}",
-    "Time_Zone_3_Rotation_hour_24h:{tz3rh24}": "{tz3rh24}",
-    "Time_Zone_3_Rotation_minute:{tz3rm}": "{tz3rm}",
-
-    # Color Switcher / 顏色切換器
-    "Current_Color:{ucolor}": "{ucolor}",
-    "Current_Color_Brighter:{ucolor_b}": "{ucolor_b}",
-
-    # Counter / 計數器
-    "Seconds_elapsed_since_loaded:{c_elapsed}": "{c_elapsed}",
-    "0_to_100_in_2s_stop:{c_0_100_2_st}": "{c_0_100_2_st}",
-    "0_to_100_in_2s_repeat:{c_0_100_2_rp}": "{c_0_100_2_rp}",
-    "0_to_100_in_2s_reverse:{c_0_100_2_rv}": "{c_0_100_2_rv}",
-    "0_to_100_in_2s_reverse_delay:{c_0_100_2_rv_2}": "{c_0_100_2_rv_2}",
-
-    # Watch Battery / 手錶電池
-    "Battery_level:{bl}": "{bl}",
-    "Battery_level_percent:{blp}": "{blp}",
-    "Battery_rotation:{br}": "{br}",
-    "Battery_temperature_C:{btc}": "{btc}",
-    "Battery_temperature_F:{btf}": "{btf}",
-    "Battery_temperature_C_percent:{btcd}": "{btcd}",
-    "Battery_temperature_F_percent:{btfd}": "{btfd}",
-    "Battery_charging:{bc}": "{bc}",
-
-    # Phone Battery / 手機電池
-    "Phone_Battery_level:{pbl}": "{pbl}",
-    "Phone_Battery_level_percent:{pblp}": "{pblp}",
-    "Phone_Battery_rotation:{pbr}": "{pbr}",
-    "Phone_Battery_temperature_C:{pbtc}": "{pbtc}",
-    "Phone_Battery_temperature_F:{pbtf}": "{pbtf}",
-    "Phone_Battery_temperature_C_percent:{pbtcd}": "{pbtcd}",
-    "Phone_Battery_temperature_F_percent:{pbtfd}": "{pbtfd}",
-    "Phone_Battery_charging:{pbc}": "{pbc}",
-
-    # System / 系統
-    "Operating_System:{aos}": "{aos}",
-    "OS_Version:{aosv}": "{aosv}",
-    "Language_Code:{alangcode}": "{alangcode}",
-    "Language_Region:{alangreg}": "{alangreg}",
-    "Language_Full:{alangfull}": "{alangfull}",
-    "Device_name:{aname}": "{aname}",
-    "Device_model:{amodel}": "{amodel}",
-    "Device_manufacturer:{aman}": "{aman}",
-    "System_Volume:{avol}": "{avol}",
-    "Screen_Brightness:{abrt}": "{abrt}",
-    "Low_Power_Mode:{alowpw}": "{alowpw}",
-    "Bluetooth_Enabled:{abtc}": "{abtc}",
-    "Watch_name:{awname}": "{awname}",
-    "Is_round:{around}": "{around}",
-    "Has_flat_tyre:{atyre}": "{atyre}",
-    "Is_bright:{abright}": "{abright}",
-    "Dim_mode_lo-bit_only:{adimlo}": "{adimlo}",
-    "Milliseconds_since_bright:{abss}": "{abss}",
-    "Seconds_since_bright_capped_30:{abssl}": "{abssl}",
-    "Is_dark_mode:{adark}": "{adark}",
-    "Last_Reboot_Time:{areboot}": "{areboot}",
-
-    # Memory / 記憶體
-    "Used_Memory:{amu}": "{amu}",
-    "Used_Memory_Formatted:{amuf}": "{amuf}",
-    "Used_Memory_Percentage:{amup}": "{amup}",
-    "Free_Memory:{amf}": "{amf}",
-    "Free_Memory_Formatted:{amff}": "{amff}",
-    "Free_Memory_Percentage:{amfp}": "{amfp}",
-    "Total_Memory:{amt}": "{amt}",
-    "Total_Memory_Formatted:{amtf}": "{amtf}",
-
-    # Disk Space / 磁碟空間
-    "Used_Disk_Space:{adsu}": "{adsu}",
-    "Used_Disk_Space_Formatted:{adsuf}": "{adsuf}",
-    "Used_Disk_Space_Percentage:{adsup}": "{adsup}",
-    "Free_Disk_Space:{adsf}": "{adsf}",
-    "Free_Disk_Space_Formatted:{adsff}": "{adsff}",
-    "Free_Disk_Space_Percentage:{adsfp}": "{adsfp}",
-    "Total_Disk_Space:{adst}": "{adst}",
-    "Total_Disk_Space_Formatted:{adstf}": "{adstf}",
-
-    # Location / 位置
-    "Current_latitude:{alat}": "{alat}",
-    "Current_longitude:{alon}": "{alon}",
-    "Current_latitude_degrees:{alatd}": "{alatd}",
-    "Current_longitude_degrees:{alond}": "{alond}",
-    "Current_latitude_degrees_direction:{alatdd}": "{alatdd}",
-    "Current_longitude_degrees_direction:{alondd}": "{alondd}",
-    "Current_altitude:{aalt}": "{aalt}",
-    "what3words_address:{aw3w}": "{aw3w}",
-    "what3words_Word_1:{aw3w1}": "{aw3w1}",
-    "what3words_Word_2:{aw3w2}": "{aw3w2}",
-    "what3words_Word_3:{aw3w3}": "{aw3w3}",
-
-    # Network / 網路
-    "Device_Online:{nc}": "{nc}",
-    "Cellular_Connected:{ncc}": "{ncc}",
-    "WiFi_Strength_percent:{pws}": "{pws}",
-    "WiFi_Connected:{pwc}": "{pwc}",
-    "WiFi_IP_Address:{nwip}": "{nwip}",
-
-    # Stopwatch / 碼錶
-    "Stopwatch_hours:{swh}": "{swh}",
-    "Stopwatch_minutes:{swm}": "{swm}",
-    "Stopwatch_seconds:{sws}": "{sws}",
-    "Stopwatch_milliseconds_2_digits:{swss}": "{swss}",
-    "Stopwatch_milliseconds_3_digits:{swsss}": "{swsss}",
-    "Stopwatch_milliseconds_total:{swsst}": "{swsst}",
-    "Stopwatch_is_running:{swr}": "{swr}",
-    "Stopwatch_minute_rotation:{swrm}": "{swrm}",
-    "Stopwatch_second_rotation:{swrs}": "{swrs}",
-    "Stopwatch_millisecond_rotation:{swrss}": "{swrss}",
-
-    # Weather - Current / 天氣 - 當前
-    "Weather_Location:{wl}": "{wl}",
-    "Current_Temperature:{wt}": "{wt}",
-    "Today_High:{wth}": "{wth}",
-    "Today_Low:{wtl}": "{wtl}",
-    "Current_Temperature_degrees:{wtd}": "{wtd}",
-    "Today_High_degrees:{wthd}": "{wthd}",
-    "Today_Low_degrees:{wtld}": "{wtld}",
-    "Weather_Units:{wm}": "{wm}",
-    "Current_Condition_Text:{wct}": "{wct}",
-    "Current_Condition_Icon:{wci}": "{wci}",
-    "Current_Humidity_Number:{wh}": "{wh}",
-    "Current_Humidity_Percentage:{whp}": "{whp}",
-    "Atmospheric_Pressure:{wp}": "{wp}",
-    "Wind_Speed_mph:{wws}": "{wws}",
-    "Wind_Direction_degrees:{wwd}": "{wwd}",
-    "Wind_Direction_NE:{wwdb}": "{wwdb}",
-    "Wind_Direction_NNE:{wwdbb}": "{wwdbb}",
-    "Cloudiness_percent:{wcl}": "{wcl}",
-    "Rain_volume_3hrs_mm:{wr}": "{wr}",
-    "Is_daytime:{wisday}": "{wisday}",
-    "Sunrise_time:{wsr}": "{wsr}",
-    "Sunset_time:{wss}": "{wss}",
-    "Sunrise_percent_24hrs:{wsrp}": "{wsrp}",
-    "Sunset_percent_24hrs:{wssp}": "{wssp}",
-    "Moon_Phase:{wmp}": "{wmp}",
-    "Weather_manual_location:{wml}": "{wml}",
-    "Weather_last_update:{wlu}": "{wlu}",
-
-    # Weather - Hourly Forecast / 天氣 - 每小時預報
-    "Forecast_Hour_1_Temp:{wf1ht}": "{wf1ht}",
-    "Forecast_Hour_1_Hour:{wf1hh}": "{wf1hh}",
-    "Forecast_Hour_1_Condition_Text:{wf1hct}": "{wf1hct}",
-    "Forecast_Hour_1_Condition_Icon:{wf1hci}": "{wf1hci}",
-    "Forecast_Hour_2_Temp:{wf2ht}": "{wf2ht}",
-    "Forecast_Hour_2_Hour:{wf2hh}": "{wf2hh}",
-    "Forecast_Hour_2_Condition_Text:{wf2hct}": "{wf2hct}",
-    "Forecast_Hour_2_Condition_Icon:{wf2hci}": "{wf2hci}",
-
-    # Weather - Daily Forecast / 天氣 - 每日預報
-    "Forecast_Day_0_Temp:{wf0dt}": "{wf0dt}",
-    "Forecast_Day_0_High:{wf0dth}": "{wf0dth}",
-    "Forecast_Day_0_Low:{wf0dtl}": "{wf0dtl}",
-    "Forecast_Day_0_Condition_Text:{wf0dct}": "{wf0dct}",
-    "Forecast_Day_0_Condition_Icon:{wf0dci}": "{wf0dci}",
-    "Forecast_Day_1_Temp:{wf1dt}": "{wf1dt}",
-    "Forecast_Day_1_High:{wf1dth}": "{wf1dth}",
-    "Forecast_Day_1_Low:{wf1dtl}": "{wf1dtl}",
-    "Forecast_Day_1_Condition_Text:{wf1dct}": "{wf1dct}",
-    "Forecast_Day_1_Condition_Icon:{wf1dci}": "{wf1dci}",
-
-    # Calendar / 日曆
-    "Events_Exist:{cex}": "{cex}",
-    "Event_1_Exists:{c1ex}": "{c1ex}",
-    "Event_1_Text:{c1t}": "{c1t}",
-    "Event_1_Begin_Date:{c1bd}": "{c1bd}",
-    "Event_1_Begin_Time:{c1b}": "{c1b}",
-    "Event_1_Begin_Rotation:{c1br}": "{c1br}",
-    "Event_1_Begin_percent_24hrs:{c1bp}": "{c1bp}",
-    "Event_1_End_Date:{c1ed}": "{c1ed}",
-    "Event_1_End_Time:{c1e}": "{c1e}",
-    "Event_1_End_Rotation:{c1er}": "{c1er}",
-    "Event_1_End_percent_24hrs:{c1ep}": "{c1ep}",
-    "Event_1_Location:{c1l}": "{c1l}",
-    "Event_1_Color:{c1c}": "{c1c}",
-    "Event_1_is_All_Day:{c1ad}": "{c1ad}",
-    "Event_1_Calendar:{c1cal}": "{c1cal}",
-    "Event_1_ID:{c1i}": "{c1i}",
-
-    # Health & Fitness - Steps / 健康與健身 - 步數
-    "Steps:{ssc}": "{ssc}",
-    "Steps_Goal:{stsc}": "{stsc}",
-    "Steps_percent_of_Goal:{sscp}": "{sscp}",
-    "Distance_Units:{sdstu}": "{sdstu}",
-    "Distance:{sdst}": "{sdst}",
-    "Distance_Goal:{stdst}": "{stdst}",
-    "Distance_percent_of_Goal:{sdstp}": "{sdstp}",
-    "Calories_kCal:{scal}": "{scal}",
-    "Calories_Goal_kCal:{stcal}": "{stcal}",
-    "Calories_percent_of_Goal:{scalp}": "{scalp}",
-
-    # Health & Fitness - Activity Rings / 健康與健身 - 活動圓環
-    "Move_kCal:{ham}": "{ham}",
-    "Move_Goal_kCal:{htam}": "{htam}",
-    "Exercise_mins:{hae}": "{hae}",
-    "Exercise_Goal_mins:{htae}": "{htae}",
-    "Stand_hrs:{has}": "{has}",
-    "Stand_Goal_hrs:{htas}": "{htas}",
-    "Flights_Climbed:{hfc}": "{hfc}",
-
-    # Health & Fitness - Heart Rate / 健康與健身 - 心率
-    "Heart_Rate:{shr}": "{shr}",
-    "Heart_Rate_Maximum:{sthr}": "{sthr}",
-    "Heart_Rate_percent_of_Maximum:{shrp}": "{shrp}",
-    "Heart_Rate_Previous:{shr_1}": "{shr_1}",
-    "Heart_Rate_Previous_2:{shr_2}": "{shr_2}",
-
-    # Sensors - Accelerometer / 感測器 - 加速度計
-    "Accelerometer_X:{sax}": "{sax}",
-    "Accelerometer_Y:{say}": "{say}",
-    "Accelerometer_Z:{saz}": "{saz}",
-
-    # Sensors - Gyroscope / 感測器 - 陀螺儀
-    "Gyroscope_X:{sgx}": "{sgx}",
-    "Gyroscope_Y:{sgy}": "{sgy}",
-    "Gyroscope_Z:{sgz}": "{sgz}",
-
-    # Sensors - Compass / 感測器 - 指南針
-    "Compass_for_Rotation:{scr}": "{scr}",
-    "Compass_Display:{sct}": "{sct}",
-    "Compass_Display_degrees:{sctd}": "{sctd}",
-    "Compass_Bearing_NE:{scb}": "{scb}",
-    "Compass_Bearing_NNE:{scbb}": "{scbb}",
-    "Compass_Display_degrees_NE:{sctdb}": "{sctdb}",
-    "Compass_Display_degrees_NNE:{sctdbb}": "{sctdbb}",
-
-    # Sensors - Other / 感測器 - 其他
-    "Barometric_Pressure:{sprs}": "{sprs}",
-
-    # Complications / 複雜功能
-    "Complication_1_Text:{m1text}": "{m1text}",
-    "Complication_1_Title:{m1title}": "{m1title}",
-    "Complication_1_Value:{m1value}": "{m1value}",
-    "Complication_1_Min:{m1min}": "{m1min}",
-    "Complication_1_Max:{m1max}": "{m1max}",
-    "Complication_2_Text:{m2text}": "{m2text}",
-    "Complication_2_Title:{m2title}": "{m2title}",
-    "Complication_2_Value:{m2value}": "{m2value}",
-    "Complication_2_Min:{m2min}": "{m2min}",
-    "Complication_2_Max:{m2max}": "{m2max}",
-    "Complication_3_Text:{m3text}": "{m3text}",
-    "Complication_3_Title:{m3title}": "{m3title}",
-    "Complication_3_Value:{m3value}": "{m3value}",
-    "Complication_3_Min:{m3min}": "{m3min}",
-    "Complication_3_Max:{m3max}": "{m3max}",
-    "Complication_4_Text:{m4text}": "{m4text}",
-    "Complication_4_Title:{m4title}": "{m4title}",
-    "Complication_4_Value:{m4value}": "{m4value}",
-    "Complication_4_Min:{m4min}": "{m4min}",
-    "Complication_4_Max:{m4max}": "{m4max}",
-}
-
-
 class LuaLexer(QsciLexerLua):
     """自定義 Lua 詞法分析器，支援深色主題"""
 
@@ -564,10 +87,16 @@ class LuaLexer(QsciLexerLua):
 class LuaEditor(QsciScintilla):
     """Lua 程式碼編輯器"""
 
+    # 腳本定義的符號有變動時發出
+    symbols_changed = pyqtSignal()
+
     # 用戶列表 ID
     TAG_LIST_ID = 1
     API_LIST_ID = 2
 
+    # 符號索引在停止輸入多久後更新 (ms)
+    SYMBOL_REFRESH_MS = 200
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
@@ -583,6 +112,13 @@ class LuaEditor(QsciScintilla):
         # 建立 API 關鍵字列表
         self._api_keywords = self._build_api_keywords()
 
+        # 目前腳本的符號索引：每次修改只標記受影響的行，稍後再重新讀取
+        self.symbol_index = SymbolIndex()
+        self._symbol_timer = QTimer(self)
+        self._symbol_timer.setSingleShot(True)
+        self._symbol_timer.timeout.connect(self.refresh_symbols)
+        self.SCN_MODIFIED.connect(self._on_modified)
+
         self.setup_editor()
         self.setup_lexer()
         self.setup_autocomplete()
@@ -646,20 +182,7 @@ class LuaEditor(QsciScintilla):
         self.apis = QsciAPIs(self.lexer)
 
         # 添加 Lua 標準函數
-        lua_keywords = [
-            'and', 'break', 'do', 'else', 'elseif', 'end', 'false',
-            'for', 'function', 'goto', 'if', 'in', 'local', 'nil',
-            'not', 'or', 'repeat', 'return', 'then', 'true', 'until', 'while',
-            'print', 'type', 'tonumber', 'tostring', 'pairs', 'ipairs',
-            'next', 'select', 'unpack', 'pcall', 'xpcall', 'error', 'assert',
-            'string.len', 'string.sub', 'string.find', 'string.format',
-            'string.lower', 'string.upper', 'string.rep', 'string.reverse',
-            'math.abs', 'math.ceil', 'math.floor', 'math.max', 'math.min',
-            'math.random', 'math.sin', 'math.cos', 'math.tan', 'math.sqrt',
-            'table.insert', 'table.remove', 'table.sort', 'table.concat',
-        ]
-
-        for keyword in lua_keywords:
+        for keyword in LUA_STANDARD_NAMES:
             self.apis.add(keyword)
 
         # 添加 WatchMaker API
@@ -703,6 +226,9 @@ class LuaEditor(QsciScintilla):
         # 自動完成列表顏色
         self.SendScintilla(QsciScintilla.SCI_AUTOCSETMAXHEIGHT, 10)  # 最多顯示 10 項
 
+        # 清單依相關度排序而非字母順序，避免 Scintilla 以二分搜尋選錯項目
+        self.SendScintilla(QsciScintilla.SCI_AUTOCSETORDER, QsciScintilla.SC_ORDER_CUSTOM)
+
     def _on_api_ready(self):
         """API 準備完成時的回調"""
         # API 準備完成，自動完成現在可用
@@ -714,7 +240,7 @@ class LuaEditor(QsciScintilla):
         self.tag_apis = QsciAPIs(self.lexer)
 
         # 添加所有 WatchMaker 標籤
-        for display_text in WATCHMAKER_TAGS.keys():
+        for display_text in SORTED_TAG_DISPLAYS:
             self.tag_apis.add(display_text)
 
         # 準備 API
@@ -766,27 +292,24 @@ class LuaEditor(QsciScintilla):
 
     def _build_api_keywords(self):
         """建立 API 關鍵字列表"""
-        keywords = []
-        # Lua 標準函數
-        keywords.extend([
-            'and', 'break', 'do', 'else', 'elseif', 'end', 'false',
-            'for', 'function', 'goto', 'if', 'in', 'local', 'nil',
-            'not', 'or', 'repeat', 'return', 'then', 'true', 'until', 'while',
-            'print', 'type', 'tonumber', 'tostring', 'pairs', 'ipairs',
-            'next', 'select', 'unpack', 'pcall', 'xpcall', 'error', 'assert',
-            'string.len', 'string.sub', 'string.find', 'string.format',
-            'string.lower', 'string.upper', 'string.rep', 'string.reverse',
-            'math.abs', 'math.ceil', 'math.floor', 'math.max', 'math.min',
-            'math.random', 'math.sin', 'math.cos', 'math.tan', 'math.sqrt',
-            'table.insert', 'table.remove', 'table.sort', 'table.concat',
-        ])
-        # WatchMaker API
-        keywords.extend(WATCHMAKER_API.keys())
-        # Easing 函數
-        keywords.extend(EASING_FUNCTIONS)
-        # 動作
-        keywords.extend(WATCHMAKER_ACTIONS)
-        return sorted(set(keywords))
+        return list(API_KEYWORDS)
+
+    def _on_modified(self, position, modification_type, text, length, lines_added, *args):
+        """Scintilla 修改通知：把插入/刪除告知符號索引"""
+        if not modification_type & (QsciScintilla.SC_MOD_INSERTTEXT | QsciScintilla.SC_MOD_DELETETEXT):
+            return
+        line = self.SendScintilla(QsciScintilla.SCI_LINEFROMPOSITION, position)
+        self.symbol_index.splice(line, lines_added)
+        self._symbol_timer.start(self.SYMBOL_REFRESH_MS)
+
+    def refresh_symbols(self):
+        """重新讀取被修改過的行"""
+        self._symbol_timer.stop()
+        if self.symbol_index.refresh(self._line_text):
+            self.symbols_changed.emit()
+
+    def _line_text(self, line):
+        return self.text(line).rstrip('\r\n')
 
     def _show_api_autocomplete(self):
         """顯示 API 自動完成選單"""
@@ -794,14 +317,20 @@ class LuaEditor(QsciScintilla):
         current_pos = self.SendScintilla(QsciScintilla.SCI_GETCURRENTPOS)
         word_start = self.SendScintilla(QsciScintilla.SCI_WORDSTARTPOSITION, current_pos, True)
 
-        # 取得已輸入的前綴
-        prefix = self.text()[word_start:current_pos].lower() if word_start < current_pos else ""
+        # 只讀取目前單字的範圍，不複製整份文件
+        prefix = self.text(word_start, current_pos) if word_start < current_pos else ""
+
+        # 補上尚未索引的修改，只處理髒行
+        if self.symbol_index.dirty:
+            self.refresh_symbols()
 
-        # 過濾符合前綴的關鍵字
+        # 前綴樹查詢 + 模糊排序（API 與腳本符號）
         if prefix:
-            filtered = [kw for kw in self._api_keywords if kw.lower().startswith(prefix)]
+            filtered = complete_from((API_COMPLETION, self.symbol_index.engine), prefix)
         else:
-            filtered = self._api_keywords
+            symbols = [name for name in self.symbol_index.engine.complete('', limit=None)
+                       if name not in API_COMPLETION]
+            filtered = self._api_keywords + symbols
 
         if not filtered:
             return
@@ -817,7 +346,7 @@ class LuaEditor(QsciScintilla):
     def _show_tag_autocomplete(self):
         """顯示標籤自動完成選單（使用用戶列表）"""
         # 構建標籤列表字串（以空格分隔，用於 showUserList）
-        tag_list = sorted(WATCHMAKER_TAGS.keys())
+        tag_list = list(SORTED_TAG_DISPLAYS)
 
         # 使用 showUserList 顯示標籤選單
         # 這會觸發 userListActivated 信號
@@ -928,6 +457,40 @@ class LuaEditor(QsciScintilla):
         self.SendScintilla(QsciScintilla.SCI_SETINDICATORCURRENT, 0)
         self.SendScintilla(QsciScintilla.SCI_INDICATORCLEARRANGE, 0, self.length())
 
+    def replace_lines(self, old_lines, new_lines):
+        """只替換有變動的行（每行只換掉不同的中段），整批為一個復原步驟
+
+        old_lines 必須是目前文字以 '\n' 分割的結果，且行數不變。
+        回傳變動的行數。
+        """
+        changed = 0
+        self.beginUndoAction()
+        try:
+            for line, (old, new) in enumerate(zip(old_lines, new_lines)):
+                if old == new:
+                    continue
+                changed += 1
+
+                # 共同前綴 / 後綴不動，游標與摺疊狀態因此保留
+                limit = min(len(old), len(new))
+                prefix = 0
+                while prefix < limit and old[prefix] == new[prefix]:
+                    prefix += 1
+                suffix = 0
+                while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+                    suffix += 1
+
+                # Scintilla 位置以 UTF-8 位元組計算
+                line_pos = self.SendScintilla(QsciScintilla.SCI_POSITIONFROMLINE, line)
+                start = line_pos + len(old[:prefix].encode('utf-8'))
+                end = line_pos + len(old[:len(old) - suffix].encode('utf-8'))
+                replacement = new[prefix:len(new) - suffix].encode('utf-8')
+                self.SendScintilla(QsciScintilla.SCI_SETTARGETRANGE, start, end)
+                self.SendScintilla(QsciScintilla.SCI_REPLACETARGET, len(replacement), replacement)
+        finally:
+            self.endUndoAction()
+        return changed
+
 
 class APIReferencePanel(QWidget):
     """API 參考面板"""
@@ -938,6 +501,7 @@ class APIReferencePanel(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName("apiReferencePanel")
+        self._symbols_row = None  # 腳本符號區段的起始列
         self.setup_ui()
 
     def setup_ui(self):
@@ -1000,6 +564,31 @@ class APIReferencePanel(QWidget):
                 item.setData(Qt.UserRole, func_name)
                 self.api_list.addItem(item)
 
+    def set_script_symbols(self, symbols):
+        """Show the (name, kind) symbols defined by the current script"""
+        self.api_list.setUpdatesEnabled(False)
+
+        # 移除舊的腳本符號區段
+        if self._symbols_row is not None:
+            while self.api_list.count() > self._symbols_row:
+                self.api_list.takeItem(self.api_list.count() - 1)
+            self._symbols_row = None
+
+        if symbols:
+            self._symbols_row = self.api_list.count()
+            category_item = QListWidgetItem("── Script Symbols ──")
+            category_item.setFlags(Qt.NoItemFlags)
+            self.api_list.addItem(category_item)
+
+            for name, kind in symbols:
+                item = QListWidgetItem(f"  {name}")
+                item.setData(Qt.UserRole, name)
+                item.setData(Qt.UserRole + 1, kind)
+                item.setToolTip(kind)
+                self.api_list.addItem(item)
+
+        self.api_list.setUpdatesEnabled(True)
+
     def on_item_clicked(self, item):
         """Show details when item is clicked"""
         func_name = item.data(Qt.UserRole)
@@ -1009,6 +598,9 @@ class APIReferencePanel(QWidget):
             detail_text += f"{api_info['description']}<br><br>"
             detail_text += f"<b>Example:</b><br><code>{api_info['example']}</code>"
             self.detail_label.setText(detail_text)
+        elif func_name:
+            kind = item.data(Qt.UserRole + 1)
+            self.detail_label.setText(f"<b>{func_name}</b><br><br>Script {kind}")
 
     def on_item_double_clicked(self, item):
         """Insert into editor when item is double-clicked"""
@@ -1108,12 +700,19 @@ class ScriptView(QWidget):
         self.property_name = ""
         self.original_value = ""
 
-        # Initialize syntax checker with WatchMaker API
-        self.syntax_checker = LuaSyntaxChecker(
+        # Syntax checking runs on the shared background service
+        self.check_service = LuaCheckService.instance(
             watchmaker_api=WATCHMAKER_API,
             watchmaker_actions=WATCHMAKER_ACTIONS,
             easing_functions=EASING_FUNCTIONS
         )
+        self.syntax_checker = self.check_service.checker
+        self.check_service.check_finished.connect(self._on_check_finished)
+
+        # 文件版本：每次編輯遞增，只套用與目前版本相符的檢查結果
+        self._doc_version = 0
+        self._shown_version = -1  # 已顯示標記的文件版本
+        self._report_success = False
 
         # Debounce timer for real-time checking
         self.check_timer = QTimer()
@@ -1285,6 +884,7 @@ class ScriptView(QWidget):
         """連接信號"""
         # API 面板雙擊插入
         self.api_panel.api_selected.connect(self.insert_api_template)
+        self.editor.symbols_changed.connect(self._on_symbols_changed)
 
         # 編輯器文字改變
         self.editor.textChanged.connect(self.on_text_changed)
@@ -1343,6 +943,12 @@ class ScriptView(QWidget):
         self.output_panel.clear_output()
         self.output_panel.log_info(f"Editing: {property_name}")
 
+        # Scripts checked before get their markers without waiting for a parse
+        cached = self.syntax_checker.cached_result(self.original_value)
+        if cached is not None:
+            self._display_errors(cached, show_success=False)
+            self._shown_version = self._doc_version
+
     def get_script(self):
         """Get script content"""
         return self.editor.text()
@@ -1356,6 +962,10 @@ class ScriptView(QWidget):
             self.editor.insert(template)
             self.editor.setFocus()
             self.output_panel.log_info(f"Inserted {func_name} template")
+        else:
+            # Script symbol: insert its name
+            self.editor.insert(func_name)
+            self.editor.setFocus()
 
     def check_syntax(self):
         """Check syntax using luaparser-based checker"""
@@ -1367,9 +977,22 @@ class ScriptView(QWidget):
             self.output_panel.log_warning("Code is empty")
             return
 
-        # Perform syntax check using LuaSyntaxChecker
-        errors = self.syntax_checker.check(code)
-        self._display_errors(errors, show_success=True)
+        # Perform syntax check on the background service
+        self._report_success = True
+        self.check_service.request_check(self, self._doc_version, code)
+
+    def _on_check_finished(self, owner, version, errors):
+        """Apply results posted back by the check service"""
+        if owner is not self or version != self._doc_version:
+            return  # Another editor's result, or the document changed since
+
+        show_success = self._report_success
+        self._report_success = False
+
+        self.editor.clear_markers()
+        self.editor.clear_error_highlights()
+        self._display_errors(errors, show_success=show_success)
+        self._shown_version = version
 
     def _display_errors(self, errors: list, show_success: bool = True):
         """Display errors in editor and output panel"""
@@ -1403,51 +1026,22 @@ class ScriptView(QWidget):
     def _delayed_syntax_check(self):
         """Perform syntax check after debounce delay"""
         code = self.editor.text()
-        if not code.strip() or len(code) > 10000:
-            return  # Skip for empty or very long code
-
-        self.editor.clear_markers()
-        self.editor.clear_error_highlights()
+        if not code.strip() or self._shown_version == self._doc_version:
+            return  # Skip for empty code or markers that are already current
 
-        errors = self.syntax_checker.check(code)
-        self._display_errors(errors, show_success=False)
+        self.check_service.request_check(self, self._doc_version, code)
 
     def format_code(self):
-        """Format code (basic indentation)"""
+        """Format code (indentation from the token stream, only changed lines are edited)"""
         code = self.editor.text()
         if not code.strip():
             return
 
-        formatted_lines = []
-        indent_level = 0
-        indent_str = "  "  # Two spaces
-
-        increase_indent = {'function', 'if', 'for', 'while', 'do', 'repeat', 'else', 'elseif'}
-        decrease_indent = {'end', 'until', 'else', 'elseif'}
-
-        for line in code.split('\n'):
-            stripped = line.strip()
-
-            # Check if indent should decrease
-            first_word = stripped.split()[0] if stripped.split() else ''
-            if first_word in decrease_indent:
-                indent_level = max(0, indent_level - 1)
-
-            # Add indented line
-            if stripped:
-                formatted_lines.append(indent_str * indent_level + stripped)
-            else:
-                formatted_lines.append('')
-
-            # Check if indent should increase
-            if first_word in increase_indent and first_word not in {'else', 'elseif'}:
-                indent_level += 1
-            elif first_word in {'else', 'elseif'}:
-                indent_level += 1
-
-        # Update editor
-        self.editor.setText('\n'.join(formatted_lines))
-        self.output_panel.log_info("Code formatted")
+        changed = self.editor.replace_lines(code.split('\n'), format_lines(code))
+        if changed:
+            self.output_panel.log_info(f"Code formatted ({changed} lines changed)")
+        else:
+            self.output_panel.log_info("Code already formatted")
 
     def clear_editor(self):
         """Clear editor content"""
@@ -1456,6 +1050,15 @@ class ScriptView(QWidget):
         self.editor.clear_error_highlights()
         self.output_panel.log_info("Editor cleared")
 
+    def shutdown(self):
+        """Detach from the shared check service before the view is destroyed"""
+        self.check_timer.stop()
+        self.check_service.cancel(self)
+        try:
+            self.check_service.check_finished.disconnect(self._on_check_finished)
+        except TypeError:
+            pass  # Already disconnected
+
     def set_callbacks(self, on_apply=None, on_back=None):
         """設定簡化模式的回調函式"""
         self.on_apply_callback = on_apply
@@ -1479,14 +1082,20 @@ class ScriptView(QWidget):
         if self.on_back_callback:
             self.on_back_callback()
 
+    def _on_symbols_changed(self):
+        """Keep the reference panel's script symbols in sync"""
+        self.api_panel.set_script_symbols(self.editor.symbol_index.symbols())
+
     def on_text_changed(self):
         """On text changed"""
         # Clear old error markers
         self.editor.clear_markers()
         self.editor.clear_error_highlights()
 
-        # Clear syntax checker cache when text changes
-        self.syntax_checker.clear_cache()
+        # Pending results now describe an outdated document
+        self._doc_version += 1
+        self._report_success = False
+        self.check_timer.start(self.check_delay_ms)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,19 @@
+from common import FontManager
+import edit_view.preview_obj as preview_obj
+from edit_view.attribute_panel import AttributeForm
+
+
+def test_font_combo_keeps_removed_font(qapp, monkeypatch):
+    monkeypatch.setattr(FontManager, "get_ttf_fonts", lambda self: ["Arial", "BebasNeue"])
+    signal = preview_obj.Signal()
+    container = AttributeForm.AttributeContainer("Font", "BebasNeue", "", "font", signal)
+    assert container.input.currentText() == "BebasNeue"
+
+    received = []
+    signal.connect(received.append)
+    received.clear()  # Signal replays its last value on connect
+    monkeypatch.setattr(FontManager, "get_ttf_fonts", lambda self: ["Arial"])
+    container._on_fonts_changed()
+    assert container.input.currentText() == "BebasNeue"
+    assert received == []
+    container.deleteLater()
@@ -0,0 +1,20 @@
+import components
+from PyQt5.QtCore import pyqtSignal, QObject
+
+from edit_view.components_panel import ComponentButton, ComponentCatalogue
+
+
+class Emitter(QObject):
+    triggered = pyqtSignal(object)
+
+
+def test_unregistered_components_are_disabled(qapp):
+    emitter = Emitter()
+    entries = list(ComponentCatalogue.instance())
+    assert any(not entry.registered for entry in entries)
+    for entry in entries:
+        assert entry.registered == hasattr(components, entry.name)
+        button = ComponentButton(entry, emitter.triggered)
+        assert button.isEnabled() == entry.registered
+        assert button.toolTip().startswith(entry.tooltip)
+        button.deleteLater()
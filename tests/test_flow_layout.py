@@ -0,0 +1,51 @@
+import pytest
+from PyQt5.QtWidgets import QLabel, QScrollArea, QWidget
+
+from common import FlowLayout
+
+
+@pytest.fixture
+def flow(qapp):
+    """A FlowLayout of 200 cards in a scroll area, resized so that the
+    cards outside the viewport are left pending"""
+    area = QScrollArea()
+    area.setWidgetResizable(True)
+    container = QWidget()
+    layout = FlowLayout(container)
+    for index in range(200):
+        label = QLabel(str(index))
+        label.setFixedSize(50, 50)
+        layout.addWidget(label)
+    area.setWidget(container)
+    area.resize(300, 200)
+    area.show()
+    qapp.processEvents()
+    area.resize(400, 200)
+    qapp.processEvents()
+    yield area, layout
+    area.close()
+    area.deleteLater()
+    qapp.processEvents()
+
+
+def test_pending_is_keyed_by_item(flow):
+    _, layout = flow
+    assert layout._pending
+    items = [layout.itemAt(index) for index in range(layout.count())]
+    assert all(item in items for item in layout._pending)
+
+
+def test_take_clears_pending_geometry(qapp, flow):
+    area, layout = flow
+    assert layout._pending
+    taken = layout.takeAt(0)
+    assert taken is not None
+    assert not layout._pending
+
+    # The next layout places the remaining cards at fresh targets
+    scroll = area.verticalScrollBar()
+    scroll.setValue(scroll.maximum())
+    qapp.processEvents()
+    last = layout.itemAt(layout.count() - 1)
+    assert last not in layout._pending
+    assert last.geometry().bottom() <= area.widget().height()
@@ -0,0 +1,34 @@
+import os
+import shutil
+
+import pytest
+from font_index import FONT_DIR, FontIndex
+
+
+@pytest.fixture
+def font_dir(qapp, tmp_path):
+    directory = tmp_path / "font"
+    directory.mkdir()
+    for name in ("BebasNeue.ttf", "3d.fnt"):
+        shutil.copy(os.path.join(FONT_DIR, name), directory / name)
+    return directory
+
+
+def test_lookup_ignores_case_and_extension(font_dir, tmp_path):
+    index = FontIndex(str(font_dir), str(tmp_path / "index.json"))
+    assert index.names("ttf") == ["BebasNeue"]
+    assert index.names("bmfont") == ["3d"]
+    assert index.find("3D.FNT").kind == "bmfont"
+    assert index.find("bebasneue").filename == "BebasNeue.ttf"
+    assert index.family("bebasneue")
+
+
+def test_cached_index_registers_fonts_lazily(font_dir, tmp_path):
+    cache_path = str(tmp_path / "index.json")
+    family = FontIndex(str(font_dir), cache_path).family("BebasNeue")
+
+    index = FontIndex(str(font_dir), cache_path)
+    assert index._font_ids == {}
+    assert index.find("BebasNeue").family == family
+    assert index.family("BebasNeue") == family
+    assert "BebasNeue.ttf" in index._font_ids
@@ -0,0 +1,56 @@
+import os
+import time
+
+from PyQt5.QtCore import QSize
+
+import image_loader
+from image_loader import ImageLoader, prune_thumbnails
+
+
+def write_file(path, size, age):
+    path.write_bytes(b"\0" * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+def test_prune_removes_expired_then_oldest(tmp_path):
+    write_file(tmp_path / "expired.png", 10, age=100)
+    write_file(tmp_path / "old.png", 10, age=30)
+    write_file(tmp_path / "new.png", 10, age=10)
+    write_file(tmp_path / "stale.png.1.tmp", 10, age=7200)
+
+    assert prune_thumbnails(str(tmp_path), max_bytes=15, max_age=60) == 3
+    assert os.listdir(tmp_path) == ["new.png"]
+
+
+def test_thumbnail_key_reuses_stat_within_ttl(qapp, tmp_path, monkeypatch):
+    path = tmp_path / "image.png"
+    path.write_bytes(b"first")
+    loader = ImageLoader(thumbnail_dir=str(tmp_path / "thumbnails"))
+    size = QSize(64, 64)
+    key = loader._thumbnail_key(str(path), size, 1)
+
+    calls = []
+    monkeypatch.setattr(image_loader, "_stat_source", lambda p: calls.append(p) or os.stat(p))
+    assert loader._thumbnail_key(str(path), size, 1) == key
+    assert calls == []
+
+    path.write_bytes(b"second file")
+    later = time.monotonic() + image_loader.THUMBNAIL_STAT_TTL + 1
+    monkeypatch.setattr(image_loader.time, "monotonic", lambda: later)
+    assert loader._thumbnail_key(str(path), size, 1) != key
+    assert calls == [str(path)]
+
+
+def test_loader_does_not_prune_on_construction(qapp, tmp_path):
+    thumbnail_dir = tmp_path / "thumbnails"
+    thumbnail_dir.mkdir()
+    write_file(thumbnail_dir / "expired.png", 10, age=10 ** 9)
+
+    loader = ImageLoader(thumbnail_dir=str(thumbnail_dir))
+    loader.wait_for_done()
+    assert os.listdir(thumbnail_dir) == ["expired.png"]
+
+    loader.prune_disk_cache()
+    loader.wait_for_done()
+    assert os.listdir(thumbnail_dir) == []
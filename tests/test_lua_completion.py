@@ -0,0 +1,42 @@
+from lua_completion import API_COMPLETION, CompletionEngine, complete_from
+
+
+def test_api_ranking():
+    assert API_COMPLETION.complete("sched", limit=5) == ["wm_schedule"]
+    assert API_COMPLETION.complete("wsch", limit=5) == ["wm_schedule", "wm_unschedule_all"]
+    assert API_COMPLETION.complete("outq", limit=5) == ["outQuad", "outQuart", "outQuint"]
+    assert API_COMPLETION.complete("math.f", limit=5) == ["math.floor"]
+
+
+def test_same_case_prefix_ranks_before_folded_prefix():
+    engine = CompletionEngine(["Value", "value_x", "my_value"])
+    assert engine.complete("val") == ["value_x", "Value", "my_value"]
+
+
+def test_complete_from_merges_engines():
+    local = CompletionEngine(["wm_my_counter"])
+    assert complete_from((API_COMPLETION, local), "wm_my", limit=3) == ["wm_my_counter"]
+
+
+def test_fuzzy_candidates_are_bounded():
+    words = [f"w{index:05d}_sch" for index in range(2000)]
+    engine = CompletionEngine(words)
+    engine.FUZZY_CANDIDATES = 100
+    assert len(list(engine._fuzzy_candidates("wsch"))) == 100
+    assert len(engine.scores("wsch")) == 100
+
+
+def test_two_letter_segment_matches_come_first():
+    engine = CompletionEngine([f"wx_{index}" for index in range(50)] + ["wm_schedule"])
+    engine.FUZZY_CANDIDATES = 10
+    assert "wm_schedule" in list(engine._fuzzy_candidates("wmsch"))
+    assert engine.complete("wmsch") == ["wm_schedule"]
+
+
+def test_discard_drops_word_from_every_index():
+    engine = CompletionEngine(["ab_ab", "abc"])
+    engine.discard("ab_ab")
+    assert "ab_ab" not in engine
+    assert engine.complete("ab") == ["abc"]
+    assert engine.scores("aab") == {}
+    assert set(engine._by_start) == {"a", "ab"}
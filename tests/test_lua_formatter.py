@@ -0,0 +1,88 @@
+from lua_formatter import format_code, format_lines
+
+
+def test_function_argument_indents_once():
+    code = "foo(function()\nreturn 1\nend)"
+    assert format_code(code) == "foo(function()\n  return 1\nend)"
+
+
+def test_table_argument_indents_once():
+    code = "wm_schedule({\naction='tween',\nduration=1,\n})"
+    assert format_code(code) == "wm_schedule({\n  action='tween',\n  duration=1,\n})"
+
+
+def test_partial_close_returns_to_outer_level():
+    code = "foo(function()\nreturn 1\nend, 5)\nx = 1"
+    assert format_code(code) == "foo(function()\n  return 1\nend, 5)\nx = 1"
+
+
+def test_nested_blocks_and_branches():
+    code = (
+        "function on_second(h, m, s)\n"
+        "if s > 30 then\n"
+        "wm_action(\"then\")\n"
+        "elseif s > 10 then\n"
+        "list = { 1,\n2 }\n"
+        "else\n"
+        "print(\"do\")\n"
+        "end\n"
+        "end"
+    )
+    assert format_code(code) == (
+        "function on_second(h, m, s)\n"
+        "  if s > 30 then\n"
+        "    wm_action(\"then\")\n"
+        "  elseif s > 10 then\n"
+        "    list = { 1,\n"
+        "      2 }\n"
+        "  else\n"
+        "    print(\"do\")\n"
+        "  end\n"
+        "end"
+    )
+
+
+def test_one_liners_keep_depth():
+    code = "if a then f(function() end) end\ny = 1"
+    assert format_code(code) == code
+
+
+def test_long_string_lines_are_verbatim():
+    code = "x = [[\n  keep  \n]]\ny = 1"
+    assert format_code(code) == code
+
+
+def test_line_count_and_idempotence():
+    code = "foo(function()\nreturn {\n1,\n}\nend)\n"
+    lines = format_lines(code)
+    assert len(lines) == len(code.split("\n"))
+    assert format_lines("\n".join(lines)) == lines
+
+
+def test_keywords_in_strings_and_comments_are_ignored():
+    code = (
+        'function on_second(h, m, s)\n'
+        'if s > 30 then\n'
+        'wm_action("m_task:goto(1)") -- then\n'
+        'elseif s > 10 then\n'
+        'list = {\n'
+        '"end", [[ a\n'
+        '  long ]] }\n'
+        'else\n'
+        'print("do")\n'
+        'end\n'
+        'end'
+    )
+    assert format_code(code) == (
+        'function on_second(h, m, s)\n'
+        '  if s > 30 then\n'
+        '    wm_action("m_task:goto(1)") -- then\n'
+        '  elseif s > 10 then\n'
+        '    list = {\n'
+        '      "end", [[ a\n'
+        '  long ]] }\n'
+        '  else\n'
+        '    print("do")\n'
+        '  end\n'
+        'end'
+    )
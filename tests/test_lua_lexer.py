@@ -0,0 +1,49 @@
+from lua_lexer import BLOCK_KEYWORDS, TokenType, tokenize, tokenize_blocks
+
+SAMPLE = '''--[[ header
+if ( ]]
+local s = [==[ long
+end ]==]
+function on_second(h, m, s)
+    for i = 1, #names do wm_action("end(") end
+    local t = { a.end_x, do_it(), [1] = 2 }
+    repeat s = s - 1 until s < 0
+end
+x = "open
+'''
+
+
+def test_block_scan_matches_full_token_stream():
+    expected = [
+        token for token in tokenize(SAMPLE)
+        if token.type in (TokenType.STRING, TokenType.COMMENT)
+        or (token.type is TokenType.KEYWORD and token.value in BLOCK_KEYWORDS)
+        or token.value in ('(', ')', '[', ']', '{', '}')
+    ]
+    assert tokenize_blocks(SAMPLE) == expected
+
+
+def test_long_brackets_are_single_tokens_with_positions():
+    code = '--[[ header\ncomment ]]\nlocal s = [==[ long\nstring ]==]\nwm_action("m_task:goto(1)") -- call\n'
+    tokens = tokenize(code)
+    summary = [(token.line, token.column, token.type, token.value) for token in tokens]
+    assert summary == [
+        (0, 0, TokenType.COMMENT, '--[[ header\ncomment ]]'),
+        (2, 0, TokenType.KEYWORD, 'local'),
+        (2, 6, TokenType.NAME, 's'),
+        (2, 8, TokenType.OPERATOR, '='),
+        (2, 10, TokenType.STRING, '[==[ long\nstring ]==]'),
+        (4, 0, TokenType.NAME, 'wm_action'),
+        (4, 9, TokenType.OPERATOR, '('),
+        (4, 10, TokenType.STRING, '"m_task:goto(1)"'),
+        (4, 26, TokenType.OPERATOR, ')'),
+        (4, 28, TokenType.COMMENT, '-- call'),
+    ]
+    assert tokens[4].end_line == 3
+
+
+def test_unterminated_tokens_are_marked_open():
+    tokens = tokenize('x = "abc\ny = [==[ never')
+    assert [(token.value, token.closed) for token in tokens if token.type is TokenType.STRING] == [
+        ('"abc', False), ('[==[ never', False),
+    ]
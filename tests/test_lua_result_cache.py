@@ -0,0 +1,52 @@
+import json
+import time
+
+from lua_syntax_checker import ErrorSeverity, LuaResultCache, LuaSyntaxError
+
+
+def make_error(line=0):
+    return LuaSyntaxError(line, 0, "unexpected symbol", ErrorSeverity.ERROR, "E001")
+
+
+def test_put_is_written_on_flush_not_per_put(tmp_path):
+    path = tmp_path / "results.json"
+    cache = LuaResultCache(path=str(path), save_delay=60)
+    cache.put("a", [make_error()])
+    cache.put("b", [])
+    assert not path.exists()
+
+    cache.flush()
+    assert set(json.loads(path.read_text(encoding="utf-8"))) == {"a", "b"}
+
+
+def test_clean_result_round_trips_as_empty_list(tmp_path):
+    path = tmp_path / "results.json"
+    cache = LuaResultCache(path=str(path), save_delay=60)
+    cache.put("clean", [])
+    cache.flush()
+
+    reloaded = LuaResultCache(path=str(path))
+    assert reloaded.get("clean") == []
+    assert reloaded.get("missing") is None
+    assert len(reloaded) == 1
+
+
+def test_debounced_save_runs_in_background(tmp_path):
+    path = tmp_path / "results.json"
+    cache = LuaResultCache(path=str(path), save_delay=0.01)
+    cache.put("a", [make_error(3)])
+    deadline = time.monotonic() + 2
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stored = json.loads(path.read_text(encoding="utf-8"))
+    assert stored["a"][0]["line"] == 3
+
+
+def test_lru_eviction():
+    cache = LuaResultCache(max_entries=2)
+    cache.put("a", [])
+    cache.put("b", [])
+    cache.get("a")
+    cache.put("c", [])
+    assert cache.get("b") is None
+    assert cache.get("a") == [] and cache.get("c") == []
@@ -0,0 +1,79 @@
+import pytest
+
+from lua_symbols import SymbolIndex, extract_symbols
+
+SAMPLE = '''var_ms_angle = 0
+local speed, dir = 2, 1
+config = { rate = 5, mode = "a" }
+config.offset = 3
+function on_second(h, m, s)
+    for i, v in ipairs(list) do var_count = i end
+end
+local function helper(x) return x end
+'''
+
+
+@pytest.mark.parametrize("line, expected", [
+    ('var_ms_angle = 0', (('var_ms_angle', 'variable'),)),
+    ('local speed, dir = 2, 1', (('speed', 'local'), ('dir', 'local'))),
+    ('config = { rate = 5, mode = "a" }', (('config', 'global'), ('rate', 'field'), ('mode', 'field'))),
+    ('config.offset = 3', (('config.offset', 'field'),)),
+    ('function on_second(h, m, s)',
+     (('on_second', 'function'), ('h', 'local'), ('m', 'local'), ('s', 'local'))),
+    ('    for i, v in ipairs(list) do var_count = i end',
+     (('i', 'local'), ('v', 'local'), ('var_count', 'variable'))),
+    ('local function helper(x) return x end', (('helper', 'function'), ('x', 'local'))),
+    ('end', ()),
+])
+def test_extract_symbols(line, expected):
+    assert extract_symbols(line) == expected
+
+
+def load(index, lines):
+    """Insert a whole document the way the editor reports it"""
+    index.splice(0, len(lines) - 1)
+    index.refresh(lines.__getitem__)
+
+
+def test_index_follows_line_edits():
+    lines = SAMPLE.split('\n')
+    index = SymbolIndex()
+    load(index, lines)
+    assert ('config', 'global') in index.symbols()
+    assert ('helper', 'function') in index.symbols()
+    assert 'speed' in index.engine
+
+    # Delete line 1 ("local speed, dir = 2, 1")
+    del lines[1]
+    index.splice(0, -1)
+    assert index.refresh(lines.__getitem__)
+    assert 'speed' not in index.engine
+    assert 'dir' not in index.engine
+    assert 'helper' in index.engine
+
+    # Insert a line after line 0
+    lines.insert(1, 'local tick = 0')
+    index.splice(0, 1)
+    assert index.refresh(lines.__getitem__)
+    assert ('tick', 'local') in index.symbols()
+    assert 'helper' in index.engine
+
+    # The helper line is back at 7; editing it drops the old definition
+    assert lines[7].startswith('local function helper')
+    lines[7] = 'local function assist(x) return x end'
+    index.splice(7, 0)
+    assert index.refresh(lines.__getitem__)
+    assert 'helper' not in index.engine
+    assert 'assist' in index.engine
+
+
+def test_refresh_reports_symbols_removed_with_deleted_lines():
+    lines = ['local speed = 1', 'local dir = 2', 'x = speed']
+    index = SymbolIndex()
+    load(index, lines)
+
+    del lines[1]
+    index.splice(0, -1)
+    assert index.refresh(lines.__getitem__)
+    assert 'dir' not in index.engine
+    assert not index.refresh(lines.__getitem__)
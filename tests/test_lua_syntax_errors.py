@@ -0,0 +1,34 @@
+from lua_syntax_checker import LuaSyntaxChecker
+
+
+def parse_errors(code):
+    return LuaSyntaxChecker()._parse_syntax(code)
+
+
+def span(code, error):
+    return code[error.start_pos:error.start_pos + error.length]
+
+
+def test_unterminated_string_span_stays_on_its_line():
+    code = 'x = "abc\ny = 1\nz = 2'
+    errors = parse_errors(code)
+    assert len(errors) == 1
+    assert errors[0].line == 0
+    assert span(code, errors[0]) == '"abc'
+
+
+def test_unknown_character_highlights_only_that_token():
+    code = 'x = 1 @ 2\ny = 3'
+    errors = parse_errors(code)
+    assert len(errors) == 1
+    assert (errors[0].line, errors[0].column) == (0, 6)
+    assert span(code, errors[0]) == '@'
+
+
+def test_missing_end_points_at_the_open_block():
+    code = 'local y = 0\nfunction f()\n  x = 1\n'
+    errors = parse_errors(code)
+    assert len(errors) == 1
+    assert (errors[0].line, errors[0].column) == (1, 0)
+    assert errors[0].length == len('function')
+    assert span(code, errors[0]) == 'function'
@@ -0,0 +1,102 @@
+import gc
+import weakref
+
+import pytest
+from PyQt5.QtWidgets import QGraphicsView
+
+import edit_view.preview_obj as preview_obj
+
+KEYS = ("Layer", "Text", "X", "Y", "Font", "Text size", "Color", "Rotation",
+        "Skew X", "Skew Y", "Opacity", "Alignment", "Display")
+
+
+@pytest.fixture
+def scene(qapp):
+    view = QGraphicsView()
+    scene = preview_obj.GraphicsScene(view)
+    view.setScene(scene)
+    yield scene
+    view.deleteLater()
+    qapp.processEvents()
+
+
+def add_text_layer(scene, layer_id=2):
+    attribute = {key: preview_obj.Signal() for key in KEYS}
+    layer = preview_obj.create_layer("textLayer", attribute, layer_id, scene)
+    scene.addItem(layer)
+    attribute["Text"].emit("Layer")
+    attribute["Text size"].emit(24)
+    scene.update_scheduler.flush()
+    return layer, attribute
+
+
+def test_removed_layer_is_not_kept_by_the_scheduler(scene):
+    layer, attribute = add_text_layer(scene)
+    attribute["Rotation"].emit(30.0)
+    assert scene.update_scheduler.stats()["pending"] == 1
+
+    scene.removeItem(layer)
+    assert scene.update_scheduler.stats()["pending"] == 0
+    # The pending rotation was applied before the layer left the scene
+    assert layer.transform().m12() != 0
+
+    ref = weakref.ref(layer)
+    del layer, attribute
+    gc.collect()
+    assert ref() is None
+
+
+def controller_geometry(layer):
+    controller = layer.controller
+    rect = controller.rect()
+    return (round(controller.x(), 3), round(controller.y(), 3),
+            round(rect.width(), 3), round(rect.height(), 3))
+
+
+def test_controller_shown_before_flush_uses_current_bounds(scene):
+    layer, attribute = add_text_layer(scene)
+    attribute["Alignment"].emit("Center")
+    attribute["Skew X"].emit(20.0)
+    scene.update_scheduler.flush()
+
+    # The text grows, then the layer is selected before the scheduler runs
+    attribute["Text"].emit("A much longer layer text")
+    layer.setSelected(True)
+    shown = controller_geometry(layer)
+
+    scene.update_scheduler.flush()
+    layer.controller.update_scale()
+    assert shown == controller_geometry(layer)
+
+
+def handle_state(handles):
+    return {
+        direction: (round(handle.x(), 6), round(handle.y(), 6),
+                    round(handle.transform().m11(), 6), round(handle.transform().m22(), 6))
+        for direction, handle in handles.items()
+    }
+
+
+def test_scale_handle_group_matches_per_handle_updates(scene):
+    layer, attribute = add_text_layer(scene)
+    attribute["Rotation"].emit(30.0)
+    attribute["Skew X"].emit(15.0)
+    layer.setSelected(True)
+    scene.update_scheduler.flush()
+    controller = layer.controller
+    handles = controller.scale_handle
+    rect = controller.rect()
+    view_scale = (2.0, 1.5)
+    item_scale = preview_obj._axis_scales(controller.sceneTransform())
+
+    handles.update_pos(rect.width(), rect.height())
+    handles.update_transform(view_scale, item_scale)
+    grouped = handle_state(handles)
+
+    for handle in handles.values():
+        handle.setPos(0, 0)
+        handle.resetTransform()
+        handle.update_pos(rect.width(), rect.height())
+        handle.update_transform(view_scale, item_scale)
+    assert len(grouped) == 8
+    assert grouped == handle_state(handles)